@@ -0,0 +1,254 @@
+from __future__ import annotations
+import bisect
+import re
+from typing import List, Optional, Tuple
+
+# 캡션 / 사건명 파서.
+# 예전에는 "([A-Z0-9][A-Z0-9 ,.&'\-]{2,}?)\s*,\s*...Plaintiff..." 같은 lazy/greedy 정규식을 그대로 썼는데,
+# 대문자·쉼표가 길게 이어지는 OCR 텍스트에서는 시작 위치마다 끝까지 되짚어(backtracking) 입력 길이의 제곱 시간이 걸렸다.
+# 여기서는 텍스트를 한 번 토큰화(허용 문자 구간 / 공백 토큰 / 쉼표 위치)한 뒤, 앞으로만 움직이는 포인터로
+# 예전 정규식과 같은 후보(가장 왼쪽 시작, lazy면 가장 가까운 끝, greedy면 가장 먼 끝)를 고른다.
+
+# 당사자/사건명 본문에 올 수 있는 문자 (예전 정규식의 [A-Za-z0-9 ,.&'\-])
+_ALLOWED = frozenset("ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789 ,.&'-")
+_ALNUM = frozenset("ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789")
+_UPPER = frozenset("ABCDEFGHIJKLMNOPQRSTUVWXYZ")
+_RUN_RE = re.compile(r"[A-Za-z0-9 ,.&'\-]+")
+_TOKEN_RE = re.compile(r"\s+|\S+")
+_ET_AL_RE = re.compile(r"et\s+al\.", re.I)
+
+# 'A v. B' 구분자 토큰: 사건명은 v\.?s?\.? (v, v., vs, vs., v.s., v.. 등 소문자만), 캡션은 v / v. (대소문자 무관)
+TITLE_SEPARATORS = frozenset({"v", "v.", "v..", "vs", "vs.", "v.s", "v.s."})
+CAPTION_SEPARATORS = frozenset({"v", "v.", "V", "V."})
+
+
+def _is_word(ch: str) -> bool:
+    return ch.isalnum() or ch == "_"
+
+
+def _skip_ws(text: str, i: int) -> int:
+    n = len(text)
+    while i < n and text[i].isspace():
+        i += 1
+    return i
+
+
+class _Tokens:
+    """허용 문자 구간(run), 공백으로 둘러싸인 구분자(v/v.) 위치, 쉼표 위치를 한 번에 구해 둔다."""
+
+    def __init__(self, text: str):
+        self.text = text
+        self.runs = [(m.start(), m.end()) for m in _RUN_RE.finditer(text)]
+        self._run_starts = [s for s, _ in self.runs]
+        self._tokens = [(m.start(), m.end()) for m in _TOKEN_RE.finditer(text)]
+        self.commas = [i for i, ch in enumerate(text) if ch == ","]
+
+    def run_end(self, i: int) -> int:
+        """i가 속한 허용 문자 구간의 끝 (i가 구간 밖이면 i)."""
+        k = bisect.bisect_right(self._run_starts, i) - 1
+        if k >= 0 and self.runs[k][1] > i:
+            return self.runs[k][1]
+        return i
+
+    def separators(self, words: frozenset) -> List[Tuple[int, int, int]]:
+        """(앞 공백 시작, 구분자 시작, 뒤 공백 끝) 목록. 토큰은 공백/비공백이 번갈아 나온다."""
+        text = self.text
+        toks = self._tokens
+        out = []
+        for k in range(1, len(toks) - 1):
+            s, e = toks[k]
+            if not text[s].isspace() and text[s:e] in words:
+                out.append((toks[k - 1][0], s, toks[k + 1][1]))
+        return out
+
+    def ws_start(self, i: int) -> int:
+        """i 바로 앞 공백 구간의 시작 (공백이 없으면 i)."""
+        text = self.text
+        while i > 0 and text[i - 1].isspace():
+            i -= 1
+        return i
+
+
+def _first_in(text: str, start: int, end: int, chars: frozenset) -> Optional[int]:
+    for i in range(start, end):
+        if text[i] in chars:
+            return i
+    return None
+
+
+# =====================================================
+# 기사 본문 사건명: 'A v. B'
+# =====================================================
+
+def _title_right_end(text: str, b0: int) -> Optional[int]:
+    # 오른쪽: 대문자로 시작, 3자 이상, 가장 가까운 단어 경계에서 끝
+    n = len(text)
+    if b0 >= n or text[b0] not in _UPPER:
+        return None
+    j = b0 + 1
+    while j <= n:
+        if text[j - 1] not in _ALLOWED:
+            return None
+        if j >= b0 + 3 and _is_word(text[j - 1]) != (j < n and _is_word(text[j])):
+            return j
+        j += 1
+    return None
+
+
+def case_title_pairs(text: str) -> List[Tuple[str, str]]:
+    """텍스트의 'A v. B' 후보를 앞에서부터 겹치지 않게 (A, B)로 돌려준다 (정리 전 원문 구간).
+
+    왼쪽은 허용 문자 구간 안의 첫 대문자부터 가장 가까운 구분자 앞까지, 오른쪽은 첫 단어 경계까지.
+    """
+    tokens = _Tokens(text)
+    seps = tokens.separators(TITLE_SEPARATORS)
+    out: List[Tuple[str, str]] = []
+    pos = 0
+    si = 0
+    for rs, re_ in tokens.runs:
+        while True:
+            p = _first_in(text, max(rs, pos), re_, _UPPER)
+            if p is None:
+                break
+            while si < len(seps) and seps[si][0] < pos:
+                si += 1
+            found = None
+            while si < len(seps) and seps[si][0] <= re_:
+                ws, v, b0 = seps[si]
+                q = max(ws, p + 3)
+                if q < v and q <= re_:
+                    b1 = _title_right_end(text, b0)
+                    if b1 is not None:
+                        found = (q, b0, b1)
+                        break
+                si += 1
+            if found is None:
+                break
+            q, b0, b1 = found
+            out.append((text[p:q], text[b0:b1]))
+            pos = b1
+            if pos >= re_:
+                break
+    return out
+
+
+# =====================================================
+# 고소장 캡션 당사자: "X, [et al.,] Plaintiff(s), v. Y, Defendant(s)" / "X v. Y"
+# =====================================================
+
+def _plaintiff_tail(text: str, c: int) -> Optional[int]:
+    """쉼표 c 뒤가 '[et al.] Plaintiff(s)[,] v[.]'이면 피고 이름 시작 위치."""
+    n = len(text)
+    i = _skip_ws(text, c + 1)
+    m = _ET_AL_RE.match(text, i)
+    if m:
+        i = _skip_ws(text, m.end())
+    if text[i:i + 9].lower() != "plaintiff":
+        return None
+    i += 9
+    if i < n and text[i] in "sS":
+        i += 1
+    i = _skip_ws(text, i)
+    if i < n and text[i] == ",":
+        i = _skip_ws(text, i + 1)
+    if i >= n or text[i] not in "vV":
+        return None
+    i += 1
+    if i < n and text[i] == ".":
+        i += 1
+    i = _skip_ws(text, i)
+    return i if i < n and text[i] in _ALNUM else None
+
+
+def _defendant_end(tokens: _Tokens, d0: int) -> Optional[int]:
+    """피고 이름의 끝: 3자 이상에서 가장 가까운 '쉼표 + (공백) + 단어'의 앞."""
+    text = tokens.text
+    limit = tokens.run_end(d0)
+    commas = tokens.commas
+    for k in range(bisect.bisect_left(commas, d0), len(commas)):
+        c = commas[k]
+        ws = tokens.ws_start(c)
+        if ws > limit:
+            break
+        d1 = max(d0 + 3, ws)
+        if d1 > c or d1 > limit:
+            continue
+        after = _skip_ws(text, c + 1)
+        if after < len(text) and _is_word(text[after]):
+            return d1
+    return None
+
+
+def _caption_with_role(tokens: _Tokens) -> Optional[Tuple[str, str]]:
+    text = tokens.text
+    commas = tokens.commas
+    ci = 0
+    for rs, re_ in tokens.runs:
+        p = _first_in(text, rs, re_, _ALNUM)
+        if p is None:
+            continue
+        while ci < len(commas):
+            c = commas[ci]
+            ws = tokens.ws_start(c)
+            if ws > re_:
+                break
+            ci += 1
+            q = max(p + 3, ws)
+            if q > c or q > re_:
+                continue
+            d0 = _plaintiff_tail(text, c)
+            if d0 is None:
+                continue
+            d1 = _defendant_end(tokens, d0)
+            if d1 is not None:
+                return text[p:q], text[d0:d1]
+    return None
+
+
+def _caption_simple(tokens: _Tokens) -> Optional[Tuple[str, str]]:
+    text = tokens.text
+    seps = tokens.separators(CAPTION_SEPARATORS)
+    si = 0
+    for rs, re_ in tokens.runs:
+        p = _first_in(text, rs, re_, _ALNUM)
+        if p is None:
+            continue
+        best = None
+        # 왼쪽은 가장 먼(마지막) 구분자까지, 오른쪽은 허용 문자 구간 끝까지
+        while si < len(seps) and seps[si][0] <= re_:
+            ws, v, b0 = seps[si]
+            si += 1
+            q = min(v - 1, re_)
+            if q < max(ws, p + 3):
+                continue
+            if b0 < len(text) and text[b0] in _ALNUM:
+                b1 = tokens.run_end(b0)
+                if b1 - b0 >= 3:
+                    best = (q, b0, b1)
+        if best is not None:
+            q, b0, b1 = best
+            return text[p:q], text[b0:b1]
+    return None
+
+
+def _is_court_name(name: str) -> bool:
+    # 법원 이름 등이 잡히는 것 방지 (보통 DISTRICT COURT 등)
+    upper = name.upper()
+    return "DISTRICT" in upper or "COURT" in upper
+
+
+def caption_parties(cap: str) -> Tuple[str, str]:
+    """캡션 텍스트에서 (원고, 피고). 못 찾으면 ("미확인", "미확인")."""
+    tokens = _Tokens(cap)
+    found = _caption_with_role(tokens)
+    if found:
+        p = re.sub(r"\s+", " ", found[0]).strip(" ,")
+        d = re.sub(r"\s+", " ", found[1]).strip(" ,")
+        if not _is_court_name(p):
+            return p, d
+    found = _caption_simple(tokens)
+    if found:
+        p2, d2 = found[0].strip(), found[1].strip()
+        if not _is_court_name(p2):
+            return p2, d2
+    return "미확인", "미확인"
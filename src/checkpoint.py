@@ -0,0 +1,39 @@
+from __future__ import annotations
+import os
+import threading
+from typing import Any, Dict
+
+from .utils import cache_dir, load_json, save_json, debug_log
+
+
+class Checkpoints:
+    """소스별 high-water mark 저장소 (DELTA_MODE=1, CACHE_DIR/checkpoints.json).
+
+    - rss: 마지막으로 처리한 뉴스 발행 시각
+    - search: CourtListener 쿼리별 dateFiled 최댓값 + 그 날짜에 이미 본 문서 키
+    - dockets: 도켓별 date_modified
+
+    get()은 지난 실행까지 확정된 값만 돌려준다. 이번 실행에서 set()한 값은
+    리포트 게시가 끝난 뒤 commit()해야 반영되므로, 중간에 실패하면 다음 실행이 같은 구간을 다시 처리한다.
+    """
+
+    def __init__(self, path: str | None = None):
+        self.path = path or os.path.join(cache_dir(), "checkpoints.json")
+        self._committed: Dict[str, Dict[str, Any]] = load_json(self.path) or {}
+        self._pending: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, source: str, key: str, default=None):
+        return self._committed.get(source, {}).get(str(key), default)
+
+    def set(self, source: str, key: str, value) -> None:
+        with self._lock:
+            self._pending.setdefault(source, {})[str(key)] = value
+
+    def commit(self) -> None:
+        with self._lock:
+            for source, values in self._pending.items():
+                self._committed.setdefault(source, {}).update(values)
+            self._pending.clear()
+            save_json(self.path, self._committed)
+        debug_log(f"checkpoints committed: {self.path}")
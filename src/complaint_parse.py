@@ -1,6 +1,9 @@
 from __future__ import annotations
 import re
-from typing import List, Tuple
+from dataclasses import dataclass
+from typing import Callable, Iterator, List, Optional, Tuple
+
+from .caption_parse import caption_parties
 
 CAUSE_PATTERNS = [
     ("저작권 침해", re.compile(r"\bcopyright\s+infringement\b", re.I)),
@@ -20,60 +23,241 @@ AI_DATA_PATTERNS = [
     re.compile(r"commercial|profit|monetiz(?:e|ation)|revenue|subscription|enterprise", re.I),
 ]
 
-def _sentences(text: str) -> List[str]:
-    # 너무 거친 문장 분리지만, 스니펫에서는 충분
-    parts = re.split(r"(?<=[\.\?!])\s+", text)
-    return [p.strip() for p in parts if p and len(p.strip()) > 10]
+# 키워드 fallback 스니펫(점수 매긴 문장이 없을 때)의 키워드
+_FALLBACK_KEYWORDS = r"training\s+data|dataset|scrap(?:e|ing)|pirat(?:ed|ing)|unauthorized"
+# 위 패턴들과 문장 경계(공백)가 시작할 수 있는 첫 글자(소문자 기준). 패턴을 추가/변경하면 함께 갱신한다
+# (test/test_complaint_parse.py가 모든 패턴의 매치 첫 글자가 여기 들어 있는지 검사한다).
+_FIRST_CHARS = r"\sbcdehlmprstuw"
+
+def _build_scanner(lowercase: bool) -> re.Pattern:
+    """문장 경계 / fallback 키워드 / 청구 원인 / AI 학습 패턴을 named group 하나의 alternation으로 합친다.
+
+    전체를 (?=...) 안에 두어 매치가 문자를 소비하지 않으므로, 겹치는 패턴도 각자의 시작 위치에서 잡힌다.
+    같은 위치에서 시작하는 패턴은 없도록 짜여 있다 (test/test_complaint_parse.py가 기존 결과와 비교).
+    lowercase=True면 소문자로 바꾼 텍스트용(re.I 없이 비교해 더 빠름) 스캐너를 만든다.
+    """
+    groups = [("sb", r"(?<=[\.\?!])\s+"), ("fb", _FALLBACK_KEYWORDS)]
+    groups += [(f"c{i}", pat.pattern) for i, (_, pat) in enumerate(CAUSE_PATTERNS)]
+    groups += [(f"a{i}", pat.pattern) for i, pat in enumerate(AI_DATA_PATTERNS)]
+    if lowercase:
+        # 이스케이프(\S 등)가 아닌 대문자 리터럴만 소문자로
+        groups = [(name, re.sub(r"(?<!\\)[A-Z]", lambda m: m.group(0).lower(), body)) for name, body in groups]
+    alternation = "|".join(f"(?P<{name}>{body})" for name, body in groups)
+    # 첫 글자 검사를 앞에 두면 대부분의 위치에서 alternation 전체를 시도하지 않는다
+    return re.compile(f"(?=[{_FIRST_CHARS}])(?={alternation})", 0 if lowercase else re.I)
+
+_SCANNER = _build_scanner(lowercase=True)
+_SCANNER_I = _build_scanner(lowercase=False)
+
+@dataclass(frozen=True, slots=True)
+class ComplaintScan:
+    """scan_complaint() 결과: 청구 원인, 점수가 있는 문장 (start, end, score), fallback 구간."""
+    causes: Tuple[str, ...]
+    scored: Tuple[Tuple[int, int, int], ...]
+    fallback: Optional[Tuple[int, int]]
+
+    @property
+    def best_ai_score(self) -> int:
+        return max((score for _, _, score in self.scored), default=0)
+
+class _ScanState:
+    """스캐너 매치를 위치 순서대로 받아 청구 원인 / 문장 점수 / fallback 키워드를 쌓는다.
+
+    best_only=True면 점수가 있는 문장 중 (가장 앞의) 최고점 하나만 남긴다 — ai_snippet_from_scan과
+    best_ai_score에는 그것으로 충분하다. fallback 키워드도 fallback 구간에 쓰이는 것만 남긴다.
+    """
+
+    __slots__ = ("best_only", "causes", "scored", "fallback_hits", "seg_start", "hits")
+
+    def __init__(self, best_only: bool = False):
+        self.best_only = best_only
+        self.causes = set()
+        self.scored = []
+        self.fallback_hits = []
+        self.seg_start = 0
+        self.hits = set()
+
+    def copy(self) -> "_ScanState":
+        other = _ScanState(self.best_only)
+        other.causes = set(self.causes)
+        other.scored = list(self.scored)
+        other.fallback_hits = list(self.fallback_hits)
+        other.seg_start = self.seg_start
+        other.hits = set(self.hits)
+        return other
+
+    def _score(self, scored: list, start: int, end: int) -> None:
+        entry = (start, end, len(self.hits))
+        if not self.best_only:
+            scored.append(entry)
+        elif not scored or entry[2] > scored[0][2]:
+            scored[:] = [entry]
+
+    def add(self, m: re.Match, text: str, offset: int, span_len: Callable[[int, int], int]) -> None:
+        """text는 매치를 찾은 문자열, offset은 그 문자열의 시작 위치(결과 위치는 offset 기준으로 쌓는다)."""
+        group = m.lastgroup
+        pos = offset + m.start()
+        if group == "sb":
+            # 문장 분리: 공백 제외 10자 이하 조각은 문장으로 치지 않는다
+            if self.hits and span_len(self.seg_start, pos) > 10:
+                self._score(self.scored, self.seg_start, pos)
+            self.seg_start = offset + m.end(group)
+            self.hits = set()
+        elif group == "fb":
+            # fallback 구간은 첫 키워드 기준 창 안의 키워드만 쓰므로 그 뒤 키워드는 남기지 않는다
+            if not self.fallback_hits or pos <= max(0, self.fallback_hits[0][0] - 80) + 80:
+                self.fallback_hits.append((pos, offset + m.end(group)))
+            # fallback 키워드는 AI_DATA_PATTERNS 일부이기도 하므로 해당 패턴 점수도 센다
+            self.hits.update(i for i, pat in enumerate(AI_DATA_PATTERNS) if pat.match(text, m.start()))
+        elif group[0] == "c":
+            self.causes.add(int(group[1:]))
+        else:
+            self.hits.add(int(group[1:]))
+
+    def finish(self, length: int, span_len: Callable[[int, int], int]) -> ComplaintScan:
+        """텍스트가 length에서 끝난다고 보고 결과를 만든다 (상태는 바꾸지 않는다)."""
+        scored = list(self.scored)
+        if self.hits and span_len(self.seg_start, length) > 10:
+            self._score(scored, self.seg_start, length)
+
+        fallback = None
+        if self.fallback_hits:
+            # ".{0,80}(키워드).{0,180}" 검색과 같은 구간: 첫 키워드 80자 앞부터, 그 창 안 마지막 키워드 뒤 180자까지
+            start = max(0, self.fallback_hits[0][0] - 80)
+            kw_end = self.fallback_hits[-1][1]
+            fallback = (start, min(length, kw_end + 180))
+
+        return ComplaintScan(
+            causes=tuple(CAUSE_PATTERNS[i][0] for i in sorted(self.causes)),
+            scored=tuple(scored),
+            fallback=fallback,
+        )
+
+def _scanner_matches(text: str, pos: int = 0) -> Iterator[re.Match]:
+    lowered = text.lower()
+    # 소문자 변환으로 길이가 바뀌는 문자(일부 유니코드)가 있으면 위치가 어긋나므로 re.I 스캐너를 쓴다
+    if len(lowered) == len(text):
+        return _SCANNER.finditer(lowered, pos)
+    return _SCANNER_I.finditer(text, pos)
+
+def scan_complaint(text: str) -> ComplaintScan:
+    """텍스트를 한 번 훑어 청구 원인 / 문장별 AI 학습 점수 / fallback 구간을 함께 구한다."""
+    state = _ScanState()
+    span_len = lambda start, end: len(text[start:end].strip())
+    for m in _scanner_matches(text):
+        state.add(m, text, 0, span_len)
+    return state.finish(len(text), span_len)
 
 def detect_causes(text: str) -> List[str]:
-    found = []
-    for name, pat in CAUSE_PATTERNS:
-        if pat.search(text):
-            found.append(name)
-    return found
+    return list(scan_complaint(text).causes)
 
-def extract_ai_training_snippet(text: str, max_len: int = 280) -> str:
-    sents = _sentences(text)
-    scored: List[Tuple[int, str]] = []
-    for s in sents:
-        score = 0
-        for pat in AI_DATA_PATTERNS:
-            if pat.search(s):
-                score += 1
-        if score:
-            scored.append((score, s))
-    if not scored:
-        # fallback: 키워드만이라도 있는 구간 (re.DOTALL 추가하여 줄바꿈 대응)
-        m = re.search(r".{0,80}(training\s+data|dataset|scrap(?:e|ing)|pirat(?:ed|ing)|unauthorized).{0,180}", text, re.I | re.DOTALL)
-        if m:
-            sn = re.sub(r"\s+", " ", m.group(0)).strip()
-            return (sn[:max_len] + "…") if len(sn) > max_len else sn
-        return ""
-    scored.sort(key=lambda x: x[0], reverse=True)
-    sn = re.sub(r"\s+", " ", scored[0][1]).strip()
+def _clip(span: str, max_len: int) -> str:
+    sn = re.sub(r"\s+", " ", span).strip()
     return (sn[:max_len] + "…") if len(sn) > max_len else sn
 
+def ai_snippet_from_scan(text: str, scan: ComplaintScan, max_len: int = 280) -> str:
+    if scan.scored:
+        # 점수가 가장 높은 문장 중 가장 앞의 것
+        start, end, _ = max(scan.scored, key=lambda s: s[2])
+        return _clip(text[start:end], max_len)
+    if scan.fallback:
+        # fallback: 키워드만이라도 있는 구간 (줄바꿈 포함)
+        return _clip(text[scan.fallback[0]:scan.fallback[1]], max_len)
+    return ""
+
+def extract_ai_training_snippet(text: str, max_len: int = 280) -> str:
+    return ai_snippet_from_scan(text, scan_complaint(text), max_len)
+
 def extract_parties_from_caption(text: str) -> tuple[str, str]:
-    # 흔한 캡션 패턴: "PLAINTIFF, v. DEFENDANT,"
-    # 캡션은 보통 문서 상단에 있으므로 앞부분만 검사
-    cap = text[:2500]
-    
-    # 1. 정교한 패턴: "PLAINTIFF_NAME, [et al.,] Plaintiff(s), v. DEFENDANT_NAME, [et al.,] Defendant(s)"
-    # [A-Z0-9]로 시작하고 특수문자 포함 가능하도록 개선
-    m = re.search(r"([A-Z0-9][A-Z0-9 ,.&'\-]{2,}?)\s*,\s*(?:et\s+al\.)?\s*Plaintiff[s]?\s*,?\s*v\.?\s*([A-Z0-9][A-Z0-9 ,.&'\-]{2,}?)\s*,\s*(?:Defendant[s]?|\b)", cap, re.I)
-    if m:
-        p = re.sub(r"\s+", " ", m.group(1)).strip(" ,")
-        d = re.sub(r"\s+", " ", m.group(2)).strip(" ,")
-        # 법원 이름 등이 잡히는 것 방지 (보통 DISTRICT COURT 등)
-        if "DISTRICT" not in p.upper() and "COURT" not in p.upper():
-            return p, d
-
-    # 2. 더 단순: "X v. Y" (대소문자 구분 없이 검색하되, 결과는 정리)
-    m2 = re.search(r"([A-Z0-9][A-Za-z0-9 ,.&'\-]{2,})\s+v\.?\s+([A-Z0-9][A-Za-z0-9 ,.&'\-]{2,})", cap, re.I)
-    if m2:
-        p2 = m2.group(1).strip()
-        d2 = m2.group(2).strip()
-        if "DISTRICT" not in p2.upper() and "COURT" not in p2.upper():
-            return p2, d2
-            
-    return "미확인", "미확인"
+    # 흔한 캡션 패턴: "PLAINTIFF, [et al.,] Plaintiff(s), v. DEFENDANT, Defendant(s)", 없으면 "X v. Y"
+    # 캡션은 보통 문서 상단에 있으므로 앞부분만 검사 (토큰 기반 파서라 입력 길이에 선형)
+    return caption_parties(text[:CAPTION_CHARS])
+
+
+# =====================================================
+# 점진 추출: 페이지가 도착할 때마다 필요한 사실을 채우고, 다 채워지면 멈춘다
+# =====================================================
+
+# 캡션 검사 범위(extract_parties_from_caption은 앞 CAPTION_CHARS자만 본다)
+CAPTION_CHARS = 2500
+# AI 학습 스니펫: AI_DATA_PATTERNS 중 이 개수 이상을 만족하는 문장이 나오면 충분하다고 본다
+AI_SNIPPET_MIN_SCORE = 2
+
+# 페이지 경계를 넘는 패턴을 다시 훑기 위해 남겨 두는 끝부분 길이.
+# 정규화된 텍스트(공백 한 칸)에서 가장 긴 패턴보다 길어야 한다.
+_OVERLAP = 128
+
+def _normalized_span_len(start: int, end: int) -> int:
+    # 정규화된 텍스트의 문장 조각은 양 끝이 공백이 아니므로 strip한 길이와 같다
+    return end - start
+
+class ComplaintFacts:
+    """고소장 페이지 텍스트를 도착 순서대로 받아 캡션 당사자 / 청구 원인 / AI 학습 스니펫을 채운다.
+
+    feed()가 True를 돌려주면 세 가지가 모두 확보된 것이므로 다음 페이지를 읽을 필요가 없다.
+    - 캡션: 텍스트가 있는 첫 페이지(캡션 페이지)를 받았을 때 — 호출자는 첫 페이지부터 넣는다
+    - 청구 원인: CAUSE_PATTERNS 중 하나 이상 발견
+    - AI 스니펫: AI_SNIPPET_MIN_SCORE 이상인 문장 발견
+
+    페이지마다 새 페이지(와 앞 페이지 끝 _OVERLAP자)만 훑어 상태에 합친다. 끝부분의 매치는
+    다음 페이지에 따라 달라질 수 있으므로 사본 상태에만 반영하고 다음 feed에서 다시 훑는다.
+    """
+
+    def __init__(self):
+        self._parts: List[str] = []
+        self._text: Optional[str] = ""
+        self._length = 0
+        self.pages = 0
+        self.causes: List[str] = []
+        self.done = False
+        self._state = _ScanState(best_only=True)
+        self._resume = 0          # 아직 확정하지 않은 매치가 시작할 수 있는 첫 위치
+        self._tail = ""           # _resume 한 글자 앞(문장 경계 lookbehind)부터 텍스트 끝까지
+        self._scan: Optional[ComplaintScan] = None
+
+    @property
+    def text(self) -> str:
+        """지금까지 받은 페이지를 공백 하나로 정규화해 이은 텍스트."""
+        if self._text is None:
+            self._text = " ".join(self._parts)
+        return self._text
+
+    def feed(self, page_text: str) -> bool:
+        self.pages += 1
+        page = " ".join(page_text.split()) if page_text else ""
+        if page:
+            sep = " " if self._parts else ""
+            self._parts.append(page)
+            self._text = None
+            offset = max(0, self._resume - 1)
+            window = self._tail + sep + page
+            self._length += len(sep) + len(page)
+            # 텍스트 끝에서 _OVERLAP자 이상 떨어진 위치의 매치는 뒤 페이지가 붙어도 바뀌지 않는다
+            settled = max(self._resume, self._length - _OVERLAP)
+            state = self._state
+            for m in _scanner_matches(window, self._resume - offset):
+                if state is self._state and offset + m.start() >= settled:
+                    state = self._state.copy()
+                state.add(m, window, offset, _normalized_span_len)
+            self._scan = state.finish(self._length, _normalized_span_len)
+            self.causes = list(self._scan.causes)
+            self._resume = settled
+            self._tail = window[max(0, settled - 1) - offset:]
+        self.done = (
+            bool(self._parts)
+            and bool(self.causes)
+            and self._scan is not None
+            and self._scan.best_ai_score >= AI_SNIPPET_MIN_SCORE
+        )
+        return self.done
+
+    @property
+    def parties(self) -> tuple[str, str]:
+        return extract_parties_from_caption(self.text) if self.text else ("미확인", "미확인")
+
+    @property
+    def ai_snippet(self) -> str:
+        return ai_snippet_from_scan(self.text, self._scan) if self._scan is not None else ""
+
+    def snippet(self, max_chars: int) -> str:
+        return self.text[:max_chars]
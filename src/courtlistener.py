@@ -2,18 +2,22 @@ from __future__ import annotations
 
 import os
 import re
-import requests
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
-from typing import List, Dict, Optional
-from datetime import datetime, timezone, timedelta
-
-from .utils import debug_log
-from .pdf_text import extract_pdf_text
-from .complaint_parse import (
-    detect_causes,
-    extract_ai_training_snippet,
-    extract_parties_from_caption,
-)
+from itertools import islice
+from typing import Callable, Iterable, Iterator, List, Dict, Optional, Tuple
+from datetime import date, datetime, timezone, timedelta
+
+from . import transport
+from .utils import debug_log, compact_fields, cache_dir, load_json, save_json
+from .http_cache import response_cache
+from .checkpoint import Checkpoints
+from .resolution import resolutions
+from .ratelimit import TokenBucket, AdaptiveConcurrency, parse_retry_after
+from .pdf_text import extract_complaint_facts, no_text_layer, submit_complaint_facts
+from .complaint_parse import ComplaintFacts
 
 BASE = "https://www.courtlistener.com"
 STORAGE_BASE = "https://storage.courtlistener.com"
@@ -22,6 +26,29 @@ SEARCH_URL = BASE + "/api/rest/v4/search/"
 DOCKET_URL = BASE + "/api/rest/v4/dockets/{id}/"
 DOCKETS_LIST_URL = BASE + "/api/rest/v4/dockets/"
 RECAP_DOCS_URL = BASE + "/api/rest/v4/recap-documents/"
+COURTS_URL = BASE + "/api/rest/v4/courts/"
+
+# id__in 배치 조회 1회당 도켓 수
+DOCKET_BATCH_SIZE = 50
+
+def _workers() -> int:
+    try:
+        return max(1, int(os.getenv("CL_WORKERS", "1")))
+    except ValueError:
+        return 1
+
+
+# CourtListener API 쿼터(기본 5,000 req/hour)를 넘지 않도록 모든 스레드가 공유하는 토큰 버킷.
+# 순차 실행(CL_WORKERS=1)은 예전처럼 속도 제한 없이 보내고, 429/Retry-After 처리에만 맡긴다.
+_limiter = TokenBucket(
+    rate=float(os.getenv("CL_MAX_REQUESTS_PER_HOUR", "5000")) / 3600.0 if _workers() > 1 else 0.0,
+    capacity=float(os.getenv("CL_RATE_BURST", "10")),
+)
+
+
+# 429/503에 반응하는 동시 요청 한도 (최대 CL_WORKERS) + 재시도 횟수
+_controller = AdaptiveConcurrency(max_limit=_workers())
+_MAX_RETRIES = int(os.getenv("CL_MAX_RETRIES", "3"))
 
 COMPLAINT_KEYWORDS = [
     "complaint",
@@ -34,7 +61,7 @@ COMPLAINT_KEYWORDS = [
 # Dataclasses
 # =====================================================
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class CLDocument:
     docket_id: Optional[int]
     docket_number: str
@@ -52,8 +79,15 @@ class CLDocument:
     extracted_causes: str
     extracted_ai_snippet: str
 
+    def __post_init__(self):
+        compact_fields(
+            self,
+            interned=("court", "date_filed", "doc_type", "extracted_causes"),
+            shared=("pdf_text_snippet", "extracted_ai_snippet"),
+        )
+
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class CLCaseSummary:
     docket_id: int
     case_name: str
@@ -72,6 +106,16 @@ class CLCaseSummary:
     extracted_causes: str
     extracted_ai_snippet: str
 
+    def __post_init__(self):
+        compact_fields(
+            self,
+            interned=(
+                "court", "court_short_name", "court_api_url", "status", "nature_of_suit",
+                "cause", "complaint_doc_no", "complaint_type", "extracted_causes",
+            ),
+            shared=("extracted_ai_snippet",),
+        )
+
 
 # =====================================================
 # Utility
@@ -95,7 +139,90 @@ def _detect_complaint_type(desc: str) -> str:
     return "Original"
 
 
-_court_cache = {}
+# 법원 약칭 테이블 (court id -> short_name). 디스크에 버전/TTL과 함께 저장해 새 프로세스에서도 재사용
+COURT_TABLE_VERSION = 1
+COURT_TABLE_TTL = 30 * 24 * 3600
+
+_court_cache: Dict[str, str] = {}
+_court_lock = threading.Lock()
+_court_loaded = False
+# 마지막으로 courts 엔드포인트 전체를 끝까지 받은 시각 (개별 조회로 추가할 때는 바꾸지 않는다)
+_court_fetched_at = 0.0
+
+
+def _court_table_path() -> str:
+    return os.path.join(cache_dir(), "courts.json")
+
+
+def _court_id(court_api_url: str) -> str:
+    m = re.search(r"/courts/([^/]+)/?$", court_api_url)
+    return m.group(1) if m else court_api_url
+
+
+def _save_court_table() -> None:
+    try:
+        save_json(_court_table_path(), {
+            "version": COURT_TABLE_VERSION,
+            "fetched_at": _court_fetched_at,
+            "courts": _court_cache,
+        })
+    except OSError as e:
+        debug_log(f"court table write failed: {e}")
+
+
+def preload_courts(force: bool = False) -> int:
+    """법원 약칭 테이블을 준비한다.
+
+    디스크 테이블이 같은 버전이고 TTL 이내면 그대로 쓰고(네트워크 0회),
+    아니면 courts 엔드포인트 전체를 한 번에 받아 저장한다. 로드된 법원 수를 반환한다.
+    일괄 조회가 실패하거나 중간에 끊기면 기존 테이블에 받은 만큼만 더하고 fetched_at은 그대로 둬서
+    다음 실행이 다시 일괄 조회한다.
+    """
+    global _court_loaded, _court_fetched_at
+    with _court_lock:
+        if _court_loaded and not force:
+            return len(_court_cache)
+
+        table = load_json(_court_table_path()) or {}
+        if table.get("version") != COURT_TABLE_VERSION:
+            table = {}
+        _court_fetched_at = table.get("fetched_at", 0.0)
+        fresh = time.time() - _court_fetched_at < COURT_TABLE_TTL
+        if fresh and not force:
+            _court_cache.update(table.get("courts") or {})
+            _court_loaded = True
+            debug_log(f"court table loaded from disk: {len(_court_cache)} courts")
+            return len(_court_cache)
+
+        debug_log("court table stale or missing → bulk preload")
+        courts: Dict[str, str] = {}
+        url = COURTS_URL
+        params = {"fields": "id,short_name", "page_size": 100}
+        complete = False
+        while url:
+            data = _get(url, params=params) if params else _get(url)
+            params = None
+            if not data:
+                break
+            for c in data.get("results", []):
+                if c.get("id") and c.get("short_name"):
+                    courts[str(c["id"])] = c["short_name"]
+            url = data.get("next")
+        else:
+            complete = True
+
+        if not complete:
+            # 일괄 조회 실패 / 일부만 받음: 오래된 테이블이라도 함께 사용
+            debug_log(f"court bulk preload incomplete ({len(courts)} courts) → table kept stale")
+            _court_cache.update(table.get("courts") or {})
+        _court_cache.update(courts)
+        if complete and courts:
+            _court_fetched_at = time.time()
+        if courts:
+            _save_court_table()
+        _court_loaded = True
+        return len(_court_cache)
+
 
 def _build_court_meta(court_raw: str) -> tuple[str, str]:
     court_raw = _safe_str(court_raw)
@@ -111,13 +238,18 @@ def _build_court_meta(court_raw: str) -> tuple[str, str]:
         # fallback (legacy slug)
         court_api_url = f"{BASE}/api/rest/v4/courts/{court_raw}/"
 
-    if court_api_url in _court_cache:
-        return _court_cache[court_api_url], court_api_url
+    preload_courts()
+    court_id = _court_id(court_api_url)
+    if court_id in _court_cache:
+        return _court_cache[court_id], court_api_url
 
+    # 테이블에 없는 법원만 개별 조회 후 테이블에 추가
     data = _get(court_api_url)
     if data and data.get("short_name"):
         short_name = data.get("short_name")
-        _court_cache[court_api_url] = short_name
+        with _court_lock:
+            _court_cache[court_id] = short_name
+            _save_court_table()
         return short_name, court_api_url
 
     # fallback
@@ -128,6 +260,7 @@ def _headers() -> Dict[str, str]:
     token = os.getenv("COURTLISTENER_TOKEN", "").strip()
     headers = {
         "Accept": "application/json",
+        "Accept-Encoding": "gzip, deflate",
         "User-Agent": "ai-lawsuit-monitor/1.4",
     }
     if token:
@@ -135,13 +268,60 @@ def _headers() -> Dict[str, str]:
     return headers
 
 
+def _cl_request(url: str, **kwargs):
+    """courtlistener.com GET: 토큰 버킷 + 적응형 동시성 제어 + 429/503 재시도.
+
+    Retry-After가 있으면 그만큼(없으면 지수 백오프) 모든 스레드의 새 요청을 멈춘 뒤 재시도한다.
+    """
+    for attempt in range(_MAX_RETRIES + 1):
+        _controller.acquire()
+        _limiter.acquire()
+        status = 0
+        retry_after = None
+        start = time.monotonic()
+        try:
+            r = transport.get(url, **kwargs)
+            status = r.status_code
+            if status in (429, 503):
+                retry_after = parse_retry_after(r.headers.get("Retry-After")) or float(2 ** attempt)
+        finally:
+            _controller.release(time.monotonic() - start, status, retry_after)
+
+        if status not in (429, 503) or attempt == _MAX_RETRIES:
+            return r
+        r.close()
+        debug_log(f"THROTTLED {status} for {url} — retry in {retry_after:.1f}s ({attempt + 1}/{_MAX_RETRIES})")
+        _controller.record_retry()
+    return r
+
+
+def throttle_metrics() -> dict:
+    """현재 동시성 한도, throttle(429/503) 횟수, 재시도 횟수 등을 반환한다."""
+    return _controller.snapshot()
+
+
 def _get(url: str, params: Optional[dict] = None) -> Optional[dict]:
+    # 디스크 응답 캐시: TTL 이내면 네트워크 없이 반환, 지났으면 조건부 GET으로 재검증
+    cached = response_cache.lookup(url, params)
+    if cached is not None and cached["fresh"]:
+        debug_log(f"CACHE HIT {url}")
+        return cached["body"]
+
+    headers = _headers()
+    if cached is not None:
+        headers.update(response_cache.validators(cached))
+
     try:
         debug_log(f"GET {url}")
         debug_log(f"PARAMS length={len(str(params)) if params else 0}")
 
         # 🔥 FIX: CourtListener search는 반드시 GET 사용
-        r = requests.get(url, params=params, headers=_headers(), timeout=30)
+        r = _cl_request(url, params=params, headers=headers, timeout=30)
+
+        if r.status_code == 304 and cached is not None:
+            debug_log(f"CACHE REVALIDATED (304) {url}")
+            response_cache.refresh(url, params, cached, r.headers)
+            return cached["body"]
 
         if r.status_code in (401, 403):
             debug_log(f"AUTH ERROR {r.status_code} for {url}")           
@@ -154,7 +334,9 @@ def _get(url: str, params: Optional[dict] = None) -> Optional[dict]:
 
         r.raise_for_status()
         debug_log(f"SUCCESS {url} status={r.status_code}")
-        return r.json()
+        data = r.json()
+        response_cache.store(url, params, data, r.headers)
+        return data
     except Exception as e:
         debug_log(f"EXCEPTION in _get function: {type(e).__name__}: {e}")    
         return None
@@ -170,63 +352,341 @@ def _abs_url(u: str) -> str:
     return u
 
 # =====================================================
-# NEW: PDF HEAD Validation (403 사전 감지)
+# RECAP 문서 쿼리 빌더 (서버 측 projection / 필터 / 정렬)
 # =====================================================
 
-def _validate_pdf_url(pdf_url: str) -> bool:
-    """
-    PDF 다운로드 전에 HEAD 요청으로 사전 검증
+# 빌더가 실제로 읽는 필드만 받는다
+RECAP_DOC_FIELDS = ["id", "description", "document_number", "date_filed", "filepath_local", "absolute_url"]
+
+class RecapDocsQuery:
+    """RECAP_DOCS_URL 쿼리 빌더.
+
+    fields= projection과 document_number 정렬을 서버에 넘긴다. Complaint 여부와 날짜는
+    도켓별 공유 목록(DocketStore)을 클라이언트에서 거른다 (description 필터는 서버 지원이
+    확인되지 않아 쓰지 않는다).
     """
-    if not pdf_url:
-        return False
 
-    try:
-        debug_log(f"HEAD check: {pdf_url}")
-
-        r = requests.head(
-            pdf_url,
-            headers={
-                "User-Agent": "Mozilla/5.0",
-                "Accept": "application/pdf",
-            },
-            timeout=15,
-            allow_redirects=True,
-        )
+    def __init__(self, docket_id: int, page_size: int = 100):
+        self.params: Dict[str, object] = {"docket": docket_id, "page_size": page_size}
 
-        debug_log(f"HEAD status={r.status_code}")
+    def fields(self, *names: str) -> "RecapDocsQuery":
+        self.params["fields"] = ",".join(names)
+        return self
 
-        if r.status_code != 200:
-            debug_log(f"[ERROR] PDF HEAD failed status={r.status_code}")
-            return False
+    def order_by(self, field: str) -> "RecapDocsQuery":
+        self.params["order_by"] = field
+        return self
 
-        content_type = r.headers.get("Content-Type", "")
-        content_length = r.headers.get("Content-Length", "unknown")
+    def pages(self):
+        """결과 페이지(results 리스트)를 하나씩 yield 한다. 호출부가 중간에 멈추면 더 요청하지 않는다."""
+        url = RECAP_DOCS_URL
+        params = dict(self.params)
+        while url:
+            data = _get(url, params=params) if params else _get(url)
+            params = None
+            if not data:
+                debug_log("RECAP pagination returned no data")
+                return
+            yield data.get("results", [])
+            url = data.get("next")
 
-        debug_log(f"Content-Type={content_type}")
-        debug_log(f"Content-Length={content_length}")
 
-        if "pdf" not in content_type.lower():
-            debug_log("[ERROR] HEAD response is not PDF")
-            return False
+def _is_complaint_doc(d: dict) -> bool:
+    desc = _safe_str(d.get("description")).lower()
+    return any(k in desc for k in COMPLAINT_KEYWORDS)
 
-        return True
 
-    except Exception as e:
-        debug_log(f"[ERROR] HEAD request exception: {type(e).__name__}: {e}")
+def _filed_before(d: dict, day) -> bool:
+    """문서 date_filed가 day보다 이전인지 (날짜가 없거나 읽을 수 없으면 False)."""
+    try:
+        return datetime.fromisoformat(_safe_str(d.get("date_filed"))[:10]).date() < day
+    except ValueError:
         return False
 
 
+class _RecapListing:
+    """도켓 하나의 RECAP 문서 목록(document_number 순) 중 Complaint 문서. 필요한 만큼만 페이지를 받는다.
+
+    first_complaint는 첫 Complaint가 나올 때까지, complaint_docs는 끝까지 같은 목록을 이어 읽는다.
+    """
+
+    def __init__(self, docket_id: int):
+        self._results = RecapDocsQuery(docket_id).fields(*RECAP_DOC_FIELDS).order_by("document_number").pages()
+        self.complaints: List[dict] = []
+        self.any_docs = False
+        self.pages = 0
+        self.first_page = 0  # 첫 Complaint가 나온 페이지
+        self.exhausted = False
+
+    def _next_page(self) -> None:
+        results = next(self._results, None)
+        if results is None:
+            self.exhausted = True
+            # 첫 요청부터 실패해도 요청 한 번은 쓴 것으로 센다
+            self.pages = max(self.pages, 1)
+            return
+        self.pages += 1
+        self.any_docs = self.any_docs or bool(results)
+        for d in results:
+            debug_log(f"checking RECAP doc: {d.get('description')}")
+            if _is_complaint_doc(d):
+                self.first_page = self.first_page or self.pages
+                self.complaints.append(d)
+
+    def first(self) -> Optional[dict]:
+        while not self.complaints and not self.exhausted:
+            self._next_page()
+        return self.complaints[0] if self.complaints else None
+
+    def all(self) -> List[dict]:
+        while not self.exhausted:
+            self._next_page()
+        return self.complaints
+
+
+# =====================================================
+# Docket Store (실행 단위 도켓/RECAP 조회 공유)
+# =====================================================
+
+class DocketStore:
+    """실행(run) 단위 도켓 메타데이터 / RECAP 문서 조회 저장소.
+
+    여러 빌더가 같은 도켓을 처리해도 DOCKET_URL 조회와 RECAP_DOCS_URL 쿼리는
+    도켓당 한 번만 수행하고, 재사용으로 절약한 요청 수를 saved에 누적한다.
+    목록/배치 응답으로 채운 도켓은 그 요청이 이미 fetches에 들어 있으므로 첫 사용은 saved로 세지 않는다.
+    """
+
+    def __init__(self, checkpoints: Optional[Checkpoints] = None):
+        # delta 모드: date_modified가 지난 실행 이후 바뀌지 않은 도켓은 건너뛴다
+        self.checkpoints = checkpoints
+        # docket_id -> 이번 실행에서 본 date_modified / 빌더 처리 성공 여부 (모든 빌더가 성공해야 True)
+        self._modified: Dict[int, str] = {}
+        self._processed: Dict[int, bool] = {}
+        self._dockets: Dict[int, dict] = {}
+        # 목록/배치 응답으로 채워졌고 아직 docket()으로 쓰이지 않은 도켓
+        self._bulk: set = set()
+        # (쿼리 종류, docket_id, ...) -> (결과, 요청한 페이지 수)
+        self._recap: Dict[tuple, tuple] = {}
+        # docket_id -> 빌더들이 함께 쓰는 RECAP 문서 목록
+        self._listings: Dict[int, _RecapListing] = {}
+        self.fetches = 0
+        self.saved = 0
+        # 병렬 빌더가 같은 도켓을 동시에 조회하지 않도록 키별 잠금
+        self._lock = threading.Lock()
+        self._key_locks: Dict[tuple, threading.Lock] = {}
+
+    def _key_lock(self, *key) -> threading.Lock:
+        with self._lock:
+            return self._key_locks.setdefault(key, threading.Lock())
+
+    def _count(self, fetches: int = 0, saved: int = 0) -> None:
+        with self._lock:
+            self.fetches += fetches
+            self.saved += saved
+
+    def docket(self, docket_id: int) -> Optional[dict]:
+        with self._key_lock("docket", docket_id):
+            if docket_id in self._dockets:
+                with self._lock:
+                    first_use = docket_id in self._bulk
+                    self._bulk.discard(docket_id)
+                if not first_use:
+                    self._count(saved=1)
+                return self._dockets[docket_id]
+            self._count(fetches=1)
+            data = _get(DOCKET_URL.format(id=docket_id))
+            if data:
+                self._dockets[docket_id] = data
+            return data
+
+    def add(self, docket: dict, seed_cache: bool = True) -> None:
+        """다른 목록 응답에 포함된 도켓 객체를 저장소에 채운다.
+
+        seed_cache면 DOCKET_URL 단건 응답 캐시에도 넣어, 다음 실행이 단건 조회를 캐시로 처리하게 한다.
+        """
+        if not (docket and docket.get("id")):
+            return
+        did = int(docket["id"])
+        with self._lock:
+            if did in self._dockets:
+                return
+            self._dockets[did] = docket
+            self._bulk.add(did)
+        if seed_cache:
+            response_cache.seed(DOCKET_URL.format(id=did), None, docket)
+
+    def prefetch(self, docket_ids: List[int], chunk_size: int = DOCKET_BATCH_SIZE) -> None:
+        """아직 없는 도켓들을 DOCKETS_LIST_URL의 id__in 배치로 한 번에 가져온다 (N → N/chunk 요청).
+
+        단건 응답 캐시에 TTL 이내 항목이 있는 도켓은 배치에서 빼고 캐시 본문을 쓴다.
+        """
+        with self._lock:
+            wanted = list(dict.fromkeys(int(i) for i in docket_ids if i and int(i) not in self._dockets))
+        missing = []
+        for did in wanted:
+            cached = response_cache.lookup(DOCKET_URL.format(id=did))
+            if cached is not None and cached["fresh"]:
+                self.add(cached["body"], seed_cache=False)
+            else:
+                missing.append(did)
+        for i in range(0, len(missing), chunk_size):
+            chunk = missing[i:i + chunk_size]
+            debug_log(f"batch docket lookup: {len(chunk)} dockets")
+            url = DOCKETS_LIST_URL
+            params = {"id__in": ",".join(str(x) for x in chunk), "page_size": len(chunk)}
+            while url:
+                self._count(fetches=1)
+                data = _get(url, params=params) if params else _get(url)
+                params = None
+                if not data:
+                    break
+                for d in data.get("results", []):
+                    self.add(d)
+                url = data.get("next")
+
+    def changed(self, docket_ids: List[int]) -> List[int]:
+        """delta 모드에서 지난 실행 이후 date_modified가 바뀐(또는 처음 보는) 도켓만 남긴다.
+
+        체크포인트는 여기서 올리지 않고, 빌더가 processed()로 성공을 알린 도켓만 settle()에서 올린다.
+        """
+        if self.checkpoints is None:
+            return docket_ids
+        out = []
+        for did in docket_ids:
+            modified = _safe_str((self.docket(did) or {}).get("date_modified"))
+            seen = self.checkpoints.get("dockets", did)
+            if modified and seen == modified:
+                debug_log(f"delta: docket {did} unchanged since {modified} — skipped")
+                continue
+            if modified:
+                with self._lock:
+                    self._modified[did] = modified
+            out.append(did)
+        return out
+
+    def processed(self, docket_id: int, ok: bool = True) -> None:
+        """빌더가 도켓 처리를 끝냈음을 알린다. 한 빌더라도 실패(ok=False)하면 그 도켓의 체크포인트는 올리지 않는다."""
+        with self._lock:
+            self._processed[docket_id] = self._processed.get(docket_id, True) and ok
+
+    def settle(self) -> None:
+        """모든 빌더가 성공한 도켓만 date_modified 체크포인트를 올린다 (리포트 게시 전 commit 대상으로 set)."""
+        if self.checkpoints is None:
+            return
+        with self._lock:
+            done = [(did, m) for did, m in self._modified.items() if self._processed.get(did)]
+        for did, modified in done:
+            self.checkpoints.set("dockets", did, modified)
+        skipped = len(self._modified) - len(done)
+        if skipped:
+            debug_log(f"delta: {skipped} dockets not fully processed — checkpoint kept")
+
+    def _recap_cached(self, key: tuple, loader: Callable[[], tuple]):
+        with self._key_lock(*key):
+            if key in self._recap:
+                value, pages = self._recap[key]
+                self._count(saved=pages)
+                return value
+            value, pages = loader()
+            self._count(fetches=pages)
+            self._recap[key] = (value, pages)
+            return value
+
+    def _listing(self, docket_id: int, read: Callable[[_RecapListing], object], reused: Callable[[_RecapListing], int]):
+        """도켓의 공유 RECAP 목록에서 read()로 값을 얻는다. 이미 받은 페이지로 답하면 reused()만큼 절약으로 센다."""
+        with self._key_lock("recap", docket_id):
+            listing = self._listings.get(docket_id)
+            if listing is None:
+                listing = self._listings[docket_id] = _RecapListing(docket_id)
+            before = listing.pages
+            value = read(listing)
+            fetched = listing.pages - before
+            self._count(fetches=fetched, saved=reused(listing) if not fetched else before)
+            return value
+
+    def has_recap_docs(self, docket_id: int) -> bool:
+        """도켓에 RECAP 문서가 하나라도 있는지. 공유 목록을 이미 받았으면 그걸로, 아니면 id 1건만 요청."""
+        with self._lock:
+            listing = self._listings.get(docket_id)
+        if listing is not None and listing.pages:
+            self._count(saved=1)
+            return listing.any_docs
+
+        def load():
+            for results in RecapDocsQuery(docket_id, page_size=1).fields("id").pages():
+                return bool(results), 1
+            return False, 1
+        return self._recap_cached(("any", docket_id), load)
+
+    def complaint_docs(self, docket_id: int, filed_after=None) -> List[dict]:
+        """Complaint/Petition 문서 목록 (filed_after 이후 제출분, document_number 순).
+
+        날짜 조건은 공유 목록을 클라이언트에서 걸러 적용한다 (도켓당 RECAP 목록은 한 번만 받는다).
+        """
+        debug_log(f"RECAP complaint docs for docket={docket_id} filed_after={filed_after}")
+        docs = self._listing(docket_id, lambda listing: list(listing.all()), lambda listing: listing.pages)
+        if filed_after:
+            docs = [d for d in docs if not _filed_before(d, filed_after)]
+        return docs
+
+    def first_complaint(self, docket_id: int) -> Optional[dict]:
+        """첫 Complaint/Petition 문서. 찾는 즉시 페이지 순회를 멈춘다."""
+        return self._listing(
+            docket_id, _RecapListing.first, lambda listing: listing.first_page or listing.pages
+        )
+
+    def summary(self) -> str:
+        return f"network fetches={self.fetches} saved={self.saved}"
+
+
 # =====================================================
 # NEW: HTML Parsing for PDF (No API Required)
 # =====================================================
 
-def _extract_first_pdf_from_docket_html(docket_id: int) -> str:
+# RECAP PDF 링크: 절대 URL(storage)을 우선하고, 없을 때만 상대 href(/recap/...)를 쓴다
+_RECAP_PDF_ABS_RE = re.compile(rb'https://storage\.courtlistener\.com/recap/[^"]+?\.pdf', re.IGNORECASE)
+_RECAP_PDF_REL_RE = re.compile(rb'href="(/recap/[^"]+?\.pdf)"', re.IGNORECASE)
+HTML_SCAN_CHUNK = 16 * 1024
+# 청크 경계에 걸친 링크를 놓치지 않도록 다음 창에 남겨 두는 꼬리 길이 (링크 최대 길이보다 넉넉히)
+HTML_SCAN_OVERLAP = 2048
+
+
+def _scan_first_recap_pdf(chunks: Iterable[bytes]) -> Tuple[str, int]:
+    """HTML 청크를 순서대로 훑어 첫 RECAP PDF 링크와 읽은 바이트 수를 반환한다.
+
+    절대 URL을 찾는 즉시 멈춘다. 상대 링크는 처음 나온 것만 기억해 두고,
+    문서 끝까지 절대 URL이 없을 때 돌려준다 (HTML 전체를 받던 때와 같은 우선순위).
+    버퍼에는 현재 청크 + 직전 꼬리(HTML_SCAN_OVERLAP)만 유지한다.
+    """
+    tail = b""
+    read = 0
+    relative = ""
+    for chunk in chunks:
+        if not chunk:
+            continue
+        read += len(chunk)
+        window = tail + chunk
+        m = _RECAP_PDF_ABS_RE.search(window)
+        if m:
+            return m.group(0).decode("utf-8", "replace"), read
+        if not relative:
+            m = _RECAP_PDF_REL_RE.search(window)
+            if m:
+                relative = STORAGE_BASE + m.group(1).decode("utf-8", "replace")
+        tail = window[-HTML_SCAN_OVERLAP:]
+    return relative, read
+
+
+def _extract_first_pdf_from_docket_html(docket_id: int, store: Optional[DocketStore] = None) -> str:
     """
     Fetch docket HTML page and extract the first PDF link.
+
+    HTML 전체를 받지 않고 청크 단위로 스트리밍하며 탐색하고, 링크를 찾는 즉시 연결을 닫는다.
     """
+    store = store or DocketStore()
     try:
-        # 🔥 1. 먼저 API에서 정확한 도켓 URL(slug 포함)을 얻는다
-        docket_meta = _get(DOCKET_URL.format(id=docket_id))
+        # 🔥 1. 먼저 API에서 정확한 도켓 URL(slug 포함)을 얻는다 (이미 조회한 메타데이터 재사용)
+        docket_meta = store.docket(docket_id)
         if not docket_meta:
             return ""
 
@@ -243,39 +703,26 @@ def _extract_first_pdf_from_docket_html(docket_id: int) -> str:
                 "Chrome/120.0 Safari/537.36"
             ),
             "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
-            "Accept-Encoding": "gzip, deflate, br",
+            # br은 iter_content가 풀어 주지 못할 수 있어 gzip/deflate만 요청한다
+            "Accept-Encoding": "gzip, deflate",
             "Connection": "keep-alive",
         }
 
-        r = requests.get(url, headers=headers, timeout=25, allow_redirects=True)
-        if r.status_code != 200:
-            return ""
-
-        html = r.text
-        debug_log(f"HTML fetch successful: {url}")
-        debug_log(f"HTML length: {len(html)}")
-        
-        # =====================================================
-        # 🔥 FIX: 절대 URL + 상대 URL 모두 탐지
-        # =====================================================
-
-        # 1️⃣ 절대 URL 먼저 탐지
-        match = re.search(
-            r"https://storage\.courtlistener\.com/recap/[^\"]+?\.pdf",
-            html,
-            re.IGNORECASE,
-        )
-        if match:
-            return match.group(0)
-
-        # 2️⃣ 상대 URL 탐지 (/recap/...)
-        match = re.search(
-            r'href="(/recap/[^"]+?\.pdf)"',
-            html,
-            re.IGNORECASE,
-        )
-        if match:
-            return STORAGE_BASE + match.group(1)
+        r = _cl_request(url, headers=headers, timeout=25, allow_redirects=True, stream=True)
+        try:
+            if r.status_code != 200:
+                return ""
+            debug_log(f"HTML fetch successful: {url}")
+
+            # =====================================================
+            # 🔥 절대 URL 우선, 없으면 상대 URL — 스트리밍 탐지
+            # =====================================================
+            link, read = _scan_first_recap_pdf(r.iter_content(HTML_SCAN_CHUNK))
+            debug_log(f"HTML scanned bytes: {read} (found={bool(link)})")
+            return link
+        finally:
+            # 찾았으면 나머지 본문은 받지 않고 연결을 끊는다
+            r.close()
 
     except Exception:
         pass
@@ -287,9 +734,22 @@ def _extract_first_pdf_from_docket_html(docket_id: int) -> str:
 # Search
 # =====================================================
 
-def search_recent_documents(query: str, days: int = 3, max_results: int = 50) -> List[dict]:
+def iter_recent_documents(
+    query: str,
+    days: int = 3,
+    since: Optional[date] = None,
+    page_size: int = 20,
+    strict: bool = False,
+) -> Iterator[dict]:
+    """최근 문서 검색 결과를 cursor pagination으로 하나씩 yield 한다.
+
+    - cutoff(오늘 - days, delta 모드면 since)를 filed_after로 서버에 넘긴다.
+    - dateFiled 내림차순이므로 cutoff 이전 결과가 나오면 그 자리에서 멈춘다 (다음 페이지 요청 없음).
+    - 요청 실패(네트워크 오류, throttling, HTTP 오류)는 기본적으로 결과 끝으로 처리하고,
+      strict면 "결과 없음"과 구분할 수 있도록 OSError를 낸다.
+    """
     debug_log(f"CourtListener 검색 중: '{query}'")
-    debug_log(f"search_recent_documents query='{query}' days={days}")   
+    debug_log(f"iter_recent_documents query='{query}' days={days} since={since}")
 
 #                          문서단위 검색 vs. 사건단위 검색
 #                         ================================
@@ -303,55 +763,115 @@ def search_recent_documents(query: str, days: int = 3, max_results: int = 50) ->
 # AI 학습 문장 추출   | V                          | 제한적
 # 최근 업데이트       | 일부                       | 전체 사건 기준
 
-    data = _get(
-        SEARCH_URL,
-        # RECAP 문서 검색(type=r) → 사건 검색(type=ca)
-        # ca = cases (사건)
-        # r = recap documents (문서)
-        params={
-            "q": query,
-            "type": "r",                 # 🔥  BEST PRACTICE: 문서 기반 검색 유지
-            "order_by": "dateFiled desc",   # 🔥 최신순 정렬            
-            "page_size": max_results,
-            "semantic": "true",          # 🔥 semantic=true 필수
-        },        
-    )
-    if not data:
-        debug_log("search_recent_documents: no data returned")        
-        return []
-
-    results = data.get("results", [])
-    debug_log(f"search results raw count={len(results)}")    
     # 🔥 FIX: 날짜 기준 비교 (시간 제거)
     today = datetime.now(timezone.utc).date()
     cutoff = today - timedelta(days=days)
+    # delta 모드: 체크포인트 날짜 이전은 버린다 (lookback은 안전 하한으로만 사용)
+    if since and since > cutoff:
+        cutoff = since
     debug_log(f"cutoff date={cutoff}")
 
-    out = []
-    for r in results:
-        date_val = _safe_str(r.get("dateFiled") or r.get("date_filed"))
-        if date_val:
-            try:
-                dt = datetime.fromisoformat(date_val[:10]).date()
-                if dt < cutoff:
-                    debug_log(f"[DEBUG] filtered by date: {dt} < {cutoff}")                    
-                    continue
-            except Exception as e:
-                debug_log(f"[DEBUG] date parse error: {e}")
-                pass
-        out.append(r)
-
-    # ✅ BEST PRACTICE: 문서 검색 결과에서 docket_id 안정 확보
-    for hit in out:
-        if not hit.get("docket_id"):
-            docket_url = hit.get("docket")
-            if isinstance(docket_url, str):
-                m = re.search(r"/dockets/(\d+)/", docket_url)
-                if m:
-                    hit["docket_id"] = int(m.group(1))
-                    debug_log(f"[DEBUG] injected docket_id={hit['docket_id']} from docket URL")
+    url = SEARCH_URL
+    # RECAP 문서 검색(type=r) → 사건 검색(type=ca)
+    # ca = cases (사건)
+    # r = recap documents (문서)
+    params = {
+        "q": query,
+        "type": "r",                 # 🔥  BEST PRACTICE: 문서 기반 검색 유지
+        "order_by": "dateFiled desc",   # 🔥 최신순 정렬            
+        "page_size": page_size,
+        "semantic": "true",          # 🔥 semantic=true 필수
+        "filed_after": cutoff.isoformat(),  # 날짜 조건은 서버에서 먼저 거른다
+    }
+    while url:
+        data = _get(url, params=params) if params else _get(url)
+        params = None
+        if not data:
+            debug_log("iter_recent_documents: no data returned")
+            if strict:
+                raise OSError(f"search request failed: {query}")
+            return
+
+        results = data.get("results", [])
+        debug_log(f"search results page count={len(results)}")
+        for r in results:
+            date_val = _safe_str(r.get("dateFiled") or r.get("date_filed"))
+            if date_val:
+                try:
+                    dt = datetime.fromisoformat(date_val[:10]).date()
+                    if dt < cutoff:
+                        debug_log(f"[DEBUG] reached cutoff: {dt} < {cutoff} — stop paging")
+                        return
+                except Exception as e:
+                    debug_log(f"[DEBUG] date parse error: {e}")
+
+            # ✅ BEST PRACTICE: 문서 검색 결과에서 docket_id 안정 확보
+            if not r.get("docket_id"):
+                docket_url = r.get("docket")
+                if isinstance(docket_url, str):
+                    m = re.search(r"/dockets/(\d+)/", docket_url)
+                    if m:
+                        r["docket_id"] = int(m.group(1))
+                        debug_log(f"[DEBUG] injected docket_id={r['docket_id']} from docket URL")
+            yield r
+
+        # v4 search는 cursor 기반 next URL을 돌려준다
+        url = data.get("next")
 
-    return out
+
+def search_recent_documents(
+    query: str,
+    days: int = 3,
+    max_results: Optional[int] = 50,
+    since: Optional[date] = None,
+    strict: bool = False,
+) -> List[dict]:
+    """iter_recent_documents 결과를 리스트로 모은다. max_results=None이면 기간 내 결과 전체."""
+    page_size = min(max_results, 100) if max_results else 20
+    docs = iter_recent_documents(query, days=days, since=since, page_size=page_size, strict=strict)
+    return list(islice(docs, max_results))
+
+
+def _hit_date(hit: dict) -> str:
+    return _safe_str(hit.get("dateFiled") or hit.get("date_filed"))[:10]
+
+
+def _hit_key(hit: dict) -> str:
+    return _safe_str(hit.get("docket_id") or hit.get("id") or hit.get("absolute_url"))
+
+
+def search_new_documents(
+    query: str,
+    days: int = 3,
+    max_results: Optional[int] = 50,
+    checkpoints: Optional[Checkpoints] = None,
+) -> List[dict]:
+    """search_recent_documents + 쿼리별 체크포인트(dateFiled / ID high-water mark).
+
+    checkpoints가 없으면 search_recent_documents와 같다. 있으면 지난 실행의 최대 dateFiled 이후 문서만
+    요청하고, 그 날짜에 이미 처리한 문서는 제외한 뒤 새 high-water mark를 기록한다.
+    """
+    if checkpoints is None:
+        return search_recent_documents(query, days=days, max_results=max_results)
+
+    mark = checkpoints.get("search", query) or {}
+    mark_date = mark.get("date", "")
+    mark_keys = set(mark.get("keys", []))
+    since = date.fromisoformat(mark_date) if mark_date else None
+
+    hits = search_recent_documents(query, days=days, max_results=max_results, since=since)
+    new_hits = [h for h in hits if not (_hit_date(h) == mark_date and _hit_key(h) in mark_keys)]
+    debug_log(f"delta search: {len(new_hits)}/{len(hits)} new since {mark_date or '-'}")
+
+    dates = [_hit_date(h) for h in hits if _hit_date(h)]
+    if dates:
+        top = max(dates)
+        keys = {_hit_key(h) for h in hits if _hit_date(h) == top}
+        if top == mark_date:
+            keys |= mark_keys
+        if top >= mark_date:
+            checkpoints.set("search", query, {"date": top, "keys": sorted(keys)})
+    return new_hits
 
 
 def _pick_docket_id(hit: dict) -> Optional[int]:
@@ -377,203 +897,290 @@ def _pick_docket_id(hit: dict) -> Optional[int]:
 # Builders
 # =====================================================
 
-def build_case_summaries_from_docket_numbers(docket_numbers: List[str]) -> List[CLCaseSummary]:
-    out = []
-    for dn in docket_numbers:
-        data = _get(DOCKETS_LIST_URL, params={"docket_number": dn})
-        if not data:
-            continue
-        for d in data.get("results", []):
-            did = d.get("id")
-            if did:
-                s = build_case_summary_from_docket_id(int(did))
-                if s:
-                    out.append(s)
-    return out
-
+def _fan_out(func: Callable, items: List, workers: Optional[int] = None) -> List:
+    """items 각각에 func를 적용한 결과를 입력 순서 그대로 반환한다.
 
-def build_case_summaries_from_case_titles(case_titles: List[str]) -> List[CLCaseSummary]:
-    out = []
-    for ct in case_titles:
-        hits = search_recent_documents(ct, days=365, max_results=5)
-        out.extend(build_case_summaries_from_hits(hits))
-    return out
-
-
-def build_case_summaries_from_hits(hits: List[dict]) -> List[CLCaseSummary]:
-    out = []
+    workers(기본 CL_WORKERS)가 2 이상이면 bounded 스레드 풀에서 병렬 실행한다.
+    """
+    workers = workers or _workers()
+    if workers <= 1 or len(items) <= 1:
+        return [func(x) for x in items]
+    with ThreadPoolExecutor(max_workers=min(workers, len(items))) as ex:
+        return list(ex.map(func, items))
+
+
+def _docket_ids_for_number(dn: str, store: DocketStore) -> List[int]:
+    # 지난 실행에서 해석한 사건번호면 목록 조회 없이 ID를 재사용한다 (못 찾은 결과도 짧게 기억)
+    cached = resolutions.get("docket_number", dn)
+    if cached is not None:
+        return cached
+    data = _get(DOCKETS_LIST_URL, params={"docket_number": dn})
+    if not data:
+        return []
+    results = [d for d in data.get("results", []) if d.get("id")]
+    # 목록 응답의 도켓 객체를 그대로 저장소에 넣어 상세 재조회를 피한다
+    for d in results:
+        store.add(d)
+    ids = [int(d["id"]) for d in results]
+    resolutions.set("docket_number", dn, ids)
+    return ids
+
+
+def _docket_ids_for_title(title: str) -> List[int]:
+    cached = resolutions.get("title", title)
+    if cached is not None:
+        return cached
+    try:
+        hits = search_recent_documents(title, days=365, max_results=5, strict=True)
+    except OSError as e:
+        # 일시 장애를 "찾지 못함"으로 기억하지 않는다 (다음 실행에서 다시 검색)
+        debug_log(f"title resolution skipped: {e}")
+        return []
+    ids = [did for did in (_pick_docket_id(h) for h in hits) if did]
+    resolutions.set("title", title, ids)
+    return ids
+
+
+def _build_case_summaries(
+    docket_ids: List[int],
+    store: DocketStore,
+    workers: Optional[int] = None,
+) -> List[CLCaseSummary]:
+    store.prefetch(docket_ids)
+    docket_ids = store.changed(docket_ids)
+    summaries = _fan_out(lambda did: build_case_summary_from_docket_id(did, store=store), docket_ids, workers)
+    return [s for s in summaries if s]
+
+
+def build_case_summaries_from_docket_numbers(
+    docket_numbers: List[str],
+    store: Optional[DocketStore] = None,
+    workers: Optional[int] = None,
+) -> List[CLCaseSummary]:
+    store = store or DocketStore()
+    docket_ids = []
+    for ids in _fan_out(lambda dn: _docket_ids_for_number(dn, store), docket_numbers, workers):
+        docket_ids.extend(ids)
+    resolutions.save()
+    return _build_case_summaries(docket_ids, store, workers)
+
+
+def build_case_summaries_from_case_titles(
+    case_titles: List[str],
+    store: Optional[DocketStore] = None,
+    workers: Optional[int] = None,
+) -> List[CLCaseSummary]:
+    store = store or DocketStore()
+    docket_ids = []
+    for ids in _fan_out(_docket_ids_for_title, case_titles, workers):
+        docket_ids.extend(ids)
+    resolutions.save()
+    return _build_case_summaries(docket_ids, store, workers)
+
+
+def build_case_summaries_from_hits(
+    hits: List[dict],
+    store: Optional[DocketStore] = None,
+    workers: Optional[int] = None,
+) -> List[CLCaseSummary]:
+    store = store or DocketStore()
     debug_log(f"build_case_summaries_from_hits input hits={len(hits)}")    
+    docket_ids = []
     for hit in hits:
         did = _pick_docket_id(hit)
         if did:
             debug_log(f"found docket_id={did}")            
-            s = build_case_summary_from_docket_id(did)
-            if s:
-                out.append(s)
-    return out
+            docket_ids.append(did)
+    return _build_case_summaries(docket_ids, store, workers)
 
 
-def build_documents_from_docket_ids(docket_ids: List[int], days: int = 3) -> List[CLDocument]:
+def build_documents_from_docket_ids(
+    docket_ids: List[int],
+    days: int = 3,
+    store: Optional[DocketStore] = None,
+) -> List[CLDocument]:
     hits = [{"docket_id": did} for did in docket_ids]
-    return build_complaint_documents_from_hits(hits)
+    return build_complaint_documents_from_hits(hits, store=store)
 
 def build_complaint_documents_from_hits(
     hits: List[dict],
-    days: int = 3
+    days: int = 3,
+    store: Optional[DocketStore] = None,
+    workers: Optional[int] = None,
 ) -> List[CLDocument]:
 
     debug_log(f"[DEBUG] build_complaint_documents_from_hits hits={len(hits)} days={days}")
-    out = []
+    store = store or DocketStore()
 
     # 🔥 FIX: 날짜 기준 비교 (시간 제거)
     today = datetime.now(timezone.utc).date()
     cutoff = today - timedelta(days=days)
 
+    docket_ids = []
     for hit in hits:
         did = _pick_docket_id(hit)
         if not did:
             debug_log("[DEBUG] no docket_id in hit")         
             continue
+        docket_ids.append(did)
 
-        docket = _get(DOCKET_URL.format(id=did)) or {}
-        case_name = _safe_str(docket.get("case_name")) or "미확인"
-        docket_number = _safe_str(docket.get("docket_number")) or "미확인"
-        court = _safe_str(docket.get("court")) or "미확인"
+    store.prefetch(docket_ids)
+    docket_ids = store.changed(docket_ids)
+    out = []
+    for docs in _fan_out(lambda did: _complaint_documents_for_docket(did, store, cutoff), docket_ids, workers):
+        out.extend(docs)
+    return out
 
-        debug_log(f"--- Processing docket {did} ---")
-        debug_log(f"case_name={case_name}")
-        debug_log(f"docket_number={docket_number}")
-        debug_log(f"court={court}")     
-        
-        # --------------------------------------------------
-        # 안정화: docket 전체 기준 RECAP pagination 조회
-        # --------------------------------------------------
-        docs = []
-        url = RECAP_DOCS_URL
-        params = {"docket": did, "page_size": 100}
-        debug_log(f"fetching RECAP docs for docket={did}")        
 
-        while url:
-            data = _get(url, params=params) if params else _get(url)
-            params = None
-            if not data:
-                debug_log("RECAP pagination returned no data")                
-                break
-            docs.extend(data.get("results", []))
-            url = data.get("next")
-    
-        debug_log(f"total RECAP docs fetched={len(docs)}")
-        # 🔥 FIX: initialize fallback variables (avoid NameError / leakage)
-        html_pdf_url = ""    
-
-        # =====================================================
-        # ✅ BEST PRACTICE: RECAP → HTML fallback
-        # =====================================================
-        if not docs:
-            debug_log("RECAP empty → HTML fallback activated")
-            html_pdf_url = _extract_first_pdf_from_docket_html(did)
-
-            if html_pdf_url:
-                debug_log(f"HTML fallback PDF URL: {html_pdf_url}")
-                # Complaint 구조는 보통 Caption (당사자), Jurisdiction, Background, Factual Allegations, Causes of Action 등으로 구성 되며, 
-                # AI 학습 관련 주장도 보통 초반 5페이지 이내에 등장합니다.
-                # 4500자 의미: 약 2~3페이지 분량 (약 700~900 단어), 'PDF 전체 대신 앞부분 4500자만 분석을하겠다.'는 최적화를 위한 제한 값입니다.
-                snippet = extract_pdf_text(html_pdf_url, max_chars=4500)
-
-                if not snippet:
-                    debug_log(f"[ERROR] PDF parsing FAILED (HTML fallback)")
-                    debug_log(f"[ERROR] URL: {html_pdf_url}")
-                else:
-                    debug_log(f"PDF parsing SUCCESS length={len(snippet)}")
-
-
-                p_ex, d_ex = extract_parties_from_caption(snippet) if snippet else ("미확인", "미확인")
-                debug_log(f"HTML fallback snippet length={len(snippet) if snippet else 0}")                
-                causes = detect_causes(snippet) if snippet else []
-                ai_snip = extract_ai_training_snippet(snippet) if snippet else ""
-
-                out.append(CLDocument(
-                    docket_id=did,
-                    docket_number=docket_number,
-                    case_name=case_name,
-                    court=court,
-                    date_filed=_safe_str(docket.get("date_filed"))[:10],
-                    doc_type="Complaint (HTML Fallback)",
-                    doc_number="1",
-                    description="Extracted from docket HTML",
-                    document_url=html_pdf_url,
-                    pdf_url=html_pdf_url,
-                    pdf_text_snippet=snippet,
-                    extracted_plaintiff=p_ex,
-                    extracted_defendant=d_ex,
-                    extracted_causes=", ".join(causes) if causes else "미확인",
-                    extracted_ai_snippet=ai_snip,
-                ))
-            # RECAP 완전 실패한 경우에만 fallback 실행       
-        
-        for d in docs:
-            desc = _safe_str(d.get("description")).lower()
-            if not any(k in desc for k in COMPLAINT_KEYWORDS):
-                debug_log(f"skipped non-complaint doc: {desc[:60]}")                
-                continue
+def _complaint_documents_for_docket(did: int, store: DocketStore, cutoff) -> List[CLDocument]:
+    out = []
+    docket = store.docket(did)
+    if not docket:
+        store.processed(did, ok=False)
+        docket = {}
+    case_name = _safe_str(docket.get("case_name")) or "미확인"
+    docket_number = _safe_str(docket.get("docket_number")) or "미확인"
+    court = _safe_str(docket.get("court")) or "미확인"
 
-            date_filed = _safe_str(d.get("date_filed"))[:10]
-            if date_filed:
-                try:
-                    dt = datetime.fromisoformat(date_filed).date()
-                    if dt < cutoff:
-                        debug_log(f"complaint filtered by date {dt} < {cutoff}")                        
-                        continue
-                except Exception as e:
-                    debug_log(f"complaint date parse error: {e}")
-                    pass
-            debug_log(f"complaint accepted docket={did} date={date_filed}")
-            debug_log(f"description={d.get('description')}")
-            debug_log(f"document_number={d.get('document_number')}")            
-            pdf_url = _abs_url(d.get("filepath_local") or "")
-            debug_log(f"RECAP PDF URL: {pdf_url}")
-            snippet = ""
-
-            if pdf_url and _validate_pdf_url(pdf_url):
-                snippet = extract_pdf_text(pdf_url, max_chars=3000)
-            else:
-                debug_log("[ERROR] PDF validation failed — skipping extraction")
-                debug_log(f"[ERROR] URL: {pdf_url}")
+    debug_log(f"--- Processing docket {did} ---")
+    debug_log(f"case_name={case_name}")
+    debug_log(f"docket_number={docket_number}")
+    debug_log(f"court={court}")     
+
+    # --------------------------------------------------
+    # 도켓당 한 번 받은 RECAP 목록(document_number 순, projection)에서 기간 내 Complaint만 남긴다 (DocketStore 공유)
+    # --------------------------------------------------
+    docs = store.complaint_docs(did, filed_after=cutoff)
+
+    debug_log(f"total RECAP complaint docs fetched={len(docs)}")
+    # 🔥 FIX: initialize fallback variables (avoid NameError / leakage)
+    html_pdf_url = ""    
 
-            if pdf_url and not snippet:
-                debug_log("[ERROR] PDF parsing FAILED (RECAP)")
-                debug_log(f"[ERROR] URL: {pdf_url}")
-            elif snippet:
+    # =====================================================
+    # ✅ BEST PRACTICE: RECAP → HTML fallback
+    # =====================================================
+    if not docs and not store.has_recap_docs(did):
+        debug_log("RECAP empty → HTML fallback activated")
+        html_pdf_url = _extract_first_pdf_from_docket_html(did, store=store)
+
+        if html_pdf_url:
+            debug_log(f"HTML fallback PDF URL: {html_pdf_url}")
+            # Complaint 구조는 보통 Caption (당사자), Jurisdiction, Background, Factual Allegations, Causes of Action 등으로 구성 되며, 
+            # AI 학습 관련 주장도 보통 초반 5페이지 이내에 등장합니다.
+            # 4500자 의미: 약 2~3페이지 분량 (약 700~900 단어), 'PDF 전체 대신 앞부분 4500자만 분석을하겠다.'는 최적화를 위한 제한 값입니다.
+            # 캡션/청구 원인/AI 스니펫이 모두 나오면 남은 페이지는 파싱하지 않는다
+            facts = extract_complaint_facts(html_pdf_url)
+            snippet = facts.snippet(4500)
+
+            if not snippet and no_text_layer(html_pdf_url):
+                debug_log(f"scanned PDF without text layer (HTML fallback): {html_pdf_url}")
+            elif not snippet:
+                store.processed(did, ok=False)
+                debug_log(f"[ERROR] PDF parsing FAILED (HTML fallback)")
+                debug_log(f"[ERROR] URL: {html_pdf_url}")
+            else:
                 debug_log(f"PDF parsing SUCCESS length={len(snippet)}")
 
-            p_ex, d_ex = extract_parties_from_caption(snippet) if snippet else ("미확인", "미확인")
-            causes = detect_causes(snippet) if snippet else []
-            ai_snip = extract_ai_training_snippet(snippet) if snippet else ""
+
+            p_ex, d_ex = facts.parties
+            debug_log(f"HTML fallback snippet length={len(snippet) if snippet else 0}")                
+            causes = facts.causes
+            ai_snip = facts.ai_snippet
 
             out.append(CLDocument(
                 docket_id=did,
                 docket_number=docket_number,
                 case_name=case_name,
                 court=court,
-                date_filed=date_filed,
-                doc_type="Complaint",
-                doc_number=_safe_str(d.get("document_number")),
-                description=_safe_str(d.get("description")),
-                document_url=_abs_url(d.get("absolute_url") or ""),
-                pdf_url=pdf_url,
+                date_filed=_safe_str(docket.get("date_filed"))[:10],
+                doc_type="Complaint (HTML Fallback)",
+                doc_number="1",
+                description="Extracted from docket HTML",
+                document_url=html_pdf_url,
+                pdf_url=html_pdf_url,
                 pdf_text_snippet=snippet,
                 extracted_plaintiff=p_ex,
                 extracted_defendant=d_ex,
                 extracted_causes=", ".join(causes) if causes else "미확인",
                 extracted_ai_snippet=ai_snip,
             ))
+        # RECAP 완전 실패한 경우에만 fallback 실행       
+
+    # 1차: 대상 고소장을 고르고 PDF 추출을 먼저 모두 제출한다 (pdf_stage에서 다운로드/파싱이 겹쳐 진행)
+    accepted = []
+    for d in docs:
+        desc = _safe_str(d.get("description")).lower()
+        if not _is_complaint_doc(d):
+            debug_log(f"skipped non-complaint doc: {desc[:60]}")                
+            continue
 
+        date_filed = _safe_str(d.get("date_filed"))[:10]
+        if date_filed:
+            try:
+                dt = datetime.fromisoformat(date_filed).date()
+                if dt < cutoff:
+                    debug_log(f"complaint filtered by date {dt} < {cutoff}")                        
+                    continue
+            except Exception as e:
+                debug_log(f"complaint date parse error: {e}")
+                pass
+        debug_log(f"complaint accepted docket={did} date={date_filed}")
+        debug_log(f"description={d.get('description')}")
+        debug_log(f"document_number={d.get('document_number')}")            
+        pdf_url = _abs_url(d.get("filepath_local") or "")
+        debug_log(f"RECAP PDF URL: {pdf_url}")
+        # 단일 streaming GET: PDF가 아니면 첫 청크에서 중단 (별도 HEAD 검증 없음)
+        pending = submit_complaint_facts(pdf_url) if pdf_url else None
+        accepted.append((d, date_filed, pdf_url, pending))
+
+    # 2차: 제출 순서대로 결과를 모아 문서를 만든다
+    for d, date_filed, pdf_url, pending in accepted:
+        facts = pending.result() if pending else ComplaintFacts()
+        snippet = facts.snippet(3000)
+
+        if pdf_url and not snippet and no_text_layer(pdf_url):
+            debug_log(f"scanned PDF without text layer (RECAP): {pdf_url}")
+        elif pdf_url and not snippet:
+            store.processed(did, ok=False)
+            debug_log("[ERROR] PDF parsing FAILED (RECAP)")
+            debug_log(f"[ERROR] URL: {pdf_url}")
+        elif snippet:
+            debug_log(f"PDF parsing SUCCESS length={len(snippet)}")
+
+        p_ex, d_ex = facts.parties
+        causes = facts.causes
+        ai_snip = facts.ai_snippet
+
+        out.append(CLDocument(
+            docket_id=did,
+            docket_number=docket_number,
+            case_name=case_name,
+            court=court,
+            date_filed=date_filed,
+            doc_type="Complaint",
+            doc_number=_safe_str(d.get("document_number")),
+            description=_safe_str(d.get("description")),
+            document_url=_abs_url(d.get("absolute_url") or ""),
+            pdf_url=pdf_url,
+            pdf_text_snippet=snippet,
+            extracted_plaintiff=p_ex,
+            extracted_defendant=d_ex,
+            extracted_causes=", ".join(causes) if causes else "미확인",
+            extracted_ai_snippet=ai_snip,
+        ))
+
+    store.processed(did)
     return out
 
 
-def build_case_summary_from_docket_id(docket_id: int) -> Optional[CLCaseSummary]:
-    docket = _get(DOCKET_URL.format(id=docket_id))
+def build_case_summary_from_docket_id(
+    docket_id: int,
+    store: Optional[DocketStore] = None,
+) -> Optional[CLCaseSummary]:
+    store = store or DocketStore()
+    docket = store.docket(docket_id)
     if not docket:
+        store.processed(docket_id, ok=False)
         return None
     debug_log(f"=== build_case_summary_from_docket_id {docket_id} ===")
     debug_log(f"case_name={docket.get('case_name')}")
@@ -635,27 +1242,8 @@ def build_case_summary_from_docket_id(docket_id: int) -> Optional[CLCaseSummary]
     # 그리고 결과를 RECAP 테이블 컬럼에 직접 매핑
     # ======================================================
 
-    # 1️⃣ RECAP API 먼저 시도
-    recap_docs = []
-    url = RECAP_DOCS_URL
-    params = {"docket": docket_id, "page_size": 100}
-
-    while url:
-        data = _get(url, params=params) if params else _get(url)
-        params = None
-        if not data:
-            break
-        recap_docs.extend(data.get("results", []))
-        url = data.get("next")
-
-    complaint_doc = None
-
-    for d in recap_docs:
-        debug_log(f"checking RECAP doc: {d.get('description')}")        
-        desc = _safe_str(d.get("description")).lower()
-        if any(k in desc for k in COMPLAINT_KEYWORDS):
-            complaint_doc = d
-            break
+    # 1️⃣ RECAP API 먼저 시도 (DocketStore 공유, 찾는 즉시 페이지 순회 중단)
+    complaint_doc = store.first_complaint(docket_id)
 
     # 2️⃣ RECAP 문서가 있으면 사용
     if complaint_doc:
@@ -675,7 +1263,7 @@ def build_case_summary_from_docket_id(docket_id: int) -> Optional[CLCaseSummary]
     if not complaint_link:
         debug_log("RECAP complaint not found → HTML fallback attempt")
         
-        html_pdf_url = _extract_first_pdf_from_docket_html(docket_id)
+        html_pdf_url = _extract_first_pdf_from_docket_html(docket_id, store=store)
         if html_pdf_url:
             debug_log(f"HTML fallback PDF found: {html_pdf_url}")            
             complaint_link = html_pdf_url
@@ -692,11 +1280,9 @@ def build_case_summary_from_docket_id(docket_id: int) -> Optional[CLCaseSummary]
         debug_log("Starting PDF extraction...")        
         snippet = ""
 
-        if _validate_pdf_url(complaint_link):
-            snippet = extract_pdf_text(complaint_link, max_chars=4000)
-        else:
-            debug_log("[ERROR] Complaint PDF validation failed")
-            debug_log(f"[ERROR] complaint_link={complaint_link}")
+        # 단일 streaming GET: PDF가 아니면 첫 청크에서 중단 (별도 HEAD 검증 없음)
+        facts = extract_complaint_facts(complaint_link)
+        snippet = facts.snippet(4000)
 
         debug_log(f"PDF snippet length={len(snippet) if snippet else 0}")
 
@@ -704,7 +1290,10 @@ def build_case_summary_from_docket_id(docket_id: int) -> Optional[CLCaseSummary]
             debug_log("===== PDF TEXT PREVIEW BEGIN =====")
             debug_log(snippet[:1000])
             debug_log("===== PDF TEXT PREVIEW END =====")
+        elif no_text_layer(complaint_link):
+            debug_log(f"scanned PDF without text layer — text extraction skipped: {complaint_link}")
         else:
+            store.processed(docket_id, ok=False)
             debug_log("PDF text extraction returned EMPTY STRING")
             debug_log("[ERROR] PDF text extraction FAILED")
             debug_log(f"[ERROR] complaint_link={complaint_link}")
@@ -715,8 +1304,8 @@ def build_case_summary_from_docket_id(docket_id: int) -> Optional[CLCaseSummary]
 
         debug_log(f"PDF snippet length={len(snippet) if snippet else 0}")        
         if snippet:
-            extracted_ai_snippet = extract_ai_training_snippet(snippet) or ""
-            causes_list = detect_causes(snippet)
+            extracted_ai_snippet = facts.ai_snippet
+            causes_list = facts.causes
             debug_log(f"extracted_ai_snippet length={len(extracted_ai_snippet)}")
             debug_log(f"detected causes={causes_list}")            
             extracted_causes = ", ".join(causes_list) if causes_list else "미확인"
@@ -725,6 +1314,7 @@ def build_case_summary_from_docket_id(docket_id: int) -> Optional[CLCaseSummary]
     else:
         debug_log("No complaint_link available — skipping PDF extraction")
 
+    store.processed(docket_id)
     return CLCaseSummary(
         docket_id=docket_id,
         case_name=case_name,
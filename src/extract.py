@@ -1,12 +1,14 @@
 from __future__ import annotations
 import re
-import requests
 import yaml
 from bs4 import BeautifulSoup
-from dataclasses import dataclass
-from typing import List, Dict, Any
+from dataclasses import dataclass, replace
+from typing import List, Dict, Any, Tuple
 from datetime import datetime, timezone, timedelta
-from .utils import debug_log
+from . import transport
+from .caption_parse import case_title_pairs
+from .checkpoint import Checkpoints
+from .utils import debug_log, compact_fields
 
 CASE_NO_PATTERNS = [
     re.compile(r"\b\d:\d{2}-cv-\d{5}\b", re.IGNORECASE),
@@ -14,7 +16,7 @@ CASE_NO_PATTERNS = [
     re.compile(r"\b\d{4}-cv-\d{4,6}\b", re.IGNORECASE),
 ]
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Lawsuit:
     update_or_filed_date: str
     # case_title: 가능한 경우 "A v. B" 형태의 사건명(소송제목)
@@ -23,7 +25,11 @@ class Lawsuit:
     article_title: str
     case_number: str
     reason: str
-    article_urls: List[str]
+    article_urls: Tuple[str, ...]
+
+    def __post_init__(self):
+        object.__setattr__(self, "article_urls", tuple(self.article_urls))
+        compact_fields(self, interned=("update_or_filed_date",), shared=("reason",))
 
 
 def fetch_page_text(url: str, timeout: int = 15) -> tuple[str, str]:
@@ -34,7 +40,7 @@ def fetch_page_text(url: str, timeout: int = 15) -> tuple[str, str]:
     - 네트워크/차단 등의 이유로 실패할 수 있으므로 예외는 삼키고 빈 값 반환.
     """
     try:
-        r = requests.get(url, timeout=timeout, headers={"User-Agent": "Mozilla/5.0"}, allow_redirects=True)
+        r = transport.get(url, timeout=timeout, headers={"User-Agent": "Mozilla/5.0"}, allow_redirects=True)
         r.raise_for_status()
         final_url = (r.url or url).strip()
         soup = BeautifulSoup(r.text, "lxml")
@@ -84,14 +90,11 @@ def extract_case_title_from_text(text: str) -> str:
     if not t:
         return "미확인"
 
-    # 흔한 변형: v, v., vs, vs.
-    pat = re.compile(
-        r"([A-Z][A-Za-z0-9 ,.&'\-]{2,}?)\s+v\.?s?\.?\s+([A-Z][A-Za-z0-9 ,.&'\-]{2,}?)\b"
-    )
+    # 흔한 변형: v, v., vs, vs. (토큰 기반 파서라 대문자/쉼표가 길게 이어진 OCR 텍스트에서도 선형 시간)
     cands = []
-    for m in pat.finditer(t):
-        a = m.group(1).strip(" ,.;:-")
-        b = m.group(2).strip(" ,.;:-")
+    for left, right in case_title_pairs(t):
+        a = left.strip(" ,.;:-")
+        b = right.strip(" ,.;:-")
         # 너무 긴 문자열/광고 문구 등 제외
         if len(a) < 3 or len(b) < 3:
             continue
@@ -162,16 +165,43 @@ def reason_heuristic(hay: str) -> str:
 
     return "AI 모델 학습 및 서비스 개발 과정에서의 무단 데이터 수집 및 저작권 침해 관련 분쟁."
 
-def build_lawsuits_from_news(news_items, known_cases, lookback_days: int = 3) -> List[Lawsuit]:
+def _rss_mark(since: datetime | None, done: List[datetime], failed: List[datetime]) -> datetime | None:
+    """다음 실행의 RSS 체크포인트: 처리에 실패한 가장 이른 기사보다 앞선, 처리 완료 기사의 최대 발행 시각."""
+    if failed:
+        first_failed = min(failed)
+        done = [t for t in done if t < first_failed]
+    return max(done + ([since] if since else []), default=None)
+
+def build_lawsuits_from_news(
+    news_items,
+    known_cases,
+    lookback_days: int = 3,
+    since: datetime | None = None,
+    checkpoints: Checkpoints | None = None,
+) -> List[Lawsuit]:
+    """뉴스 기사에서 소송 후보를 만든다.
+
+    checkpoints가 있으면 본문까지 처리한 기사의 발행 시각으로만 rss 체크포인트를 올린다
+    (본문을 못 가져온 기사는 다음 실행에서 다시 시도).
+    """
     results: List[Lawsuit] = []
-    debug_log(f"build_lawsuits_from_news items={len(news_items)} lookback={lookback_days}")
+    debug_log(f"build_lawsuits_from_news items={len(news_items)} lookback={lookback_days} since={since}")
     cutoff = datetime.now(timezone.utc) - timedelta(days=lookback_days)
+    done: List[datetime] = []
+    failed: List[datetime] = []
     for item in news_items:
         if item.published_at and item.published_at < cutoff:
             continue
+        # delta 모드: 지난 실행에서 이미 처리한 발행 시각까지는 기사 본문을 다시 가져오지 않는다
+        if since and item.published_at and item.published_at <= since:
+            continue
         text, final_url = fetch_page_text(item.url)
         if not text:
+            if item.published_at:
+                failed.append(item.published_at)
             continue
+        if item.published_at:
+            done.append(item.published_at)
 
         hay = (item.title + " " + text)
         lower = hay.lower()
@@ -198,10 +228,15 @@ def build_lawsuits_from_news(news_items, known_cases, lookback_days: int = 3) ->
                 article_title=article_title,
                 case_number=case_number,
                 reason=enrich.get("reason", reason_heuristic(hay)),
-                article_urls=sorted(list({final_url, item.url})),
+                article_urls=tuple(sorted({final_url, item.url})),
             )
         )
 
+    if checkpoints:
+        mark = _rss_mark(since, done, failed)
+        if mark and mark != since:
+            checkpoints.set("rss", "published", mark.isoformat())
+
     # 병합
     merged: Dict[tuple[str, str, str], Lawsuit] = {}
     for r in results:
@@ -210,8 +245,11 @@ def build_lawsuits_from_news(news_items, known_cases, lookback_days: int = 3) ->
         if key not in merged:
             merged[key] = r
         else:
-            merged[key].article_urls = sorted(list(set(merged[key].article_urls + r.article_urls)))
-            if r.update_or_filed_date > merged[key].update_or_filed_date:
-                merged[key].update_or_filed_date = r.update_or_filed_date
+            m = merged[key]
+            merged[key] = replace(
+                m,
+                article_urls=tuple(sorted(set(m.article_urls + r.article_urls))),
+                update_or_filed_date=max(m.update_or_filed_date, r.update_or_filed_date),
+            )
 
     return list(merged.values())
\ No newline at end of file
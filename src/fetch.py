@@ -4,18 +4,22 @@ from dataclasses import dataclass
 from typing import List
 from datetime import datetime, timezone
 from dateutil import parser as dtparser
+from . import transport
 from .queries import NEWS_QUERIES
-from .utils import debug_log
+from .utils import debug_log, compact_fields
 
 GOOGLE_NEWS_RSS = "https://news.google.com/rss/search?q={q}&hl=en-US&gl=US&ceid=US:en"
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class NewsItem:
     title: str
     url: str
     published_at: datetime | None
     source: str
 
+    def __post_init__(self):
+        compact_fields(self, interned=("source",))
+
 def _parse_dt(s: str | None) -> datetime | None:
     if not s:
         return None
@@ -34,7 +38,14 @@ def fetch_news() -> List[NewsItem]:
     for q in NEWS_QUERIES:
         debug_log(f"Fetching news for query: {q}")
         feed_url = GOOGLE_NEWS_RSS.format(q=q.replace(" ", "%20"))
-        feed = feedparser.parse(feed_url)
+        try:
+            # Google News RSS에는 예전과 같이 feedparser 기본 User-Agent를 보낸다
+            r = transport.get(feed_url, timeout=20, headers={"User-Agent": feedparser.USER_AGENT})
+            r.raise_for_status()
+            feed = feedparser.parse(r.content)
+        except Exception as e:
+            debug_log(f"RSS fetch failed: {e}")
+            continue
         debug_log(f"Found {len(feed.entries)} entries for query: {q}")
 
         for e in feed.entries:
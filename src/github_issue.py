@@ -1,5 +1,5 @@
 from __future__ import annotations
-import requests
+from . import transport
 from typing import Dict, List
 from .dedup import generate_consolidated_report
 
@@ -12,7 +12,7 @@ def _headers(token: str) -> Dict[str, str]:
 
 def find_or_create_issue(owner: str, repo: str, token: str, title: str, label: str) -> int:
     url = f"https://api.github.com/repos/{owner}/{repo}/issues"
-    r = requests.get(url, headers=_headers(token), params={"state": "open", "labels": label, "per_page": 50}, timeout=20)
+    r = transport.get(url, headers=_headers(token), params={"state": "open", "labels": label, "per_page": 50}, timeout=20)
     r.raise_for_status()
     issues = r.json()
     for it in issues:
@@ -57,24 +57,24 @@ def find_or_create_issue(owner: str, repo: str, token: str, title: str, label: s
         ),
         "labels": [label]
     }    
-    r2 = requests.post(url, headers=_headers(token), json=payload, timeout=20)
+    r2 = transport.post(url, headers=_headers(token), json=payload, timeout=20)
     r2.raise_for_status()
     return int(r2.json()["number"])
 
 def create_comment(owner: str, repo: str, token: str, issue_number: int, body: str) -> None:
     url = f"https://api.github.com/repos/{owner}/{repo}/issues/{issue_number}/comments"
-    r = requests.post(url, headers=_headers(token), json={"body": body}, timeout=20)
+    r = transport.post(url, headers=_headers(token), json={"body": body}, timeout=20)
     r.raise_for_status()
 
 def list_open_issues_by_label(owner: str, repo: str, token: str, label: str, per_page: int = 100) -> list[dict]:
     url = f"https://api.github.com/repos/{owner}/{repo}/issues"
-    r = requests.get(url, headers=_headers(token), params={"state": "open", "labels": label, "per_page": per_page}, timeout=20)
+    r = transport.get(url, headers=_headers(token), params={"state": "open", "labels": label, "per_page": per_page}, timeout=20)
     r.raise_for_status()
     return r.json() or []
 
 def close_issue(owner: str, repo: str, token: str, issue_number: int) -> None:
     url = f"https://api.github.com/repos/{owner}/{repo}/issues/{issue_number}"
-    r = requests.patch(url, headers=_headers(token), json={"state": "closed"}, timeout=20)
+    r = transport.patch(url, headers=_headers(token), json={"state": "closed"}, timeout=20)
     r.raise_for_status()
 
 def close_other_daily_issues(owner: str, repo: str, token: str, label: str, base_title: str, today_title: str, new_issue_number: int, new_issue_url: str) -> list[int]:
@@ -118,7 +118,7 @@ def close_other_daily_issues(owner: str, repo: str, token: str, label: str, base
 def comment_and_close_issue(owner: str, repo: str, token: str, issue_number: int, body: str) -> None:
     # 먼저 마무리 코멘트 작성
     url_c = f"https://api.github.com/repos/{owner}/{repo}/issues/{issue_number}/comments"
-    rc = requests.post(url_c, headers=_headers(token), json={"body": body}, timeout=20)
+    rc = transport.post(url_c, headers=_headers(token), json={"body": body}, timeout=20)
     rc.raise_for_status()
     # 그 다음 이슈 Close
     close_issue(owner, repo, token, issue_number)
@@ -131,7 +131,7 @@ def comment_and_close_issue(owner: str, repo: str, token: str, issue_number: int
 # =========================================================
 def list_comments(owner: str, repo: str, token: str, issue_number: int) -> list[dict]:
     url = f"https://api.github.com/repos/{owner}/{repo}/issues/{issue_number}/comments"
-    r = requests.get(url, headers=_headers(token), timeout=20)
+    r = transport.get(url, headers=_headers(token), timeout=20)
     r.raise_for_status()
     return r.json() or []
 
@@ -0,0 +1,165 @@
+from __future__ import annotations
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import Optional
+from urllib.parse import urlparse
+
+from .utils import cache_dir, load_json, save_json, debug_log
+
+# 엔드포인트 종류별 TTL(초)
+# - courts: 거의 바뀌지 않음 → 일 단위
+# - dockets / recap-documents: 하루 몇 번 바뀜 → 시간 단위
+# - search: 새 문서가 계속 들어옴 → 분 단위
+ENDPOINT_TTLS = {
+    "courts": 7 * 24 * 3600,
+    "dockets": 6 * 3600,
+    "recap-documents": 6 * 3600,
+    "search": 15 * 60,
+}
+
+# TTL이 지난 뒤에도 ETag/Last-Modified 재검증용으로 보관하는 기간
+RETAIN_SECONDS = 14 * 24 * 3600
+
+
+def endpoint_class(url: str) -> str:
+    """/api/rest/v4/<class>/... 에서 <class>를 반환한다."""
+    parts = [p for p in urlparse(url).path.split("/") if p]
+    if len(parts) >= 4 and parts[:3] == ["api", "rest", "v4"]:
+        return parts[3]
+    return ""
+
+
+def _key(url: str, params: Optional[dict]) -> str:
+    raw = url + "|" + json.dumps(params or {}, sort_keys=True, default=str)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """URL+params 키 기반 JSON 응답 디스크 캐시.
+
+    - TTL 이내 → 네트워크 없이 반환 (hit)
+    - TTL 경과 → If-None-Match / If-Modified-Since로 재검증, 304면 재사용 (revalidated)
+    - 그 외 → 전체 응답 수신 후 저장 (miss)
+    """
+
+    def __init__(self, enabled: Optional[bool] = None):
+        if enabled is None:
+            enabled = os.environ.get("HTTP_CACHE", "1") != "0"
+        self.enabled = enabled
+        self._dir: Optional[str] = None
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.revalidated = 0
+        self.misses = 0
+
+    def _path(self, key: str) -> str:
+        if self._dir is None:
+            self._dir = cache_dir("http")
+            self._prune()
+        return os.path.join(self._dir, key + ".json")
+
+    def _prune(self) -> None:
+        now = time.time()
+        for name in os.listdir(self._dir):
+            path = os.path.join(self._dir, name)
+            try:
+                if now - os.path.getmtime(path) > RETAIN_SECONDS:
+                    os.remove(path)
+            except OSError:
+                pass
+
+    def _count(self, field: str) -> None:
+        with self._lock:
+            setattr(self, field, getattr(self, field) + 1)
+
+    def lookup(self, url: str, params: Optional[dict] = None) -> Optional[dict]:
+        """저장된 항목을 반환한다. 항목의 'fresh' 값으로 TTL 이내 여부를 알려준다."""
+        if not self.enabled:
+            return None
+        entry = load_json(self._path(_key(url, params)))
+        if not entry:
+            return None
+        ttl = ENDPOINT_TTLS.get(endpoint_class(url), 0)
+        entry["fresh"] = time.time() - entry.get("stored_at", 0) < ttl
+        if entry["fresh"]:
+            self._count("hits")
+        return entry
+
+    @staticmethod
+    def validators(entry: dict) -> dict:
+        headers = {}
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def store(self, url: str, params: Optional[dict], body, response_headers) -> None:
+        self._count("misses")
+        if not self.enabled:
+            return
+        entry = {
+            "url": url,
+            "params": params,
+            "stored_at": time.time(),
+            "etag": response_headers.get("ETag", ""),
+            "last_modified": response_headers.get("Last-Modified", ""),
+            "body": body,
+        }
+        try:
+            save_json(self._path(_key(url, params)), entry)
+        except OSError as e:
+            debug_log(f"response cache write failed: {e}")
+
+    def seed(self, url: str, params: Optional[dict], body) -> None:
+        """다른 응답(목록/배치 조회)에 들어 있던 객체를 이 URL의 항목으로 저장한다 (통계에는 세지 않음).
+
+        기존 항목의 ETag/Last-Modified는 유지한다. 받은 본문이 그 validator 시점보다 새것이므로,
+        다음 재검증에서 304를 받으면 저장된 본문도 최신이다.
+        """
+        if not self.enabled:
+            return
+        path = self._path(_key(url, params))
+        old = load_json(path) or {}
+        entry = {
+            "url": url,
+            "params": params,
+            "stored_at": time.time(),
+            "etag": old.get("etag", ""),
+            "last_modified": old.get("last_modified", ""),
+            "body": body,
+        }
+        try:
+            save_json(path, entry)
+        except OSError as e:
+            debug_log(f"response cache write failed: {e}")
+
+    def refresh(self, url: str, params: Optional[dict], entry: dict, response_headers) -> None:
+        """304 응답을 받은 항목의 저장 시각(및 새 validator)을 갱신한다."""
+        self._count("revalidated")
+        entry.pop("fresh", None)
+        entry["stored_at"] = time.time()
+        entry["etag"] = response_headers.get("ETag") or entry.get("etag", "")
+        entry["last_modified"] = response_headers.get("Last-Modified") or entry.get("last_modified", "")
+        try:
+            save_json(self._path(_key(url, params)), entry)
+        except OSError as e:
+            debug_log(f"response cache write failed: {e}")
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"hits": self.hits, "revalidated": self.revalidated, "misses": self.misses}
+
+    def summary(self) -> str:
+        s = self.stats()
+        total = s["hits"] + s["revalidated"] + s["misses"]
+        return (
+            f"hits={s['hits']} revalidated(304)={s['revalidated']} "
+            f"misses={s['misses']} total={total}"
+        )
+
+
+response_cache = ResponseCache()
@@ -0,0 +1,171 @@
+from __future__ import annotations
+import io
+import mmap
+import os
+import re
+import tempfile
+from typing import Iterable, Optional, Set
+
+from . import transport
+from .utils import debug_log
+
+BLOCK_SIZE = 64 * 1024
+# 이 크기 이하 파일은 나눠 받을 이득이 없으므로 첫 블록 이후를 한 번에 받는다
+FULL_FETCH_BELOW = 512 * 1024
+# Range 요청이 이 횟수를 넘으면 (흩어진 읽기) 남은 부분을 한 번에 받는다
+MAX_RANGE_REQUESTS = 24
+# 이 크기까지는 메모리에, 넘으면 임시 파일(mmap)에 둔다
+SPOOL_MAX_BYTES = int(float(os.environ.get("PDF_SPOOL_MAX_MB", "8")) * 1024 * 1024)
+
+_CONTENT_RANGE_RE = re.compile(r"bytes\s+(\d+)-(\d+)/(\d+)")
+
+
+def parse_content_range(value: Optional[str]):
+    """'bytes 0-65535/1234567' → (0, 65535, 1234567). 형식이 다르면 None."""
+    m = _CONTENT_RANGE_RE.match(value or "")
+    if not m:
+        return None
+    return int(m.group(1)), int(m.group(2)), int(m.group(3))
+
+
+class HTTPRangeFile(io.RawIOBase):
+    """HTTP Range 요청으로 필요한 블록만 받아 오는 읽기 전용 seekable 파일 객체.
+
+    - 받은 블록은 파일 크기만큼의 버퍼에 제자리로 써 둔다. SPOOL_MAX_BYTES 이하면 bytearray,
+      넘으면 임시 파일의 mmap(희소 파일)이라 파일이 커도 프로세스 메모리는 늘지 않는다.
+    - 연속된 빈 블록은 한 요청으로 묶어 받고, 응답은 청크 단위로 버퍼에 바로 쓴다 (r.content 복사 없음).
+    - 서버가 Range를 무시하고 200을 주면 그 응답 본문(전체 파일)으로 채운다.
+    """
+
+    def __init__(self, url: str, size: int, timeout: float = 30, headers: Optional[dict] = None,
+                 block_size: int = BLOCK_SIZE):
+        super().__init__()
+        self.url = url
+        self.size = size
+        self.timeout = timeout
+        self.headers = dict(headers or {})
+        self.block_size = block_size
+        self._have: Set[int] = set()
+        self._pos = 0
+        self.requests = 0
+        self.bytes_fetched = 0
+        self._file = None
+        if size <= SPOOL_MAX_BYTES:
+            self._data = bytearray(size)
+        else:
+            self._file = tempfile.TemporaryFile()
+            self._file.truncate(size)
+            self._data = mmap.mmap(self._file.fileno(), size)
+
+    # --- io 인터페이스 ---
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self._pos
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_SET:
+            pos = offset
+        elif whence == io.SEEK_CUR:
+            pos = self._pos + offset
+        elif whence == io.SEEK_END:
+            pos = self.size + offset
+        else:
+            raise ValueError(f"invalid whence: {whence}")
+        if pos < 0:
+            raise OSError("negative seek position")
+        self._pos = pos
+        return pos
+
+    def read(self, n: int = -1) -> bytes:
+        if self._pos >= self.size:
+            return b""
+        end = self.size if n is None or n < 0 else min(self.size, self._pos + n)
+        data = self._read_span(self._pos, end)
+        self._pos = end
+        return data
+
+    def readinto(self, b) -> int:
+        data = self.read(len(b))
+        b[: len(data)] = data
+        return len(data)
+
+    def close(self) -> None:
+        if not self.closed:
+            if isinstance(self._data, mmap.mmap):
+                self._data.close()
+            if self._file is not None:
+                self._file.close()
+        super().close()
+
+    # --- 블록 버퍼 ---
+    @property
+    def spilled(self) -> bool:
+        return self._file is not None
+
+    def write_stream(self, start: int, chunks: Iterable[bytes]) -> int:
+        """start 위치부터 청크들을 버퍼에 이어 쓴다. 쓴 바이트 수를 반환한다."""
+        pos = start
+        for chunk in chunks:
+            if not chunk:
+                continue
+            chunk = chunk[: max(0, self.size - pos)]
+            self._data[pos: pos + len(chunk)] = chunk
+            pos += len(chunk)
+        first = (start + self.block_size - 1) // self.block_size
+        for idx in range(first, self._block_count()):
+            block_end = min(self.size, (idx + 1) * self.block_size)
+            if block_end > pos:
+                break
+            self._have.add(idx)
+        return pos - start
+
+    def fill(self) -> None:
+        """아직 받지 않은 나머지 전체를 한 요청으로 받는다."""
+        missing = [i for i in range(self._block_count()) if i not in self._have]
+        if missing:
+            self._fetch_blocks(missing[0], missing[-1])
+
+    def _block_count(self) -> int:
+        return (self.size + self.block_size - 1) // self.block_size
+
+    def _read_span(self, start: int, end: int) -> bytes:
+        first = start // self.block_size
+        last = (end - 1) // self.block_size
+        missing = [i for i in range(first, last + 1) if i not in self._have]
+        if missing:
+            if self.requests >= MAX_RANGE_REQUESTS:
+                debug_log(f"range requests exceeded {MAX_RANGE_REQUESTS} → fetching rest: {self.url}")
+                self.fill()
+            else:
+                self._fetch_blocks(missing[0], missing[-1])
+        return bytes(self._data[start:end])
+
+    def _fetch_blocks(self, first: int, last: int) -> None:
+        start = first * self.block_size
+        end = min(self.size, (last + 1) * self.block_size) - 1
+        headers = dict(self.headers)
+        headers["Range"] = f"bytes={start}-{end}"
+        r = transport.get(self.url, headers=headers, timeout=self.timeout, allow_redirects=True, stream=True)
+        try:
+            self.requests += 1
+            if r.status_code == 200:
+                # Range 미지원 → 전체 본문
+                self.bytes_fetched += self.write_stream(0, r.iter_content(self.block_size))
+                return
+            if r.status_code != 206:
+                raise OSError(f"range request failed status={r.status_code}")
+            cr = parse_content_range(r.headers.get("Content-Range"))
+            got_start = cr[0] if cr else start
+            if got_start % self.block_size:
+                raise OSError(f"unaligned range response: {r.headers.get('Content-Range')}")
+            self.bytes_fetched += self.write_stream(got_start, r.iter_content(self.block_size))
+        finally:
+            r.close()
+        for i in range(first, last + 1):
+            if i not in self._have:
+                raise OSError(f"short range response for block {i}")
@@ -0,0 +1,59 @@
+from __future__ import annotations
+from typing import Dict, Iterable, List, Set, Tuple
+
+# 여러 키워드를 한 번에 찾는 Aho-Corasick 오토마톤.
+# 키워드마다 `k in text`로 텍스트 전체를 다시 훑는 대신, 키워드 트라이에 실패 링크를 붙여
+# 완전한 상태 전이표를 한 번 만들어 두고 텍스트는 글자당 전이 한 번으로 끝까지 한 번만 읽는다.
+# 겹치거나 서로 포함된 키워드("train" / "training", "820" / "3820")도 모두 찾는다.
+
+
+class KeywordAutomaton:
+    """키워드 집합에서 만든 부분 문자열 검색기. 대소문자 변환 등 정규화는 호출자가 한다."""
+
+    def __init__(self, keywords: Iterable[str]):
+        goto: List[Dict[str, int]] = [{}]
+        out: List[Tuple[str, ...]] = [()]
+        for kw in keywords:
+            if not kw:
+                continue
+            state = 0
+            for ch in kw:
+                nxt = goto[state].get(ch)
+                if nxt is None:
+                    goto.append({})
+                    out.append(())
+                    nxt = len(goto) - 1
+                    goto[state][ch] = nxt
+                state = nxt
+            if kw not in out[state]:
+                out[state] = out[state] + (kw,)
+
+        # 너비 우선으로 실패 링크를 잇고, 실패 상태의 전이/출력을 물려받아 완전한 전이표를 만든다
+        # (검색 중에는 실패 링크를 따라가지 않는다 — 없는 글자는 루트로)
+        delta: List[Dict[str, int]] = [dict(goto[0])] + [{} for _ in goto[1:]]
+        fail = [0] * len(goto)
+        queue = list(goto[0].values())
+        for state in queue:
+            delta[state] = {**delta[fail[state]], **goto[state]}
+            for ch, nxt in goto[state].items():
+                fail[nxt] = delta[fail[state]].get(ch, 0)
+                out[nxt] = out[nxt] + tuple(k for k in out[fail[nxt]] if k not in out[nxt])
+                queue.append(nxt)
+
+        self._next = [d.get for d in delta]
+        self._out = out
+
+    def matches(self, text: str) -> Set[str]:
+        """text에 부분 문자열로 나오는 키워드 집합."""
+        step = self._next
+        out = self._out
+        state = 0
+        hits = set()
+        for ch in text:
+            state = step[state](ch, 0)
+            if out[state]:
+                hits.add(state)
+        found: Set[str] = set()
+        for state in hits:
+            found.update(out[state])
+        return found
@@ -0,0 +1,178 @@
+from __future__ import annotations
+import hashlib
+import os
+import threading
+import time
+from typing import Callable, List, Optional
+
+from .utils import cache_dir, load_json, save_json, debug_log
+
+# 추출 파라미터 버전: 페이지 텍스트 추출 방식이 바뀌면 올려서 기존 항목을 무효화한다
+PDF_TEXT_CACHE_VERSION = 1
+
+
+class PdfTextCache:
+    """추출한 PDF 페이지 텍스트의 디스크 캐시 (CACHE_DIR/pdf_text).
+
+    - objects/<key>.json: 키 → 페이지 텍스트 + 추출 파라미터(max_chars, max_pages).
+      키는 PDF 전체를 받았으면 본문 sha256(같은 내용이면 URL이 달라도 공유), Range로 일부만 받았으면
+      ETag(없으면 URL)+크기의 해시다 (pdf_text._cache_key)
+      (텍스트 레이어가 없는 스캔 PDF는 빈 페이지 목록 + no_text_layer 표시,
+      앞쪽 연속 페이지가 아닌 구역 페이지만 추출한 항목은 mode로 구분)
+    - index.json: PDF URL → {sha256, etag}. RECAP 고소장 파일은 올라간 뒤 바뀌지 않으므로
+      URL로 찾으면 다운로드도 pypdf도 거치지 않는다.
+    - 전체 크기가 PDF_TEXT_CACHE_MAX_MB를 넘으면 가장 오래 안 쓰인 항목부터 지운다.
+    """
+
+    def __init__(self, enabled: Optional[bool] = None, max_bytes: Optional[int] = None):
+        if enabled is None:
+            enabled = os.environ.get("PDF_TEXT_CACHE", "1") != "0"
+        if max_bytes is None:
+            max_bytes = int(float(os.environ.get("PDF_TEXT_CACHE_MAX_MB", "100")) * 1024 * 1024)
+        self.enabled = enabled
+        self.max_bytes = max_bytes
+        self._dir: Optional[str] = None
+        self._index: Optional[dict] = None
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.content_hits = 0
+        self.misses = 0
+
+    def _objects_dir(self) -> str:
+        if self._dir is None:
+            self._dir = cache_dir("pdf_text")
+            os.makedirs(os.path.join(self._dir, "objects"), exist_ok=True)
+        return os.path.join(self._dir, "objects")
+
+    def _index_path(self) -> str:
+        self._objects_dir()
+        return os.path.join(self._dir, "index.json")
+
+    def _object_path(self, sha: str) -> str:
+        return os.path.join(self._objects_dir(), sha + ".json")
+
+    def _load_index(self) -> dict:
+        if self._index is None:
+            index = load_json(self._index_path()) or {}
+            if index.get("version") != PDF_TEXT_CACHE_VERSION:
+                index = {"version": PDF_TEXT_CACHE_VERSION, "urls": {}}
+            self._index = index
+        return self._index["urls"]
+
+    @staticmethod
+    def hash_key(data) -> str:
+        return hashlib.sha256(data).hexdigest()
+
+    def _read(self, sha: str) -> Optional[dict]:
+        path = self._object_path(sha)
+        entry = load_json(path)
+        if entry:
+            try:
+                os.utime(path)  # LRU: 마지막 사용 시각 갱신
+            except OSError:
+                pass
+        return entry
+
+    def lookup_url(self, url: str, usable: Callable[[dict], bool]) -> Optional[dict]:
+        """URL 색인으로 항목을 찾는다. usable(항목)이 참일 때만 돌려준다."""
+        if not self.enabled:
+            return None
+        with self._lock:
+            ref = self._load_index().get(url)
+        if not ref:
+            return None
+        entry = self._read(ref["sha"])
+        if entry and usable(entry):
+            self._count("hits")
+            return entry
+        return None
+
+    def peek_content(self, sha: str, usable: Callable[[dict], bool]) -> Optional[dict]:
+        """같은 내용의 PDF를 이미 추출했는지 읽기만 한다 (워커 프로세스에서 호출)."""
+        if not self.enabled:
+            return None
+        entry = load_json(self._object_path(sha))
+        if entry and usable(entry):
+            return entry
+        return None
+
+    def link_content(self, url: str, sha: str, etag: str) -> None:
+        """다른 URL로 이미 추출한 같은 PDF: pypdf 없이 재사용하고 URL 색인에 등록한다."""
+        self._count("content_hits")
+        if not self.enabled:
+            return
+        try:
+            os.utime(self._object_path(sha))
+            self._link(url, sha, etag)
+        except OSError as e:
+            debug_log(f"pdf text cache write failed: {e}")
+
+    def store(self, url: str, sha: str, etag: str, pages: List[str], complete: bool,
+              max_chars: int, max_pages: int, no_text_layer: bool = False, mode: str = "") -> None:
+        self._count("misses")
+        if not self.enabled:
+            return
+        entry = {
+            "url": url,
+            "stored_at": time.time(),
+            "max_chars": max_chars,
+            "max_pages": max_pages,
+            "complete": complete,
+            "pages": pages,
+        }
+        if no_text_layer:
+            entry["no_text_layer"] = True
+        if mode:
+            entry["mode"] = mode
+        try:
+            save_json(self._object_path(sha), entry)
+            self._link(url, sha, etag)
+            self._evict()
+        except OSError as e:
+            debug_log(f"pdf text cache write failed: {e}")
+
+    def _link(self, url: str, sha: str, etag: str) -> None:
+        with self._lock:
+            self._load_index()[url] = {"sha": sha, "etag": etag}
+            save_json(self._index_path(), self._index)
+
+    def _evict(self) -> None:
+        objects = self._objects_dir()
+        files = []
+        for name in os.listdir(objects):
+            path = os.path.join(objects, name)
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            files.append((st.st_mtime, st.st_size, name))
+        total = sum(size for _, size, _ in files)
+        if total <= self.max_bytes:
+            return
+        removed = set()
+        for _, size, name in sorted(files):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(os.path.join(objects, name))
+            except OSError:
+                continue
+            total -= size
+            removed.add(name[: -len(".json")])
+        with self._lock:
+            urls = self._load_index()
+            for url in [u for u, ref in urls.items() if ref["sha"] in removed]:
+                del urls[url]
+            save_json(self._index_path(), self._index)
+        debug_log(f"pdf text cache evicted {len(removed)} entries")
+
+    def _count(self, field: str) -> None:
+        with self._lock:
+            setattr(self, field, getattr(self, field) + 1)
+
+    def summary(self) -> str:
+        with self._lock:
+            return f"hits={self.hits} content_hits={self.content_hits} misses={self.misses}"
+
+
+pdf_text_cache = PdfTextCache()
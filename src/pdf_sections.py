@@ -0,0 +1,119 @@
+from __future__ import annotations
+import re
+from typing import Callable, Dict, Iterable, Optional
+
+from pypdf import PageObject, PdfReader
+
+from .utils import debug_log
+
+# 고소장에서 청구 원인 / AI 학습 주장이 나오는 구역의 제목
+# (outline 제목은 대소문자 무시, 본문 제목 스캔은 대문자 제목만 — 본문 문장 속 "cause of action" 제외)
+SECTION_TITLES = {
+    "intro": ("NATURE OF THE ACTION", "NATURE OF THE CASE", "INTRODUCTION", "PRELIMINARY STATEMENT"),
+    "facts": ("FACTUAL ALLEGATIONS", "FACTUAL BACKGROUND", "STATEMENT OF FACTS"),
+    "causes": ("CAUSES OF ACTION", "CAUSE OF ACTION", "CLAIMS FOR RELIEF", "CLAIM FOR RELIEF", "COUNT ONE"),
+}
+# 이 중 하나라도 찾아야 구역 페이지만 골라 읽을 가치가 있다 (intro만으로는 부족)
+KEY_SECTIONS = ("facts", "causes")
+
+_OUTLINE_RE = {
+    kind: re.compile("|".join(r"\s*".join(map(re.escape, t.split())) for t in titles), re.I)
+    for kind, titles in SECTION_TITLES.items()
+}
+# 공백을 모두 뺀 문자열끼리 비교한다 (TJ 배열은 단어 사이 공백 없이 위치 조정만 하는 경우가 많다)
+_HEADING_RE = {
+    kind: re.compile("|".join(re.escape(t.replace(" ", "")) for t in titles))
+    for kind, titles in SECTION_TITLES.items()
+}
+_LITERAL_RE = re.compile(rb"\((?:[^()\\]|\\.)*\)", re.S)
+_WS_RE = re.compile(r"\s+")
+
+
+def _flatten_outline(items) -> list:
+    out = []
+    for item in items:
+        if isinstance(item, list):
+            out.extend(_flatten_outline(item))
+        else:
+            out.append(item)
+    return out
+
+
+def outline_sections(reader: PdfReader, pages: Iterable[PageObject]) -> Dict[str, int]:
+    """책갈피 제목으로 구역 → 시작 페이지 번호 (pages 안에서 찾은 것만).
+
+    제목이 맞는 책갈피를 먼저 고른 뒤, 그 대상 페이지들의 번호가 모두 정해질 때까지만 pages를 따라간다.
+    """
+    targets: Dict[str, int] = {}
+    for item in _flatten_outline(reader.outline):
+        title = str(item.get("/Title", ""))
+        idnum = getattr(item.get("/Page"), "idnum", None)
+        if idnum is None:
+            continue
+        for kind, pat in _OUTLINE_RE.items():
+            if kind not in targets and pat.search(title):
+                targets[kind] = idnum
+    found: Dict[str, int] = {}
+    if not targets:
+        return found
+    for i, page in enumerate(pages):
+        ref = page.indirect_reference
+        if ref is None:
+            continue
+        for kind, idnum in targets.items():
+            if idnum == ref.idnum and kind not in found:
+                found[kind] = i
+        if len(found) == len(targets):
+            break
+    return found
+
+
+def literal_text(contents: Optional[bytes]) -> str:
+    """내용 스트림의 문자열 리터럴만 이어 붙인다 (글꼴 해석/배치 계산 없는 제목 검사용)."""
+    if not contents:
+        return ""
+    return b"".join(m.group(0)[1:-1] for m in _LITERAL_RE.finditer(contents)).decode("latin-1")
+
+
+def heading_sections(pages: Iterable[PageObject]) -> Dict[str, int]:
+    """페이지 내용 스트림의 문자열 리터럴에서 대문자 구역 제목을 찾는다.
+
+    pages는 한 페이지씩 소비하며, 사실 관계와 청구 원인 제목을 모두 찾으면 그 뒤 페이지는 가져오지 않는다.
+    글꼴이 16진 글리프 코드(CID)로만 쓰인 PDF는 리터럴이 없으므로 찾지 못한다
+    (호출자는 앞쪽 페이지 순차 추출로 돌아간다).
+    """
+    found: Dict[str, int] = {}
+    for i, page in enumerate(pages):
+        try:
+            contents = page.get_contents()
+            text = _WS_RE.sub("", literal_text(contents.get_data() if contents is not None else None))
+        except MemoryError:
+            raise
+        except Exception:
+            continue
+        for kind, pat in _HEADING_RE.items():
+            if kind not in found and pat.search(text):
+                found[kind] = i
+        if all(kind in found for kind in KEY_SECTIONS):
+            break
+    return found
+
+
+def locate_sections(reader: PdfReader, pages: Callable[[], Iterable[PageObject]]) -> Dict[str, int]:
+    """outline으로 구역을 찾고, 거기서 사실 관계 / 청구 원인 구역이 안 나오면 페이지 제목 스캔으로 찾는다.
+
+    pages()는 호출할 때마다 앞쪽 페이지를 처음부터 지연 순회하는 iterable을 돌려준다.
+    """
+    try:
+        found = outline_sections(reader, pages())
+        if any(kind in found for kind in KEY_SECTIONS):
+            debug_log(f"complaint sections from outline: {found}")
+            return found
+    except MemoryError:
+        raise
+    except Exception as e:
+        debug_log(f"outline read failed ({type(e).__name__}) → heading scan")
+    found = heading_sections(pages())
+    if found:
+        debug_log(f"complaint sections from headings: {found}")
+    return found
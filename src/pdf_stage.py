@@ -0,0 +1,153 @@
+from __future__ import annotations
+import atexit
+import multiprocessing
+import os
+import signal
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, List, Optional, Tuple
+
+from .utils import debug_log
+
+# PDF 추출 전용 프로세스 풀. pypdf 파싱은 CPU를 쓰고, 비정상 PDF 하나가 전체 실행을 멈출 수 있으므로
+# 문서마다 wall-clock / 메모리 상한을 둔 별도 프로세스에서 돌린다.
+PDF_WORKERS = int(os.environ.get("PDF_WORKERS", "2"))
+PDF_JOB_TIMEOUT = float(os.environ.get("PDF_JOB_TIMEOUT", "60"))
+PDF_JOB_MAX_MB = int(os.environ.get("PDF_JOB_MAX_MB", "1024"))
+
+
+class JobTimeout(BaseException):
+    # 페이지별 `except Exception`에 잡혀 작업이 계속되지 않도록 BaseException으로 둔다
+    pass
+
+
+def _on_alarm(signum, frame):
+    raise JobTimeout()
+
+
+def _init_worker(max_bytes: int) -> None:
+    signal.signal(signal.SIGALRM, _on_alarm)
+    if max_bytes > 0:
+        try:
+            import resource
+            _, hard = resource.getrlimit(resource.RLIMIT_AS)
+            resource.setrlimit(resource.RLIMIT_AS, (max_bytes, hard))
+        except (ImportError, ValueError, OSError):
+            pass
+
+
+def _run_job(fn: Callable, args: tuple, timeout: float) -> Tuple[str, Any, float]:
+    """워커 프로세스에서 실행: (결과 구분, 값, 소요 시간). 시간/메모리 초과는 예외 대신 구분값으로 돌려준다."""
+    start = time.monotonic()
+    if timeout > 0:
+        signal.setitimer(signal.ITIMER_REAL, timeout)
+    try:
+        return "ok", fn(*args), time.monotonic() - start
+    except JobTimeout:
+        return "timeout", None, time.monotonic() - start
+    except MemoryError:
+        return "memory", None, time.monotonic() - start
+    finally:
+        if timeout > 0:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+
+
+class PdfExtractStage:
+    """PDF 작업 제출/수집 단계.
+
+    - submit()은 Future를 돌려주므로 호출자는 여러 PDF를 먼저 제출하고 나중에 결과를 모을 수 있다
+      (한 워커가 다운로드하는 동안 다른 워커는 파싱).
+    - 대기 작업 수는 max_pending으로 제한되어, 꽉 차면 submit()이 자리가 날 때까지 기다린다.
+    - 시간/메모리 초과나 워커 비정상 종료는 결과 None으로 처리한다 (호출자는 빈 스니펫으로 대체).
+    - workers=0이면 호출 스레드에서 바로 실행한다 (상한 없음).
+    """
+
+    def __init__(self, workers: Optional[int] = None, job_timeout: Optional[float] = None,
+                 max_mb: Optional[int] = None, max_pending: Optional[int] = None):
+        self.workers = PDF_WORKERS if workers is None else workers
+        self.job_timeout = PDF_JOB_TIMEOUT if job_timeout is None else job_timeout
+        self.max_bytes = (PDF_JOB_MAX_MB if max_mb is None else max_mb) * 1024 * 1024
+        self._slots = threading.BoundedSemaphore(max_pending or max(1, 2 * self.workers))
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+        self.jobs: List[Tuple[str, str, float]] = []  # (label, outcome, seconds)
+
+    def _executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._pool is None:
+                # fork는 실행 중인 스레드(HTTP 세션, hedge 풀)의 락 상태까지 복제하므로 spawn을 쓴다
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_init_worker,
+                    initargs=(self.max_bytes,),
+                )
+            return self._pool
+
+    def _record(self, label: str, outcome: str, seconds: float) -> None:
+        with self._lock:
+            self.jobs.append((label, outcome, seconds))
+        debug_log(f"PDF job {outcome} in {seconds:.2f}s: {label}")
+
+    def submit(self, fn: Callable, *args, label: str = "") -> Future:
+        out: Future = Future()
+        if self.workers <= 0:
+            start = time.monotonic()
+            try:
+                out.set_result(fn(*args))
+                self._record(label, "ok", time.monotonic() - start)
+            except Exception as e:
+                self._record(label, f"error:{type(e).__name__}", time.monotonic() - start)
+                out.set_result(None)
+            return out
+
+        self._slots.acquire()
+        try:
+            pool = self._executor()
+            inner = pool.submit(_run_job, fn, args, self.job_timeout)
+        except Exception:
+            self._slots.release()
+            raise
+
+        def _done(f: Future) -> None:
+            self._slots.release()
+            try:
+                outcome, value, seconds = f.result()
+            except BrokenProcessPool:
+                # 워커가 죽었으면(예: 네이티브 크래시) 다음 제출 때 새 풀을 만든다
+                with self._lock:
+                    if self._pool is pool:
+                        self._pool = None
+                outcome, value, seconds = "crashed", None, 0.0
+            except Exception as e:
+                outcome, value, seconds = f"error:{type(e).__name__}", None, 0.0
+            self._record(label, outcome, seconds)
+            out.set_result(value if outcome == "ok" else None)
+
+        inner.add_done_callback(_done)
+        return out
+
+    def summary(self) -> str:
+        with self._lock:
+            jobs = list(self.jobs)
+        if not jobs:
+            return "jobs=0"
+        times = sorted(s for _, _, s in jobs)
+        slowest = max(jobs, key=lambda j: j[2])
+        failed = sum(1 for _, o, _ in jobs if o != "ok")
+        return (
+            f"jobs={len(jobs)} failed={failed} "
+            f"p50={times[len(times) // 2]:.2f}s max={slowest[2]:.2f}s ({slowest[0]})"
+        )
+
+    def shutdown(self) -> None:
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=True, cancel_futures=True)
+
+
+pdf_stage = PdfExtractStage()
+atexit.register(pdf_stage.shutdown)
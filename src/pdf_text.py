@@ -1,30 +1,434 @@
 from __future__ import annotations
-from io import BytesIO
-from typing import Optional
-import requests
-from pypdf import PdfReader
+import hashlib
+import itertools
+import mmap
+import multiprocessing
+import os
+import re
+import tempfile
+from concurrent.futures import Future
+from typing import Any, BinaryIO, Callable, Iterator, List, Optional, Tuple
+from pypdf import PageObject, PdfReader
+from pypdf.generic import DictionaryObject, IndirectObject, NameObject
+from . import transport
+from .complaint_parse import ComplaintFacts
+from .http_range import BLOCK_SIZE, FULL_FETCH_BELOW, SPOOL_MAX_BYTES, HTTPRangeFile, parse_content_range
+from .pdf_cache import pdf_text_cache
+from .pdf_sections import KEY_SECTIONS, locate_sections
+from .pdf_stage import pdf_stage
+from .resolution import resolutions
+from .utils import debug_log
 
-def extract_pdf_text(url: str, max_chars: int = 6000, timeout: int = 30) -> str:
-    """PDF 텍스트 추출(가벼운 형태).
-    - 스캔 PDF(이미지)면 텍스트가 거의 없을 수 있음.
+PDF_MAGIC = b"%PDF"
+CHUNK_SIZE = 64 * 1024
+MAX_PAGES = 10
+# 고소장 추출 방식: targeted = 캡션 페이지 + outline/제목으로 찾은 구역 페이지만, sequential = 앞쪽 MAX_PAGES 페이지
+PDF_EXTRACT_MODE = os.environ.get("PDF_EXTRACT_MODE", "targeted").strip().lower()
+# targeted 모드에서 구역 제목을 찾는 페이지 범위(outline/제목을 찾으면 거기서 멈춘다)와, 찾은 구역마다 읽는 페이지 수
+TARGET_SCAN_PAGES = 80
+TARGET_SPAN = 2
+# 내용 스트림의 텍스트 객체 시작 연산자 (이름/문자열 안의 "BT"는 제외)
+_TEXT_OP_RE = re.compile(rb"(?:^|[\s\]>)}])BT(?=[\s/\[<(]|$)")
+# Form XObject 안의 Form XObject까지 따라가는 깊이
+_FORM_DEPTH = 3
+# 텍스트 레이어 유무를 보는 앞쪽 페이지 수 (표지만 이미지인 PDF를 스캔본으로 오판하지 않도록)
+TEXT_CHECK_PAGES = 3
+# 스캔본 판정은 텍스트 캐시(퇴출/비활성화될 수 있음)가 아니라 해석 테이블에 URL별로 남긴다
+NO_TEXT_LAYER_KIND = "no_text_layer"
+
+def _spool_body(chunks: Iterator[bytes]) -> Tuple[Any, str]:
+    """응답 본문을 SpooledTemporaryFile에 흘려 쓰며 sha256을 함께 계산한다.
+
+    SPOOL_MAX_BYTES를 넘어 디스크로 넘어갔으면 그 파일의 읽기 전용 mmap을 돌려준다
+    (임시 파일은 이미 unlink된 상태라 mmap을 닫으면 디스크 공간도 반환된다).
+    """
+    spool = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_BYTES)
+    digest = hashlib.sha256()
+    total = 0
+    try:
+        for chunk in chunks:
+            spool.write(chunk)
+            digest.update(chunk)
+            total += len(chunk)
+        if total <= SPOOL_MAX_BYTES:
+            spool.seek(0)
+            return spool, digest.hexdigest()
+        spool.flush()
+        view = mmap.mmap(spool.fileno(), 0, access=mmap.ACCESS_READ)
+    except BaseException:
+        spool.close()
+        raise
+    spool.close()
+    return view, digest.hexdigest()
+
+def _download_pdf(url: str, timeout: int, use_range: bool = True) -> Optional[Tuple[Any, str, str]]:
+    """PDF를 읽을 스트림, ETag, 본문 sha256(전체를 받은 경우, 아니면 "")을 반환한다.
+
+    - 첫 요청은 앞 블록만 Range로 받아 상태 코드 / Content-Type / %PDF 매직을 확인하고, PDF가 아니면 끊는다.
+    - 206이고 파일이 크면 HTTPRangeFile을 돌려줘 pypdf가 실제로 읽는 블록만 추가로 받는다.
+    - 서버가 Range를 무시하고 200을 주면 그 응답을 끝까지 받되, 큰 파일은 임시 파일 + mmap으로 읽는다.
+    - 호출자가 다 쓴 스트림을 close() 한다.
     """
+    headers = {"User-Agent": "Mozilla/5.0", "Accept": "application/pdf"}
+    request_headers = dict(headers)
+    if use_range:
+        request_headers["Range"] = f"bytes=0-{BLOCK_SIZE - 1}"
+    # storage 호스트는 HEDGE_STORAGE=1일 때 hedged request로 꼬리 지연을 줄인다
+    r, first, chunks = transport.first_bytes_get(
+        url,
+        CHUNK_SIZE,
+        timeout=timeout,
+        headers=request_headers,
+        allow_redirects=True,
+    )
     try:
-        r = requests.get(url, timeout=timeout, headers={"User-Agent": "Mozilla/5.0"})
-        r.raise_for_status()
-        bio = BytesIO(r.content)
-        reader = PdfReader(bio)
-        chunks = []
-        for i, page in enumerate(reader.pages[:10]):  # 앞쪽만
+        debug_log(f"PDF GET status={r.status_code} url={url}")
+        if r.status_code not in (200, 206):
+            debug_log(f"[ERROR] PDF GET failed status={r.status_code}")
+            return None
+
+        content_type = r.headers.get("Content-Type", "")
+        debug_log(f"Content-Type={content_type}")
+        debug_log(f"Content-Length={r.headers.get('Content-Length', 'unknown')}")
+
+        # PDF 헤더 앞에 쓰레기 바이트가 올 수 있어 앞 1KB 안에서 매직을 찾는다
+        if PDF_MAGIC not in first[:1024] and "pdf" not in content_type.lower():
+            debug_log("[ERROR] response is not PDF — aborted after first chunk")
+            return None
+
+        etag = r.headers.get("ETag", "")
+        if r.status_code == 206:
+            content_range = parse_content_range(r.headers.get("Content-Range"))
+            if not content_range or content_range[0] != 0:
+                debug_log("[ERROR] unexpected Content-Range → full download")
+                r.close()
+                return _download_pdf(url, timeout, use_range=False)
+            f = HTTPRangeFile(url, content_range[2], timeout=timeout, headers=headers)
             try:
-                t = page.extract_text() or ""
-            except Exception:
-                t = ""
-            if t:
-                chunks.append(t)
-            if sum(len(c) for c in chunks) >= max_chars:
-                break
-        text = "\n".join(chunks)
-        text = " ".join(text.split())
-        return text[:max_chars]
+                f.bytes_fetched = f.write_stream(0, itertools.chain([first], chunks))
+                f.requests = 1
+                if f.size <= FULL_FETCH_BELOW:
+                    f.fill()
+            except BaseException:
+                f.close()
+                raise
+            return f, etag, ""
+
+        stream, sha = _spool_body(itertools.chain([first], chunks))
+        return stream, etag, sha
+    finally:
+        r.close()
+
+def _cache_key(url: str, stream: Any, etag: str, body_sha: str) -> str:
+    """텍스트 캐시 키.
+
+    전체를 받았으면 본문 sha256(내용 주소)이다. Range로 일부만 받았으면 본문 해시를 구할 수 없으므로
+    ETag(없으면 URL)+파일 크기의 해시로 식별한다 — 내용 해시가 아니라 서버가 준 식별자 기반 키다.
+    """
+    if body_sha:
+        return body_sha
+    validator = f"etag:{etag}" if etag else f"url:{url}"
+    return pdf_text_cache.hash_key(f"{validator}|{stream.size}".encode("utf-8"))
+
+def _open_reader(stream: BinaryIO) -> PdfReader:
+    if not isinstance(stream, HTTPRangeFile):
+        return PdfReader(stream)
+    # 비엄격 모드로 열면 pypdf가 xref의 모든 객체 헤더를 확인하느라 파일 전체를 훑게 되므로,
+    # 엄격 모드로 열고(구조가 정상인 파일에서는 결과 동일) 페이지 파싱은 다시 비엄격 모드로 한다.
+    try:
+        reader = PdfReader(stream, strict=True)
+        reader.strict = False
+        return reader
+    except Exception as e:
+        debug_log(f"strict open failed ({type(e).__name__}) → reading whole file")
+        stream.fill()
+        stream.seek(0)
+        return PdfReader(stream)
+
+_INHERITABLE = ("/Resources", "/MediaBox", "/CropBox", "/Rotate")
+
+def _iter_pages(reader: PdfReader, limit: int) -> Iterator[PageObject]:
+    """앞에서부터 limit 페이지까지의 PageObject.
+
+    reader.pages는 길이를 구하려고 모든 page 객체를 읽으므로, Range로 읽을 때(HTTPRangeFile) 파일 전체에
+    흩어진 page 객체마다 요청이 생긴다. 그 경우에만 page tree를 필요한 페이지까지만 내려가고,
+    메모리/임시 파일에 다 받은 PDF는 pypdf의 reader.pages를 그대로 쓴다.
+    """
+    if not isinstance(reader.stream, HTTPRangeFile):
+        return itertools.islice(reader.pages, limit)
+    return _walk_pages(reader, limit)
+
+def _walk_pages(reader: PdfReader, limit: int) -> Iterator[PageObject]:
+    # 상속 속성은 page tree 노드를 고치지 않고 새로 만든 PageObject에만 채운다
+    count = 0
+
+    def walk(node, inherit: dict, ref):
+        nonlocal count
+        t = node.get("/Type") or ("/Pages" if "/Kids" in node else "/Page")
+        if t == "/Pages":
+            inherit = dict(inherit)
+            for attr in _INHERITABLE:
+                if attr in node:
+                    inherit[attr] = node[attr]
+            for kid in node.get("/Kids", []):
+                if count >= limit:
+                    return
+                obj = kid.get_object()
+                if obj:
+                    yield from walk(obj, inherit, kid if isinstance(kid, IndirectObject) else None)
+        elif t == "/Page":
+            page = PageObject(reader, ref)
+            page.update(node)
+            for attr, value in inherit.items():
+                if attr not in page:
+                    page[NameObject(attr)] = value
+            count += 1
+            yield page
+
+    yield from walk(reader.root_object["/Pages"].get_object(), {}, None)
+
+def _has_text_layer(node: DictionaryObject, contents: Optional[bytes], depth: int = 0) -> bool:
+    """페이지(또는 Form XObject)에 글꼴 리소스와 텍스트 연산자가 함께 있는지.
+
+    스캔 PDF의 페이지는 보통 이미지 XObject 하나를 그리는 것이 전부라 /Font도 BT도 없다.
+    """
+    resources = node.get("/Resources")
+    resources = resources.get_object() if resources is not None else None
+    if not resources:
+        return False
+    fonts = resources.get("/Font")
+    if fonts is not None and fonts.get_object() and contents and _TEXT_OP_RE.search(contents):
+        return True
+    if depth >= _FORM_DEPTH:
+        return False
+    xobjects = resources.get("/XObject")
+    xobjects = xobjects.get_object() if xobjects is not None else None
+    for ref in (xobjects or {}).values():
+        xobj = ref.get_object()
+        if xobj.get("/Subtype") == "/Form" and _has_text_layer(xobj, xobj.get_data(), depth + 1):
+            return True
+    return False
+
+def _leading_pages_have_text(reader: PdfReader) -> bool:
+    """앞쪽 TEXT_CHECK_PAGES 페이지의 리소스/내용 스트림만 보고 텍스트 레이어 유무를 판단한다.
+
+    한 페이지라도 텍스트 레이어가 있으면 True. 페이지가 없거나 판단할 수 없어도 True.
+    """
+    try:
+        checked = 0
+        for page in _iter_pages(reader, TEXT_CHECK_PAGES):
+            contents = page.get_contents()
+            if _has_text_layer(page, contents.get_data() if contents is not None else None):
+                return True
+            checked += 1
+        return checked == 0
+    except MemoryError:
+        raise
+    except Exception as e:
+        debug_log(f"text layer check failed ({type(e).__name__}) → extracting anyway")
+        return True
+
+def _iter_page_texts(reader: PdfReader) -> Iterator[str]:
+    """앞쪽 MAX_PAGES 페이지의 텍스트를 한 페이지씩 추출해 yield 한다 (실패한 페이지는 빈 문자열).
+
+    소비자가 멈추면 그 뒤 페이지는 파싱하지 않는다 (Range 읽기면 다운로드도 하지 않는다).
+    """
+    for page in _iter_pages(reader, MAX_PAGES):  # 앞쪽만
+        yield _page_text(page)
+
+def _page_text(page: PageObject) -> str:
+    try:
+        return page.extract_text() or ""
+    except MemoryError:
+        raise
     except Exception:
         return ""
+
+def _facts_pages(reader: PdfReader) -> Tuple[List[str], bool]:
+    """ComplaintFacts가 만족할 때까지만 페이지를 읽는다."""
+    facts = ComplaintFacts()
+    chunks = []
+    for t in _iter_page_texts(reader):
+        if t:
+            chunks.append(t)
+        if facts.feed(t):
+            debug_log(f"complaint facts found after {facts.pages} pages — remaining pages skipped")
+            return chunks, False
+    return chunks, True
+
+def _targeted_facts_pages(reader: PdfReader) -> Tuple[List[str], bool]:
+    """캡션 페이지(첫 페이지)와 청구 원인 / 사실 관계 구역 페이지를 먼저 추출한다.
+
+    구역은 outline(책갈피)으로, 없으면 앞쪽 페이지 제목을 한 페이지씩 훑어 찾는다. 두 구역 중 하나도
+    못 찾으면 앞쪽 페이지 순차 추출(_facts_pages)로 돌아간다. 두 구역을 모두 찾았으면 그 페이지만 읽고
+    끝내고, 하나만 찾았는데 ComplaintFacts가 다 채워지지 않으면 아직 읽지 않은 앞쪽 페이지를 순서대로
+    이어 읽는다. 추출 페이지 수는 MAX_PAGES를 넘지 않는다.
+    """
+    sections = locate_sections(reader, lambda: _iter_pages(reader, TARGET_SCAN_PAGES))
+    if not any(kind in sections for kind in KEY_SECTIONS):
+        return _facts_pages(reader)
+    selected = {0}
+    for start in sorted(sections.values()):
+        selected.update(range(start, start + TARGET_SPAN))
+    selected = set(sorted(selected)[:MAX_PAGES])
+    order = (page for i, page in enumerate(_iter_pages(reader, max(selected) + 1)) if i in selected)
+    if not all(kind in sections for kind in KEY_SECTIONS):
+        order = itertools.chain(
+            order,
+            (page for i, page in enumerate(_iter_pages(reader, TARGET_SCAN_PAGES)) if i not in selected),
+        )
+
+    facts = ComplaintFacts()
+    chunks = []
+    for page in itertools.islice(order, MAX_PAGES):
+        t = _page_text(page)
+        if t:
+            chunks.append(t)
+        if facts.feed(t):
+            debug_log(f"complaint facts found after {facts.pages} pages (targeted {sorted(selected)})")
+            return chunks, False
+    debug_log(f"targeted pages {sorted(selected)} parsed ({facts.pages} pages in total)")
+    return chunks, True
+
+def _replay_facts(pages: List[str]) -> ComplaintFacts:
+    facts = ComplaintFacts()
+    for t in pages:
+        if facts.feed(t):
+            break
+    return facts
+
+def _facts_mode() -> str:
+    # 캐시 항목의 mode: 순차 추출 항목은 빈 문자열(URL 그대로를 키로)로 둔다
+    return "targeted" if PDF_EXTRACT_MODE == "targeted" else ""
+
+def _facts_usable(entry: dict) -> bool:
+    """저장된 페이지로 ComplaintFacts를 끝까지(만족 또는 페이지 한도) 재현할 수 있는지."""
+    if entry.get("max_pages") != MAX_PAGES or entry.get("mode", "") != _facts_mode():
+        return False
+    return bool(entry.get("complete")) or _replay_facts(entry.get("pages", [])).done
+
+def _cache_url(url: str, mode: str) -> str:
+    # 추출 방식별로 캐시 항목을 따로 둔다 (순차 추출 항목을 구역 추출 항목이 덮어쓰지 않도록)
+    return f"{url}#{mode}" if mode else url
+
+def _fetch(url: str, timeout: int, usable: Callable[[dict], bool], read, mode: str = "") -> Optional[dict]:
+    downloaded = _download_pdf(url, timeout)
+    if downloaded is None:
+        return None
+    stream, etag, body_sha = downloaded
+    try:
+        sha = _cache_key(url, stream, etag, body_sha)
+        if mode:
+            sha = pdf_text_cache.hash_key(f"{sha}|{mode}".encode("utf-8"))
+        result = {"sha": sha, "etag": etag, "from_cache": False}
+
+        cached = pdf_text_cache.peek_content(sha, usable)
+        if cached is not None:
+            result.update(from_cache=True, pages=cached["pages"], no_text_layer=bool(cached.get("no_text_layer")))
+            return result
+
+        reader = _open_reader(stream)
+        if not _leading_pages_have_text(reader):
+            debug_log(f"PDF has no text layer (scanned) — skipped: {url}")
+            result.update(pages=[], complete=True, read_chars=0, no_text_layer=True)
+            return result
+        pages, complete = read(reader)
+        if isinstance(stream, HTTPRangeFile):
+            debug_log(
+                f"PDF range read: {stream.bytes_fetched}/{stream.size} bytes in {stream.requests} requests"
+                f"{' (spilled to disk)' if stream.spilled else ''}"
+            )
+        result.update(pages=pages, complete=complete, read_chars=sum(len(p) for p in pages))
+        return result
+    finally:
+        stream.close()
+
+def fetch_facts_pages(url: str, timeout: int) -> Optional[dict]:
+    """PDF를 받아 고소장 페이지 텍스트를 추출한다 (pdf_stage 워커 프로세스에서 실행).
+
+    캡션/청구 원인/AI 스니펫이 모두 나오면 남은 페이지를 파싱하지 않는다. 캐시 쓰기는 부모 프로세스가
+    하므로 여기서는 내용 캐시를 읽기만 한다. PDF가 아니면 None.
+
+    PDF_EXTRACT_MODE=targeted면 캡션 페이지와 outline/제목으로 찾은 구역 페이지만 읽는다.
+    """
+    mode = _facts_mode()
+    return _fetch(url, timeout, _facts_usable, _targeted_facts_pages if mode else _facts_pages, mode)
+
+def _job_with_host_stats(job: Callable, samples: dict, *args) -> Tuple[Any, dict]:
+    """pdf_stage에서 job을 실행하고 (결과, 이 작업의 호스트별 다운로드 통계)를 돌려준다.
+
+    워커 프로세스면 부모의 TTFB 표본으로 hedge 기준을 맞춘 뒤 실행하고, 새로 쌓인 표본/카운터를
+    결과와 함께 돌려줘 부모가 합친다. 같은 프로세스(PDF_WORKERS=0)면 이미 부모에 쌓였으므로 빈 통계.
+    """
+    if multiprocessing.parent_process() is None:
+        return job(*args), {}
+    transport.seed_host_stats(samples)
+    result = job(*args)
+    return result, transport.drain_host_stats()
+
+def _submit(url: str, usable: Callable[[dict], bool], job: Callable, args: tuple,
+            finish: Callable[[Optional[List[str]]], Any], mode: str = "") -> Future:
+    """캐시 조회 → (없으면) pdf_stage 제출 → 결과 캐시 저장 → finish(pages)로 변환한 Future."""
+    out: Future = Future()
+    key = _cache_url(url, mode)
+    cached = pdf_text_cache.lookup_url(key, usable)
+    if cached is not None:
+        debug_log(f"PDF text cache hit: {url}")
+        if cached.get("no_text_layer"):
+            resolutions.flag(NO_TEXT_LAYER_KIND, url)
+        out.set_result(finish(cached["pages"]))
+        return out
+    if no_text_layer(url):
+        debug_log(f"PDF recorded as scanned without text layer — skipped: {url}")
+        out.set_result(finish([]))
+        return out
+
+    def _finish(f: Future) -> None:
+        pages = None
+        try:
+            value = f.result()
+            result = None
+            if value is not None:
+                result, host_stats = value
+                transport.merge_host_stats(host_stats)
+            if result is not None:
+                if result.get("no_text_layer"):
+                    resolutions.flag(NO_TEXT_LAYER_KIND, url)
+                if result["from_cache"]:
+                    debug_log(f"PDF text cache hit (same content): {url}")
+                    pdf_text_cache.link_content(key, result["sha"], result["etag"])
+                else:
+                    pdf_text_cache.store(key, result["sha"], result["etag"], result["pages"],
+                                         result["complete"], result["read_chars"], MAX_PAGES,
+                                         no_text_layer=result.get("no_text_layer", False), mode=mode)
+                pages = result["pages"]
+        except Exception as e:
+            debug_log(f"[ERROR] PDF extraction exception: {type(e).__name__}: {e}")
+        out.set_result(finish(pages))
+
+    try:
+        pdf_stage.submit(_job_with_host_stats, job, transport.host_samples(), *args,
+                         label=url).add_done_callback(_finish)
+    except Exception as e:
+        debug_log(f"[ERROR] PDF extraction exception: {type(e).__name__}: {e}")
+        out.set_result(finish(None))
+    return out
+
+def submit_complaint_facts(url: str, timeout: int = 30) -> Future:
+    """고소장 PDF를 필요한 만큼만 읽어 ComplaintFacts(Future)를 돌려준다. 실패하면 빈 ComplaintFacts."""
+    return _submit(url, _facts_usable, fetch_facts_pages, (url, timeout),
+                   lambda pages: _replay_facts(pages or []), mode=_facts_mode())
+
+def extract_complaint_facts(url: str, timeout: int = 30) -> ComplaintFacts:
+    """고소장 PDF에서 캡션 당사자 / 청구 원인 / AI 학습 스니펫을 추출한다.
+    - 스캔 PDF(이미지)면 텍스트가 거의 없을 수 있음. 앞쪽 TEXT_CHECK_PAGES 페이지 모두에 글꼴/텍스트
+      연산자가 없으면 페이지 텍스트 추출 없이 빈 결과를 돌려주고 해석 테이블에 기록한다 (no_text_layer).
+    - PDF가 아니거나 요청이 실패하면 빈 ComplaintFacts.
+    - 이미 추출한 PDF는 디스크 캐시(pdf_cache)에서 바로 돌려준다.
+    - 추출은 시간/메모리 상한이 있는 pdf_stage 프로세스 풀에서 실행된다.
+    """
+    return submit_complaint_facts(url, timeout).result()
+
+def no_text_layer(url: str) -> bool:
+    """이미 처리한 PDF가 텍스트 레이어 없는 스캔본이었는지 (빈 결과의 원인 구분용)."""
+    return resolutions.flagged(NO_TEXT_LAYER_KIND, url)
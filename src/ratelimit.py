@@ -0,0 +1,127 @@
+from __future__ import annotations
+import threading
+import time
+from collections import deque
+from email.utils import parsedate_to_datetime
+
+
+class TokenBucket:
+    """스레드 안전 토큰 버킷.
+
+    rate(초당 토큰)로 채워지고 최대 capacity개까지 쌓인다.
+    acquire()는 토큰이 생길 때까지 대기하므로 여러 스레드가 공유해도
+    전체 요청 속도가 rate를 넘지 않는다.
+    """
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = max(1.0, capacity)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+        self.waited = 0.0
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self, tokens: float = 1.0) -> None:
+        if self.rate <= 0:
+            return
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return
+                wait = (tokens - self._tokens) / self.rate
+                self.waited += wait
+            time.sleep(wait)
+
+
+class AdaptiveConcurrency:
+    """AIMD(additive increase / multiplicative decrease) 동시성 제어기.
+
+    - 응답 지연과 최근 오류율이 건강하면 동시 요청 한도를 조금씩(+1/limit) 늘린다.
+    - 429/503을 받으면 한도를 절반으로 줄이고, Retry-After 동안 새 요청을 막는다.
+    """
+
+    def __init__(
+        self,
+        max_limit: int,
+        initial: int | None = None,
+        min_limit: int = 1,
+        latency_target: float = 5.0,
+        error_threshold: float = 0.2,
+        window: int = 20,
+    ):
+        self.max_limit = max(min_limit, max_limit)
+        self.min_limit = min_limit
+        self.limit = float(initial if initial is not None else max(min_limit, self.max_limit // 2))
+        self.latency_target = latency_target
+        self.error_threshold = error_threshold
+        self.in_flight = 0
+        self.throttle_events = 0
+        self.retries = 0
+        self.blocked_until = 0.0
+        self._recent: deque = deque(maxlen=window)
+        self._cond = threading.Condition()
+
+    def acquire(self) -> None:
+        with self._cond:
+            while True:
+                wait = self.blocked_until - time.monotonic()
+                if wait <= 0 and self.in_flight < int(self.limit):
+                    self.in_flight += 1
+                    return
+                self._cond.wait(timeout=wait if wait > 0 else None)
+
+    def release(self, latency: float, status: int, retry_after: float | None = None) -> None:
+        """요청 1건의 결과를 반영한다. status=0은 네트워크 예외를 의미한다."""
+        with self._cond:
+            self.in_flight -= 1
+            throttled = status in (429, 503)
+            error = throttled or status == 0 or status >= 500
+            self._recent.append(error)
+            if throttled:
+                self.throttle_events += 1
+                self.limit = max(float(self.min_limit), self.limit / 2)
+                if retry_after:
+                    self.blocked_until = max(self.blocked_until, time.monotonic() + retry_after)
+            elif not error and latency <= self.latency_target and self._error_rate() < self.error_threshold:
+                self.limit = min(float(self.max_limit), self.limit + 1.0 / self.limit)
+            self._cond.notify_all()
+
+    def record_retry(self) -> None:
+        with self._cond:
+            self.retries += 1
+
+    def _error_rate(self) -> float:
+        return sum(self._recent) / len(self._recent) if self._recent else 0.0
+
+    def snapshot(self) -> dict:
+        with self._cond:
+            return {
+                "limit": int(self.limit),
+                "in_flight": self.in_flight,
+                "throttle_events": self.throttle_events,
+                "retries": self.retries,
+                "error_rate": round(self._error_rate(), 3),
+            }
+
+
+def parse_retry_after(value: str | None, cap: float = 300.0) -> float | None:
+    """Retry-After 헤더(초 또는 HTTP-date)를 대기 초로 변환한다."""
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return min(cap, max(0.0, float(value)))
+    except ValueError:
+        pass
+    try:
+        dt = parsedate_to_datetime(value)
+        return min(cap, max(0.0, dt.timestamp() - time.time()))
+    except (TypeError, ValueError):
+        return None
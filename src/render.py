@@ -1,10 +1,10 @@
 from __future__ import annotations
-from typing import List
+from typing import Dict, Iterable, List, Set, Tuple
 from collections import Counter
 import re
-import copy
 from .extract import Lawsuit
 from .courtlistener import CLDocument, CLCaseSummary
+from .keyword_match import KeywordAutomaton
 from .utils import debug_log, slugify_case_name
 
 def _esc(s: str) -> str:
@@ -62,6 +62,25 @@ RISK_CRITERIA = [
 ]
 
 
+# 모든 항목의 키워드를 한 오토마톤으로 묶어 텍스트를 한 번만 훑는다
+_RISK_AUTOMATON = KeywordAutomaton(k for _, keywords, _ in RISK_CRITERIA for k in keywords)
+# Nature of Suit 코드로도 인정하는 항목 (NOS 820 = Copyright)
+_NOS_CRITERIA = {"저작권 직접 언급": ("820", "3820")}
+
+
+def match_risk_criteria(text: str) -> List[Tuple[str, List[str], int]]:
+    """소문자 텍스트에서 걸린 (항목명, 발견 키워드(RISK_CRITERIA 순서), 점수) 목록."""
+    hits = _RISK_AUTOMATON.matches(text)
+    if not hits:
+        return []
+    out = []
+    for name, keywords, points in RISK_CRITERIA:
+        found = [k for k in keywords if k in hits]
+        if found:
+            out.append((name, found, points))
+    return out
+
+
 # =====================================================
 # 뉴스 위험도
 # =====================================================
@@ -70,16 +89,27 @@ def calculate_news_risk_score(title: str, reason: str) -> tuple[int, List[str]]:
     matched_keywords = []
     text = f"{title or ''} {reason or ''}".lower()
 
-    for name, keywords, points in RISK_CRITERIA:
-        found = [k for k in keywords if k in text]
-        if found:
-            score += points
-            # 각 카테고리에서 발견된 첫 2개 키워드만 표시 (너무 길어짐 방지)
-            matched_keywords.append(f"{name}: {', '.join(found[:2])}")
+    for name, found, points in match_risk_criteria(text):
+        score += points
+        # 각 카테고리에서 발견된 첫 2개 키워드만 표시 (너무 길어짐 방지)
+        matched_keywords.append(f"{name}: {', '.join(found[:2])}")
 
     return max(0, min(score, 100)), matched_keywords
 
 
+def score_lawsuits(lawsuits: Iterable[Lawsuit]) -> List[tuple[int, List[str]]]:
+    """뉴스 행 전체의 (위험도, 키워드 표시) 목록. 같은 제목/사유는 한 번만 계산한다."""
+    memo: Dict[Tuple[str, str], tuple[int, List[str]]] = {}
+    out = []
+    for s in lawsuits:
+        key = (s.article_title or s.case_title, s.reason)
+        if key not in memo:
+            memo[key] = calculate_news_risk_score(*key)
+        score, keywords = memo[key]
+        out.append((score, list(keywords)))
+    return out
+
+
 def format_risk(score: int) -> str:
     if score >= 80:
         return f"🔥 {score}"
@@ -94,42 +124,35 @@ def format_risk(score: int) -> str:
 # RECAP 위험도
 # =====================================================
 def calculate_case_risk_score(case: CLCaseSummary) -> int:
-    score = 0
-    text = f"{case.extracted_ai_snippet or ''} {case.extracted_causes or ''}".lower()
-    nature = (case.nature_of_suit or "").lower()
+    return _case_risk_score(case.extracted_ai_snippet, case.extracted_causes, case.nature_of_suit)
 
-    # 1. 무단 데이터 수집 명시 (+25)
-    if any(k in text for k in ["scrape", "crawl", "ingest", "harvest", "mining", "extraction", "bulk", "collection", "robots.txt", "common crawl", "laion", "the pile", "bookcorpus", "unauthorized"]):
-        score += 25
-    
-    # 2. 모델 학습 직접 언급 (+20)
-    if any(k in text for k in ["train", "training", "model", "llm", "generative ai", "genai", "gpt", "transformer", "weight", "fine-tune", "diffusion", "inference"]):
-        score += 20
-    
-    # 3. 저작권 직접 언급 (+30)
-    # NOS 코드 820, 3820 또는 copyright 키워드
-    if "820" in nature or "3820" in nature or any(k in text for k in ["820", "3820", "copyright"]):
-        score += 30
-
-    # 4. 저작권 관련/쟁점 (+10)
-    if any(k in text for k in ["infringement", "dmca", "fair use", "derivative", "exclusive"]):
-        score += 10
-
-    # 5. 상업적 사용 (+10)
-    if any(k in text for k in ["commercial", "profit", "monetiz", "revenue", "subscription", "enterprise", "paid", "for-profit"]):
-        score += 10
-        
-    # 6. 집단소송 (+5)
-    if any(k in text for k in ["class action", "putative class", "representative"]):
-        score += 5
 
-    # 7. 데이터 제공 계약/협력 (-10)
-    if any(k in text for k in ["contract", "licensing", "agreement", "partnership", "계약", "협력", "제휴"]):
-        score -= 10
+def _case_risk_score(ai_snippet: str, causes: str, nature_of_suit: str) -> int:
+    # 항목/키워드/점수는 뉴스와 같은 RISK_CRITERIA (저작권 항목은 NOS 코드로도 인정)
+    text = f"{ai_snippet or ''} {causes or ''}".lower()
+    nature = (nature_of_suit or "").lower()
+
+    matched: Set[str] = {name for name, _, _ in match_risk_criteria(text)}
+    for name, codes in _NOS_CRITERIA.items():
+        if any(code in nature for code in codes):
+            matched.add(name)
 
+    score = sum(points for name, _, points in RISK_CRITERIA if name in matched)
     return max(0, min(score, 100))
 
 
+def score_cases(rows: Iterable[Tuple[str, str, str]]) -> List[int]:
+    """(AI 학습 주장, 청구 원인, Nature of Suit) 목록의 위험도. 같은 입력은 한 번만 계산한다."""
+    memo: Dict[Tuple[str, str, str], int] = {}
+    out = []
+    for row in rows:
+        key = tuple(row)
+        if key not in memo:
+            memo[key] = _case_risk_score(*key)
+        out.append(memo[key])
+    return out
+
+
 # =====================================================
 # 메인 렌더
 # =====================================================
@@ -218,10 +241,10 @@ def render_markdown(
         lines.append(_md_sep(7))
 
         # 기사일자 기준으로 정렬 (날짜 내림차순, 동일 날짜 시 위험도 내림차순)
-        scored_lawsuits = []
-        for s in lawsuits:
-            risk_score, keywords = calculate_news_risk_score(s.article_title or s.case_title, s.reason)
-            scored_lawsuits.append((risk_score, keywords, s))
+        scored_lawsuits = [
+            (risk_score, keywords, s)
+            for (risk_score, keywords), s in zip(score_lawsuits(lawsuits), lawsuits)
+        ]
         
         scored_lawsuits.sort(key=lambda x: (x[0], x[2].update_or_filed_date or ""), reverse=True)
 
@@ -262,7 +285,7 @@ def render_markdown(
         lines.append(_md_sep(14))
         
         # 위험도 점수 기준으로 정렬 (위험도 내림차순, 동일 점수 시 날짜 내림차순)
-        scored_cases = []
+        case_texts = []
         for c in cl_cases:
             # 최종 스코어링 소스 텍스트 결정
             ext_causes = c.extracted_causes
@@ -271,13 +294,14 @@ def render_markdown(
                 doc = doc_map[c.docket_id]
                 ext_causes = doc.extracted_causes or ext_causes
                 ext_snippet = doc.extracted_ai_snippet or ext_snippet
-            
-            # 위험도 계산용 임시 객체 (원본 보호)
-            c_copy = copy.copy(c)
-            c_copy.extracted_ai_snippet = ext_snippet
-            c_copy.extracted_causes = ext_causes
-            score = calculate_case_risk_score(c_copy)
-            scored_cases.append((score, c, ext_causes, ext_snippet))
+            case_texts.append((c, ext_causes, ext_snippet))
+
+        # 레코드를 복사하지 않고 최종 텍스트로 한 번에 점수 계산
+        scores = score_cases((ext_snippet, ext_causes, c.nature_of_suit) for c, ext_causes, ext_snippet in case_texts)
+        scored_cases = [
+            (score, c, ext_causes, ext_snippet)
+            for score, (c, ext_causes, ext_snippet) in zip(scores, case_texts)
+        ]
             
         scored_cases.sort(key=lambda x: (x[0], x[1].recent_updates if x[1].recent_updates != "미확인" else ""), reverse=True)
 
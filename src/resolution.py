@@ -0,0 +1,109 @@
+from __future__ import annotations
+import os
+import re
+import threading
+import time
+from typing import Dict, List, Optional
+
+from .utils import cache_dir, load_json, save_json, debug_log
+
+# 뉴스에서 뽑은 사건명 / 사건번호 → CourtListener 도켓 ID 해석 결과 (CACHE_DIR/resolutions.json)
+# 문서 URL별 판정(텍스트 레이어 없는 스캔 PDF 등)도 flag 항목으로 같은 테이블에 둔다.
+RESOLUTION_TABLE_VERSION = 1
+# 찾은 결과는 오래 유지하고, 못 찾은 결과(negative)는 새 사건이 등록될 수 있으므로 짧게 유지한다
+RESOLUTION_TTL = 7 * 24 * 3600
+NEGATIVE_TTL = 24 * 3600
+
+
+def _normalize(key: str) -> str:
+    return re.sub(r"\s+", " ", key or "").strip().lower()
+
+
+def _ttl(entry: dict) -> int:
+    return RESOLUTION_TTL if entry.get("ids") or entry.get("flag") else NEGATIVE_TTL
+
+
+class ResolutionTable:
+    """종류(title / docket_number)별 키 → 도켓 ID 목록.
+
+    get()은 TTL 이내 항목이면 ID 목록(빈 목록 = 지난번에 못 찾음)을, 없거나 만료됐으면 None을 돌려준다.
+    flag() / flagged()는 ID 없이 "이 키는 그렇다"는 판정만 남긴다 (RESOLUTION_TTL 동안 유지).
+    """
+
+    def __init__(self, path: str | None = None):
+        self._path = path
+        self._entries: Optional[Dict[str, Dict[str, dict]]] = None
+        self._dirty = False
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def path(self) -> str:
+        if self._path is None:
+            self._path = os.path.join(cache_dir(), "resolutions.json")
+        return self._path
+
+    def _load(self) -> Dict[str, Dict[str, dict]]:
+        if self._entries is None:
+            table = load_json(self.path) or {}
+            if table.get("version") == RESOLUTION_TABLE_VERSION:
+                self._entries = table.get("entries") or {}
+            else:
+                self._entries = {}
+        return self._entries
+
+    def get(self, kind: str, key: str) -> Optional[List[int]]:
+        with self._lock:
+            entry = self._load().get(kind, {}).get(_normalize(key))
+            if entry is not None:
+                if time.time() - entry.get("at", 0) < _ttl(entry):
+                    self.hits += 1
+                    return list(entry.get("ids") or [])
+            self.misses += 1
+            return None
+
+    def set(self, kind: str, key: str, ids: List[int]) -> None:
+        with self._lock:
+            self._load().setdefault(kind, {})[_normalize(key)] = {
+                "ids": [int(i) for i in dict.fromkeys(ids)],
+                "at": time.time(),
+            }
+            self._dirty = True
+
+    def flagged(self, kind: str, key: str) -> bool:
+        """flag()로 남긴 판정이 TTL 이내인지 (해석 통계에는 세지 않는다)."""
+        with self._lock:
+            entry = self._load().get(kind, {}).get(_normalize(key))
+            return bool(entry and entry.get("flag") and time.time() - entry.get("at", 0) < _ttl(entry))
+
+    def flag(self, kind: str, key: str) -> None:
+        with self._lock:
+            self._load().setdefault(kind, {})[_normalize(key)] = {"flag": True, "at": time.time()}
+            self._dirty = True
+
+    def save(self) -> None:
+        with self._lock:
+            if not self._dirty:
+                return
+            now = time.time()
+            # 만료 항목은 저장 시점에 정리한다
+            entries = {
+                kind: {
+                    k: e for k, e in values.items()
+                    if now - e.get("at", 0) < _ttl(e)
+                }
+                for kind, values in self._load().items()
+            }
+            try:
+                save_json(self.path, {"version": RESOLUTION_TABLE_VERSION, "entries": entries})
+                self._dirty = False
+            except OSError as e:
+                debug_log(f"resolution table write failed: {e}")
+
+    def summary(self) -> str:
+        with self._lock:
+            return f"hits={self.hits} misses={self.misses}"
+
+
+resolutions = ResolutionTable()
@@ -10,19 +10,35 @@ from .render import render_markdown
 from .github_issue import find_or_create_issue, create_comment, close_other_daily_issues
 from .github_issue import list_comments
 from .slack import post_to_slack
-from .utils import debug_log, slugify_case_name
+from .utils import clear_text_pool, debug_log, slugify_case_name
 from .dedup import apply_deduplication
 from .courtlistener import (
-    search_recent_documents,
+    search_new_documents,
     build_complaint_documents_from_hits,
     build_case_summaries_from_hits,
     build_case_summaries_from_docket_numbers,
     build_case_summaries_from_case_titles,
     build_documents_from_docket_ids,
+    DocketStore,
+    throttle_metrics,
+    preload_courts,
 )
+from .http_cache import response_cache
+from .transport import hedge_stats
+from .checkpoint import Checkpoints
+from .resolution import resolutions
+from .pdf_cache import pdf_text_cache
+from .pdf_stage import pdf_stage
 from .queries import COURTLISTENER_QUERIES
 
 def main() -> None:
+    # 레코드 공유 텍스트 풀은 한 번의 실행 동안만 유지한다 (오래 도는 프로세스에서 계속 커지지 않도록)
+    try:
+        _run()
+    finally:
+        clear_text_pool()
+
+def _run() -> None:
     # 0) 환경 변수 로드
     owner = os.environ.get("GITHUB_OWNER")
     repo = os.environ.get("GITHUB_REPO")
@@ -46,11 +62,15 @@ def main() -> None:
     
     issue_label = os.environ.get("ISSUE_LABEL", "ai-lawsuit-monitor")
 
+    # delta 모드: 소스별 체크포인트 이후의 새 항목만 수집/처리 (LOOKBACK_DAYS는 안전 하한)
+    checkpoints = Checkpoints() if os.environ.get("DELTA_MODE") == "1" else None
+
     # 1) CourtListener 검색
     hits = []
     for q in COURTLISTENER_QUERIES:
         debug_log(f"Running CourtListener query: {q}")
-        hits.extend(search_recent_documents(q, days=lookback_days, max_results=20))
+        # 고정 1페이지(20건) 대신 기간 내 결과를 cursor pagination으로 모두 수집
+        hits.extend(search_new_documents(q, days=lookback_days, max_results=None, checkpoints=checkpoints))
     
     # 중복 제거
     dedup = {}
@@ -59,29 +79,39 @@ def main() -> None:
         dedup[key] = h
     hits = list(dedup.values())
 
-    cl_docs = build_complaint_documents_from_hits(hits, days=lookback_days)
+    # 실행 단위 도켓 저장소: 모든 빌더가 도켓 메타데이터/RECAP 목록을 공유
+    store = DocketStore(checkpoints=checkpoints)
+    # 법원 약칭 테이블 준비 (디스크 테이블이 유효하면 네트워크 호출 없음)
+    preload_courts()
+
+    cl_docs = build_complaint_documents_from_hits(hits, days=lookback_days, store=store)
     # RECAP 도켓(사건) 요약: "법원 사건(도켓) 확인 건수"로 사용
-    cl_cases = build_case_summaries_from_hits(hits)
+    cl_cases = build_case_summaries_from_hits(hits, store=store)
 
     # 2) 뉴스 수집
     news = fetch_news()
     known = load_known_cases()
-    lawsuits = build_lawsuits_from_news(news, known, lookback_days=lookback_days)
+    rss_since = None
+    if checkpoints:
+        mark = checkpoints.get("rss", "published")
+        rss_since = datetime.fromisoformat(mark) if mark else None
+    lawsuits = build_lawsuits_from_news(news, known, lookback_days=lookback_days, since=rss_since, checkpoints=checkpoints)
 
     # 2-1) 뉴스 테이블의 소송번호(도켓번호)로 RECAP 도켓/문서 확장
     docket_numbers = [s.case_number for s in lawsuits if (s.case_number or "").strip() and s.case_number != "미확인"]
-    extra_cases = build_case_summaries_from_docket_numbers(docket_numbers)
+    extra_cases = build_case_summaries_from_docket_numbers(docket_numbers, store=store)
 
     # 2-2) 소송번호가 없더라도, '소송제목'(추정 케이스명)으로 도켓 확장
     case_titles = [s.case_title for s in lawsuits if (s.case_title or "").strip() and s.case_title != "미확인"]
-    extra_cases_by_title = build_case_summaries_from_case_titles(case_titles)
+    extra_cases_by_title = build_case_summaries_from_case_titles(case_titles, store=store)
 
     merged_cases = {c.docket_id: c for c in (cl_cases + extra_cases + extra_cases_by_title)}
     cl_cases = list(merged_cases.values())
 
     # 문서도 docket id 기반으로 추가 시도(Complaint 우선, 없으면 fallback)
+    # (도켓 메타데이터는 빌더 안에서 id__in 배치로 한 번에 조회)
     docket_ids = list(merged_cases.keys())
-    extra_docs = build_documents_from_docket_ids(docket_ids, days=lookback_days)
+    extra_docs = build_documents_from_docket_ids(docket_ids, days=lookback_days, store=store)
     merged_docs = {}
     for d in (cl_docs + extra_docs):
         key = (d.docket_id, d.doc_number, d.date_filed, d.document_url)
@@ -134,6 +164,16 @@ def main() -> None:
     debug_log(f"📊 수집 및 분석 완료 (최근 {lookback_days}일)")
     debug_log(f"  ├ News: {len(lawsuits)}건")
     debug_log(f"  └ Cases (CourtListener+RECAP): {docket_case_count}건 (문서 {recap_doc_count}건)")
+    debug_log(f"HTTP 응답 캐시: {response_cache.summary()}")
+    debug_log(f"도켓 저장소: {store.summary()}")
+    debug_log(f"사건명/사건번호 해석 테이블: {resolutions.summary()}")
+    # PDF 추출 중 기록한 스캔본 판정까지 저장
+    resolutions.save()
+    debug_log(f"PDF 텍스트 캐시: {pdf_text_cache.summary()}")
+    debug_log(f"PDF 추출 단계: {pdf_stage.summary()}")
+    pdf_stage.shutdown()
+    debug_log(f"CourtListener 동시성 제어: {throttle_metrics()}")
+    debug_log(f"호스트별 다운로드/hedge 통계: {hedge_stats()}")
 
     debug_log("===== REPORT PREVIEW (First 1000 chars) =====")
     debug_log(md[:1000])
@@ -146,6 +186,11 @@ def main() -> None:
     create_comment(owner, repo, gh_token, issue_no, comment_body)
     debug_log(f"Issue #{issue_no} 댓글 업로드 완료")
 
+    # 리포트 게시까지 끝난 뒤에만 체크포인트 확정 (도켓은 모든 빌더가 처리에 성공한 것만)
+    if checkpoints:
+        store.settle()
+        checkpoints.commit()
+
     # 5) Slack 요약 전송
     # ============================================
     # Slack 출력 개선 (최종 포맷)
@@ -1,6 +1,6 @@
 from __future__ import annotations
-import requests
+from . import transport
 
 def post_to_slack(webhook_url: str, text: str) -> None:
-    r = requests.post(webhook_url, json={"text": text}, timeout=20)
+    r = transport.post(webhook_url, json={"text": text}, timeout=20)
     r.raise_for_status()
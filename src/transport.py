@@ -0,0 +1,274 @@
+from __future__ import annotations
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from typing import Dict, Iterator, List, Tuple
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# 모든 외부 HTTP 호출(CourtListener, storage, GitHub, Slack, 뉴스)이 공유하는 전송 계층.
+# 호스트별로 keep-alive Session을 하나씩 두어 TCP+TLS 핸드셰이크를 재사용한다.
+
+DEFAULT_TIMEOUT = float(os.environ.get("HTTP_TIMEOUT", "30"))
+POOL_MAXSIZE = int(os.environ.get("HTTP_POOL_MAXSIZE", "10"))
+
+DEFAULT_HEADERS = {
+    "User-Agent": "ai-lawsuit-monitor/1.4",
+    "Accept-Encoding": "gzip, deflate",
+    "Connection": "keep-alive",
+}
+
+# Hedged request: 느린 storage 다운로드의 꼬리 지연(p99) 완화
+HEDGE_ENABLED = os.environ.get("HEDGE_STORAGE", "0") == "1"
+HEDGE_HOSTS = {"storage.courtlistener.com"}
+HEDGE_PERCENTILE = float(os.environ.get("HEDGE_PERCENTILE", "0.95"))
+HEDGE_MIN_DELAY = 0.5
+HEDGE_MAX_DELAY = 10.0
+HEDGE_DEFAULT_DELAY = 3.0
+HEDGE_MIN_SAMPLES = 10
+
+_sessions: Dict[str, requests.Session] = {}
+_lock = threading.Lock()
+
+
+def _new_session() -> requests.Session:
+    s = requests.Session()
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=POOL_MAXSIZE)
+    s.mount("https://", adapter)
+    s.mount("http://", adapter)
+    s.headers.update(DEFAULT_HEADERS)
+    return s
+
+
+def session_for(url: str) -> requests.Session:
+    """URL 호스트 전용 Session을 반환한다 (없으면 생성)."""
+    host = urlparse(url).netloc.lower()
+    with _lock:
+        s = _sessions.get(host)
+        if s is None:
+            s = _new_session()
+            _sessions[host] = s
+        return s
+
+
+def request(method: str, url: str, timeout: float | None = None, **kwargs) -> requests.Response:
+    return session_for(url).request(
+        method, url, timeout=timeout if timeout is not None else DEFAULT_TIMEOUT, **kwargs
+    )
+
+
+def get(url: str, **kwargs) -> requests.Response:
+    return request("GET", url, **kwargs)
+
+
+def post(url: str, **kwargs) -> requests.Response:
+    return request("POST", url, **kwargs)
+
+
+def patch(url: str, **kwargs) -> requests.Response:
+    return request("PATCH", url, **kwargs)
+
+
+def close_all() -> None:
+    with _lock:
+        for s in _sessions.values():
+            s.close()
+        _sessions.clear()
+
+
+# =====================================================
+# First-byte latency 통계 + hedged GET
+# =====================================================
+
+class HostStats:
+    """호스트별 첫 바이트 도착 시간(TTFB: 요청 시작 → 응답 헤더 수신) 표본과 hedging 통계.
+
+    PDF 다운로드는 pdf_stage 워커 프로세스에서 일어나므로, 워커는 작업마다 부모의 표본으로 seed()해
+    같은 hedge 기준을 쓰고, 새로 쌓인 값은 drain()으로 작업 결과에 실어 부모가 merge()한다.
+    """
+
+    def __init__(self):
+        self.samples: deque = deque(maxlen=200)
+        self.requests = 0
+        self.hedged = 0
+        self.hedge_wins = 0
+        self._fresh: deque = deque(maxlen=200)  # 마지막 drain() 이후 새 표본
+        self._lock = threading.Lock()
+
+    def record(self, ttfb: float) -> None:
+        with self._lock:
+            self.samples.append(ttfb)
+            self._fresh.append(ttfb)
+
+    def count(self, field: str) -> None:
+        """requests / hedged / hedge_wins 중 하나를 1 늘린다."""
+        with self._lock:
+            setattr(self, field, getattr(self, field) + 1)
+
+    def threshold(self) -> float:
+        """최근 TTFB의 HEDGE_PERCENTILE 분위수 (표본이 적으면 기본값)."""
+        with self._lock:
+            if len(self.samples) < HEDGE_MIN_SAMPLES:
+                return HEDGE_DEFAULT_DELAY
+            ordered = sorted(self.samples)
+        idx = min(len(ordered) - 1, int(len(ordered) * HEDGE_PERCENTILE))
+        return min(HEDGE_MAX_DELAY, max(HEDGE_MIN_DELAY, ordered[idx]))
+
+    def seed(self, samples: List[float]) -> None:
+        """표본을 (부모 프로세스의) samples로 바꾼다. 카운터와 새 표본은 그대로 둔다."""
+        with self._lock:
+            self.samples = deque(samples, maxlen=self.samples.maxlen)
+
+    def drain(self) -> dict:
+        """마지막 drain() 이후의 새 표본과 카운터를 꺼내고 0으로 되돌린다."""
+        with self._lock:
+            report = {
+                "ttfb": list(self._fresh),
+                "requests": self.requests,
+                "hedged": self.hedged,
+                "hedge_wins": self.hedge_wins,
+            }
+            self._fresh.clear()
+            self.requests = self.hedged = self.hedge_wins = 0
+        return report
+
+    def merge(self, report: dict) -> None:
+        with self._lock:
+            self.samples.extend(report.get("ttfb", ()))
+            self.requests += report.get("requests", 0)
+            self.hedged += report.get("hedged", 0)
+            self.hedge_wins += report.get("hedge_wins", 0)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "hedged": self.hedged,
+                "hedge_wins": self.hedge_wins,
+                "samples": len(self.samples),
+            }
+
+
+_host_stats: Dict[str, HostStats] = {}
+_hedge_pool: ThreadPoolExecutor | None = None
+
+
+def _stats_for(host: str) -> HostStats:
+    with _lock:
+        return _host_stats.setdefault(host, HostStats())
+
+
+def _hedge_executor() -> ThreadPoolExecutor:
+    global _hedge_pool
+    with _lock:
+        if _hedge_pool is None:
+            _hedge_pool = ThreadPoolExecutor(max_workers=max(4, 2 * POOL_MAXSIZE), thread_name_prefix="hedge")
+        return _hedge_pool
+
+
+def _first_bytes_attempt(url: str, chunk_size: int, kwargs: dict):
+    # stream=True GET은 응답 헤더(첫 바이트)를 받으면 돌아오므로 그 시점까지를 TTFB로 잰다
+    start = time.monotonic()
+    r = get(url, stream=True, **kwargs)
+    ttfb = time.monotonic() - start
+    chunks = r.iter_content(chunk_size)
+    first = next(chunks, b"")
+    return r, first, chunks, ttfb
+
+
+def _discard(fut) -> None:
+    """진 쪽 시도: 아직 시작 전이면 취소, 이미 진행 중이면 끝나는 즉시 연결을 닫는다."""
+    if fut.cancel():
+        return
+    def _close(f):
+        try:
+            f.result()[0].close()
+        except Exception:
+            pass
+    fut.add_done_callback(_close)
+
+
+def first_bytes_get(url: str, chunk_size: int = 64 * 1024, **kwargs) -> Tuple[requests.Response, bytes, Iterator[bytes]]:
+    """streaming GET 후 (응답, 첫 청크, 나머지 청크 iterator)를 반환한다.
+
+    HEDGE_STORAGE=1이고 HEDGE_HOSTS 대상이면, 첫 시도가 호스트별 적응형 분위수 시간 안에
+    첫 바이트를 못 받을 때 두 번째 시도를 띄우고 먼저 첫 바이트를 받은 쪽을 쓴다 (진 쪽은 닫는다).
+    """
+    host = urlparse(url).netloc.lower()
+    stats = _stats_for(host)
+    stats.count("requests")
+
+    if not (HEDGE_ENABLED and host in HEDGE_HOSTS):
+        r, first, chunks, ttfb = _first_bytes_attempt(url, chunk_size, kwargs)
+        stats.record(ttfb)
+        return r, first, chunks
+
+    pool = _hedge_executor()
+    primary = pool.submit(_first_bytes_attempt, url, chunk_size, kwargs)
+    delay = stats.threshold()
+    done, _ = wait([primary], timeout=delay)
+    if done:
+        r, first, chunks, ttfb = primary.result()
+        stats.record(ttfb)
+        return r, first, chunks
+
+    stats.count("hedged")
+    backup = pool.submit(_first_bytes_attempt, url, chunk_size, kwargs)
+    pending = {primary, backup}
+    error: Exception | None = None
+    while pending:
+        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+        for fut in done:
+            try:
+                r, first, chunks, ttfb = fut.result()
+            except Exception as e:
+                error = e
+                continue
+            for other in (primary, backup):
+                if other is not fut:
+                    _discard(other)
+            # backup의 TTFB는 hedge 지연 이후부터 잰 값이므로 지연을 더해 실제 대기 시간을 기록한다
+            stats.record(ttfb + (delay if fut is backup else 0.0))
+            if fut is backup:
+                stats.count("hedge_wins")
+            return r, first, chunks
+    raise error if error else RuntimeError(f"hedged GET failed: {url}")
+
+
+def host_samples() -> Dict[str, List[float]]:
+    """호스트별 TTFB 표본 사본 (워커 프로세스에 넘겨 seed_host_stats()로 심는다)."""
+    with _lock:
+        items = list(_host_stats.items())
+    result = {}
+    for host, st in items:
+        with st._lock:
+            result[host] = list(st.samples)
+    return result
+
+
+def seed_host_stats(samples: Dict[str, List[float]]) -> None:
+    for host, values in samples.items():
+        _stats_for(host).seed(values)
+
+
+def drain_host_stats() -> Dict[str, dict]:
+    """호스트별로 새로 쌓인 TTFB 표본과 카운터를 꺼낸다 (워커 → 부모 전달용)."""
+    with _lock:
+        items = list(_host_stats.items())
+    return {host: st.drain() for host, st in items}
+
+
+def merge_host_stats(reports: Dict[str, dict]) -> None:
+    for host, report in reports.items():
+        _stats_for(host).merge(report)
+
+
+def hedge_stats() -> Dict[str, dict]:
+    """호스트별 요청 수 / hedge 발동 수 / 두 번째 시도가 이긴 수."""
+    with _lock:
+        items = list(_host_stats.items())
+    return {host: st.snapshot() for host, st in items}
@@ -1,5 +1,9 @@
+import json
 import os
 import re
+import sys
+import threading
+from typing import Dict, Iterable
 
 def debug_log(msg: str):
     """
@@ -18,3 +22,60 @@ def slugify_case_name(name: str) -> str:
     name = re.sub(r"\s+", "-", name)
     name = re.sub(r"-+", "-", name)
     return name.strip("-")
+
+def cache_dir(*parts: str) -> str:
+    """
+    로컬 캐시 디렉터리(CACHE_DIR, 기본 .cache) 아래 경로를 만들고 반환합니다.
+    """
+    path = os.path.join(os.environ.get("CACHE_DIR", ".cache"), *parts)
+    os.makedirs(path, exist_ok=True)
+    return path
+
+def load_json(path: str, default=None):
+    """
+    JSON 파일을 읽습니다. 파일이 없거나 깨져 있으면 default를 반환합니다.
+    """
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return default
+
+def save_json(path: str, data) -> None:
+    """
+    JSON 파일을 원자적으로(임시 파일 → rename) 저장합니다.
+    """
+    tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False)
+    os.replace(tmp, path)
+
+# 긴 텍스트(PDF 스니펫 등) 공유 풀: 같은 내용이면 한 객체만 두고 레코드들이 참조를 공유한다.
+# 실행(run) 단위로만 유지한다 — run.main()이 끝날 때 clear_text_pool()로 비운다.
+_text_pool: Dict[str, str] = {}
+
+def share_text(s: str) -> str:
+    """
+    같은 내용의 긴 문자열을 풀의 단일 객체로 바꿔 반환합니다.
+    """
+    if not s:
+        return s
+    return _text_pool.setdefault(s, s)
+
+def clear_text_pool() -> None:
+    _text_pool.clear()
+
+def compact_fields(obj, interned: Iterable[str] = (), shared: Iterable[str] = ()) -> None:
+    """
+    frozen 레코드의 __post_init__에서 호출합니다.
+    반복되는 범주형 문자열(법원, 상태, Nature of Suit 등 값의 종류가 한정된 필드)만 sys.intern,
+    긴 텍스트는 share_text로 교체합니다. 판사 이름/당사자/사건명처럼 값이 계속 새로 생기는 필드는 넣지 않습니다.
+    """
+    for name in interned:
+        v = getattr(obj, name)
+        if type(v) is str:
+            object.__setattr__(obj, name, sys.intern(v))
+    for name in shared:
+        v = getattr(obj, name)
+        if type(v) is str:
+            object.__setattr__(obj, name, share_text(v))
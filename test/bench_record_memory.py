@@ -0,0 +1,96 @@
+import os
+import sys
+import tracemalloc
+from dataclasses import fields, make_dataclass
+
+# Ensure src is in path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.courtlistener import CLDocument, CLCaseSummary
+from src.utils import clear_text_pool
+
+# 슬롯/interning 적용 전 레코드(일반 dict 기반 dataclass)와 같은 필드 구성
+LegacyCLDocument = make_dataclass("LegacyCLDocument", [(f.name, f.type) for f in fields(CLDocument)])
+LegacyCLCaseSummary = make_dataclass("LegacyCLCaseSummary", [(f.name, f.type) for f in fields(CLCaseSummary)])
+
+COURTS = ["District Court, N.D. California", "District Court, S.D. New York", "District Court, D. Delaware"]
+SNIPPETS = [
+    ("Defendants copied millions of copyrighted books to train large language models without permission. " * 4).strip(),
+    ("Plaintiffs allege the model was trained on scraped news articles in violation of the DMCA. " * 4).strip(),
+]
+
+
+def _fresh(s: str) -> str:
+    # API/PDF 파싱 결과처럼 매번 새 문자열 객체를 만든다
+    return s.encode("utf-8").decode("utf-8")
+
+
+def _make_pair(i: int, doc_cls, case_cls):
+    court = _fresh(COURTS[i % len(COURTS)])
+    snippet = _fresh(SNIPPETS[i % len(SNIPPETS)])
+    doc = doc_cls(
+        docket_id=i,
+        docket_number=f"3:24-cv-{i:05d}",
+        case_name=f"Doe {i} v. Acme AI",
+        court=court,
+        date_filed=_fresh("2026-10-15"),
+        doc_type=_fresh("Complaint"),
+        doc_number="1",
+        description=_fresh("Class Action Complaint"),
+        document_url=f"https://www.courtlistener.com/docket/{i}/1/",
+        pdf_url=f"https://storage.courtlistener.com/recap/gov.uscourts.cand.{i}/1.pdf",
+        pdf_text_snippet=_fresh(SNIPPETS[i % len(SNIPPETS)]),
+        extracted_plaintiff=_fresh("미확인"),
+        extracted_defendant=_fresh("미확인"),
+        extracted_causes=_fresh("저작권 침해, DMCA(우회/기술적 보호조치)"),
+        extracted_ai_snippet=snippet,
+    )
+    case = case_cls(
+        docket_id=i,
+        case_name=f"Doe {i} v. Acme AI",
+        docket_number=f"3:24-cv-{i:05d}",
+        court=_fresh(COURTS[i % len(COURTS)]),
+        court_short_name=_fresh("N.D. Cal."),
+        court_api_url=_fresh("https://www.courtlistener.com/api/rest/v4/courts/cand/"),
+        status=_fresh("미확인"),
+        judge=_fresh("미확인"),
+        nature_of_suit=_fresh("820 Copyright"),
+        cause=_fresh("17:101 Copyright Infringement"),
+        complaint_doc_no="1",
+        complaint_link=f"https://storage.courtlistener.com/recap/gov.uscourts.cand.{i}/1.pdf",
+        complaint_type=_fresh("Class Action"),
+        recent_updates=_fresh("2026-10-16"),
+        extracted_causes=_fresh("저작권 침해, DMCA(우회/기술적 보호조치)"),
+        extracted_ai_snippet=_fresh(SNIPPETS[i % len(SNIPPETS)]),
+    )
+    return doc, case
+
+
+def measure(n: int, doc_cls, case_cls) -> float:
+    """레코드(CLDocument + CLCaseSummary) 1개당 평균 바이트."""
+    clear_text_pool()
+    tracemalloc.start()
+    base = tracemalloc.get_traced_memory()[0]
+    records = []
+    for i in range(n):
+        records.extend(_make_pair(i, doc_cls, case_cls))
+    used = tracemalloc.get_traced_memory()[0] - base
+    tracemalloc.stop()
+    per_record = used / len(records)
+    del records
+    return per_record
+
+
+def test_compact_records_smaller():
+    before = measure(2000, LegacyCLDocument, LegacyCLCaseSummary)
+    after = measure(2000, CLDocument, CLCaseSummary)
+    assert after < before, (before, after)
+    print(f"✅ compact records smaller: {before:.0f} → {after:.0f} bytes/record")
+
+
+if __name__ == "__main__":
+    test_compact_records_smaller()
+    for n in (10_000, 100_000):
+        before = measure(n, LegacyCLDocument, LegacyCLCaseSummary)
+        after = measure(n, CLDocument, CLCaseSummary)
+        print(f"n={n:>7}: before={before:,.0f} B/record  after={after:,.0f} B/record  ({after / before:.0%})")
@@ -0,0 +1,131 @@
+import os
+import random
+import re
+import sys
+import time
+
+# Ensure src is in path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.caption_parse import caption_parties, case_title_pairs
+from src.complaint_parse import extract_parties_from_caption
+from src.extract import extract_case_title_from_text
+
+# 토큰 기반 파서 적용 전 정규식 구현
+LEGACY_TITLE_RE = re.compile(
+    r"([A-Z][A-Za-z0-9 ,.&'\-]{2,}?)\s+v\.?s?\.?\s+([A-Z][A-Za-z0-9 ,.&'\-]{2,}?)\b"
+)
+LEGACY_CAPTION_RE = re.compile(
+    r"([A-Z0-9][A-Z0-9 ,.&'\-]{2,}?)\s*,\s*(?:et\s+al\.)?\s*Plaintiff[s]?\s*,?\s*v\.?\s*([A-Z0-9][A-Z0-9 ,.&'\-]{2,}?)\s*,\s*(?:Defendant[s]?|\b)",
+    re.I,
+)
+LEGACY_SIMPLE_RE = re.compile(r"([A-Z0-9][A-Za-z0-9 ,.&'\-]{2,})\s+v\.?\s+([A-Z0-9][A-Za-z0-9 ,.&'\-]{2,})", re.I)
+
+
+def legacy_title_pairs(text: str):
+    return [(m.group(1), m.group(2)) for m in LEGACY_TITLE_RE.finditer(text)]
+
+
+def legacy_parties(text: str):
+    cap = text[:2500]
+    m = LEGACY_CAPTION_RE.search(cap)
+    if m:
+        p = re.sub(r"\s+", " ", m.group(1)).strip(" ,")
+        d = re.sub(r"\s+", " ", m.group(2)).strip(" ,")
+        if "DISTRICT" not in p.upper() and "COURT" not in p.upper():
+            return p, d
+    m2 = LEGACY_SIMPLE_RE.search(cap)
+    if m2:
+        p2 = m2.group(1).strip()
+        d2 = m2.group(2).strip()
+        if "DISTRICT" not in p2.upper() and "COURT" not in p2.upper():
+            return p2, d2
+    return "미확인", "미확인"
+
+
+CAPTIONS = [
+    "UNITED STATES DISTRICT COURT NORTHERN DISTRICT OF CALIFORNIA JANE DOE, et al., Plaintiffs, v. ACME AI, INC., Defendant. CLASS ACTION COMPLAINT",
+    "UNITED STATES DISTRICT COURT\nSOUTHERN DISTRICT OF NEW YORK\nTHE NEW YORK TIMES COMPANY,\nPlaintiff,\nv.\nMICROSOFT CORPORATION, OPENAI, INC., OPENAI LP,\nDefendants.",
+    "Case 3:23-cv-03417 Document 1\nRICHARD KADREY, an individual; SARAH SILVERMAN, an individual,\nIndividual and Representative Plaintiffs,\nv.\nMETA PLATFORMS, INC., a Delaware corporation,\nDefendant.",
+    "Getty Images (US), Inc. v. Stability AI, Inc. COMPLAINT FOR COPYRIGHT INFRINGEMENT",
+    "IN THE UNITED STATES DISTRICT COURT FOR THE DISTRICT OF DELAWARE\nTHOMSON REUTERS ENTERPRISE CENTRE GMBH and WEST PUBLISHING CORP.,\nPlaintiffs and Counterdefendants,\nv.\nROSS INTELLIGENCE INC.,\nDefendant and Counterclaimant.",
+    "Authors Guild, et al., Plaintiffs, v. OpenAI Inc., et al., Defendants.",
+    "no caption here at all",
+]
+ARTICLES = [
+    "In The New York Times v. OpenAI, the court denied the motion. Authors v. Anthropic settled.",
+    "A judge in Andersen v. Stability AI Ltd. ruled on Tuesday; meanwhile Concord Music Group, Inc. v. Anthropic PBC continues.",
+    "Thomson Reuters vs. Ross Intelligence was the first ruling. Doe v Github, Inc. is on appeal.",
+    "Nothing to see here.",
+]
+
+FUZZ_TOKENS = [
+    "JANE", "DOE", "ACME", "AI", "INC.", "LLC", "Inc", ",", ", ", ".", "v.", "v", "V.", "vs.", "vs", "v.s.", "v..", "Vs.",
+    "et al.", "Plaintiff", "Plaintiffs", "PLAINTIFFS", "Defendant", "Defendants", "District", "COURT", "&",
+    "'", "-", ";", ":", "(", ")", "\n", "  ", "the", "of", "eBay", "3:24-cv-01234", "versus", "x",
+]
+
+
+def make_fuzz(seed: int, n: int = 60) -> str:
+    rng = random.Random(seed)
+    return "".join(rng.choice(FUZZ_TOKENS) + rng.choice([" ", " ", "", "\n"]) for _ in range(n))
+
+
+def test_matches_legacy():
+    inputs = CAPTIONS + ARTICLES + [make_fuzz(seed) for seed in range(4000)]
+    for text in inputs:
+        assert case_title_pairs(text) == legacy_title_pairs(text), text
+        assert extract_parties_from_caption(text) == legacy_parties(text), text
+    print(f"✅ tokenizer parser matches legacy regex results on {len(inputs)} inputs")
+
+
+# 최악 입력: 긴 대문자 구간, 쉼표 연속, 'v.' 토큰 남발, Plaintiff 뒤 결말 없음
+def adversarial_inputs(size: int):
+    return {
+        "uppercase run": "A" * size,
+        "uppercase words": ("ABCDEFGH " * size)[:size],
+        "many commas": ("ACME, " * size)[:size],
+        "commas + plaintiff": ("X, Plaintiff, v. " * size)[:size],
+        "many v. tokens": ("A v. b " * size)[:size],
+        "v. without right side": ("ACME v. " * size)[:size],
+        "spaces before v": "ACME" + " " * (size - 8) + "v. x",
+    }
+
+
+def _time(fn, text: str, repeat: int = 1) -> float:
+    # 예산 검사는 여러 번 중 최솟값으로 (CI 러너의 일시적 지연에 흔들리지 않도록)
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(text)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+# 지연 예산: 캡션(2500자) 20ms, 기사 본문(20000자) 200ms — 예전 정규식은 수 초~수 분
+CAPTION_BUDGET = 0.02
+TITLE_BUDGET = 0.2
+
+
+def test_latency_budget():
+    for name, text in adversarial_inputs(2500).items():
+        elapsed = _time(caption_parties, text, repeat=3)
+        assert elapsed < CAPTION_BUDGET, (name, elapsed)
+    for name, text in adversarial_inputs(20000).items():
+        elapsed = _time(extract_case_title_from_text, text, repeat=3)
+        assert elapsed < TITLE_BUDGET, (name, elapsed)
+    print("✅ adversarial inputs within latency budget")
+
+
+if __name__ == "__main__":
+    test_matches_legacy()
+    test_latency_budget()
+    # 예전 정규식과 비교 (예전 쪽은 입력을 줄여도 오래 걸린다)
+    for name, text in adversarial_inputs(2500).items():
+        after = _time(caption_parties, text)
+        before = _time(legacy_parties, text)
+        print(f"caption  {name:<24} 2500 chars: legacy={before * 1000:9.1f}ms  tokens={after * 1000:6.2f}ms")
+    for name, text in adversarial_inputs(4000).items():
+        after = _time(case_title_pairs, text)
+        before = _time(legacy_title_pairs, text)
+        print(f"title    {name:<24} 4000 chars: legacy={before * 1000:9.1f}ms  tokens={after * 1000:6.2f}ms")
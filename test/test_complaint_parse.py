@@ -0,0 +1,253 @@
+import os
+import random
+import re
+import sys
+import time
+from typing import List, Tuple
+
+
+# Ensure src is in path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.complaint_parse import (
+    AI_DATA_PATTERNS,
+    CAUSE_PATTERNS,
+    ComplaintFacts,
+    _FALLBACK_KEYWORDS,
+    _FIRST_CHARS,
+    _SCANNER,
+    ai_snippet_from_scan,
+    detect_causes,
+    extract_ai_training_snippet,
+    scan_complaint,
+)
+
+
+# 단일 스캐너 적용 전 구현 (패턴별 전체 검색 + 문장별 검색)
+def legacy_sentences(text: str) -> List[str]:
+    parts = re.split(r"(?<=[\.\?!])\s+", text)
+    return [p.strip() for p in parts if p and len(p.strip()) > 10]
+
+
+def legacy_detect_causes(text: str) -> List[str]:
+    return [name for name, pat in CAUSE_PATTERNS if pat.search(text)]
+
+
+def legacy_ai_snippet(text: str, max_len: int = 280) -> str:
+    scored: List[Tuple[int, str]] = []
+    for s in legacy_sentences(text):
+        score = sum(1 for pat in AI_DATA_PATTERNS if pat.search(s))
+        if score:
+            scored.append((score, s))
+    if not scored:
+        m = re.search(r".{0,80}(training\s+data|dataset|scrap(?:e|ing)|pirat(?:ed|ing)|unauthorized).{0,180}", text, re.I | re.DOTALL)
+        if m:
+            sn = re.sub(r"\s+", " ", m.group(0)).strip()
+            return (sn[:max_len] + "…") if len(sn) > max_len else sn
+        return ""
+    scored.sort(key=lambda x: x[0], reverse=True)
+    sn = re.sub(r"\s+", " ", scored[0][1]).strip()
+    return (sn[:max_len] + "…") if len(sn) > max_len else sn
+
+
+def legacy_best_score(text: str) -> int:
+    return max((sum(1 for pat in AI_DATA_PATTERNS if pat.search(s)) for s in legacy_sentences(text)), default=0)
+
+
+CAPTION = (
+    "UNITED STATES DISTRICT COURT NORTHERN DISTRICT OF CALIFORNIA "
+    "JANE DOE, et al., Plaintiffs, v. ACME AI, INC., Defendant. CLASS ACTION COMPLAINT "
+)
+FILLER = [
+    "The parties and the Court have an interest in the orderly resolution of this matter.",
+    "Plaintiff is an author residing in San Francisco, California.",
+    "Venue is proper in this District under 28 U.S.C. § 1391.",
+    "Defendant is a Delaware corporation with its principal place of business in this District.",
+    "Upon information and belief, the foregoing facts are true and correct!",
+    "Was this conduct lawful? It was not.",
+]
+ALLEGATIONS = [
+    "Defendant trained large language models on pirated books downloaded from a shadow library.",
+    "Defendant scraped millions of news articles without permission to build a training dataset.",
+    "The resulting models are sold through a commercial subscription service that generates revenue.",
+    "Defendant removed copyright management information in violation of the Digital Millennium Copyright Act.",
+    "Defendant ignored robots.txt and bypassed paywalls when harvesting data.",
+    "COUNT I — COPYRIGHT INFRINGEMENT (17 U.S.C. § 501).",
+    "COUNT II — UNFAIR COMPETITION, Cal. Bus. & Prof. Code § 17200.",
+    "COUNT III — UNJUST ENRICHMENT and restitution.",
+    "Defendant breached the terms of service of the website.",
+]
+
+
+def make_complaint(size: int, seed: int = 0, density: float = 0.15) -> str:
+    rng = random.Random(seed)
+    parts = [CAPTION]
+    total = len(CAPTION)
+    while total < size:
+        s = rng.choice(ALLEGATIONS) if rng.random() < density else rng.choice(FILLER)
+        sep = rng.choice([" ", "  ", "\n", " \n "])
+        parts.append(s + sep)
+        total += len(s) + len(sep)
+    return "".join(parts)[:size]
+
+
+# 패턴 키워드 조각 + 구두점을 무작위로 섞은 텍스트 (겹침/경계 사례 검사용)
+FUZZ_TOKENS = [
+    "training", "trained", "train", "data", "dataset", "scrape", "scraping", "web", "unauthorized", "pirated",
+    "copyright", "infringement", "dmca", "circumvent", "ucl", "u.c.l.", "cal.", "bus.", "&", "prof.", "code",
+    "17200", "terms", "of", "service", "use", "conversion", "trademark", "trade", "secret", "dtsa", "model",
+    "models", "ai", "llm", "gpt", "without", "permission", "license", "robots.txt", "commercial", "profit",
+    "mining", "determining", "the", "a", "an", ".", "?", "!", ",", "\n", "  ",
+]
+
+
+def make_fuzz(seed: int, n: int = 120) -> str:
+    rng = random.Random(seed)
+    out = []
+    for _ in range(n):
+        tok = rng.choice(FUZZ_TOKENS)
+        out.append(tok.upper() if rng.random() < 0.2 else tok)
+        out.append(rng.choice([" ", " ", "", "\n"]))
+    return "".join(out)
+
+
+def _inputs():
+    yield from (make_complaint(n, seed) for n in (500, 4_000, 20_000) for seed in range(5))
+    yield make_complaint(20_000, 7, density=0.0)  # 점수 문장 없음 → fallback / 빈 결과
+    yield from (make_fuzz(seed) for seed in range(3000))
+    # 소문자 변환 시 길이가 바뀌는 문자 → re.I 스캐너 경로
+    yield from ("İSTANBUL " + make_fuzz(seed) for seed in range(200))
+
+
+def test_scan_matches_legacy():
+    count = 0
+    for text in _inputs():
+        assert detect_causes(text) == legacy_detect_causes(text), text
+        assert extract_ai_training_snippet(text) == legacy_ai_snippet(text), text
+        assert scan_complaint(text).best_ai_score == legacy_best_score(text), text
+        count += 1
+    print(f"✅ single-pass scan matches legacy results on {count} inputs")
+
+
+# 패턴의 분기마다 하나씩 걸리는 예문 (패턴을 추가하면 여기에도 예문을 추가한다)
+PATTERN_SAMPLES = [
+    "copyright infringement", "DMCA", "digital millennium copyright act", "circumvent",
+    "breach of contract", "terms of service", "terms of use", "unfair competition",
+    "unlawful business practice", "UCL", "u.c.l.", "Cal. Bus. & Prof. Code § 17200", "CFAA",
+    "computer fraud and abuse act", "conversion", "unjust enrichment", "restitution", "lanham act",
+    "trademark", "trade secret", "DTSA", "defend trade secrets act", "trained an AI", "training models",
+    "train gpt", "training data", "dataset", "scrape", "scraping", "web scraping", "harvesting", "mining",
+    "extraction", "collection", "without permission", "unauthorized", "without license", "pirated",
+    "shadow library", "bypass", "robots.txt", "commercial", "profit", "monetization", "revenue",
+    "subscription", "enterprise", "end. Next",
+]
+
+
+def test_scanner_first_chars():
+    # 스캐너 앞의 첫 글자 검사(_FIRST_CHARS)가 모든 패턴의 매치 시작 글자를 포함하는지
+    first = re.compile(f"[{_FIRST_CHARS}]")
+    patterns = [re.compile(r"(?<=[\.\?!])\s+"), re.compile(_FALLBACK_KEYWORDS, re.I)]
+    patterns += [pat for _, pat in CAUSE_PATTERNS] + AI_DATA_PATTERNS
+    texts = PATTERN_SAMPLES + list(_inputs())[::20]
+    for pat in patterns:
+        assert any(pat.search(t) for t in PATTERN_SAMPLES), pat.pattern
+        for text in texts:
+            for m in pat.finditer(text):
+                assert first.match(m.group(0)[:1].lower()), (pat.pattern, m.group(0))
+    # 첫 글자 검사를 뺀 스캐너와 매치가 같아야 한다
+    unfiltered = re.compile(_SCANNER.pattern.replace(f"(?=[{_FIRST_CHARS}])", "", 1))
+    for text in texts:
+        lowered = text.lower()
+        got = [(m.start(), m.lastgroup) for m in _SCANNER.finditer(lowered)]
+        assert got == [(m.start(), m.lastgroup) for m in unfiltered.finditer(lowered)], text
+    print("✅ scanner first-char class covers every pattern")
+
+
+def _random_pages(text: str, rng: random.Random) -> List[str]:
+    # 패턴/문장이 페이지 경계에 걸리도록 짧은 페이지와 긴 페이지를 섞어 자른다
+    pages = []
+    i = 0
+    while i < len(text):
+        n = rng.choice([1, 5, 40, 130, 700, 3000])
+        pages.append(text[i:i + n])
+        i += n
+    return pages
+
+
+def test_complaint_facts_matches_legacy():
+    rng = random.Random(0)
+    count = 0
+    for text in list(_inputs())[::10]:
+        facts = ComplaintFacts()
+        fed = []
+        for page in _random_pages(text, rng) + ["", "   "]:
+            fed.append(page)
+            facts.feed(page)
+            assert facts.text == " ".join("\n".join(fed).split())
+            assert facts.causes == legacy_detect_causes(facts.text), text
+            assert facts.ai_snippet == legacy_ai_snippet(facts.text), text
+            legacy_done = bool(facts.text) and bool(facts.causes) and legacy_best_score(facts.text) >= 2
+            assert facts.done == legacy_done, text
+        count += 1
+    # 패턴 / 문장이 페이지 경계에 걸리는 모든 위치에서 두 페이지로 나눠 본다
+    for text in ALLEGATIONS:
+        text = "Intro sentence here. " + text + " Done."
+        for cut in range(1, len(text)):
+            facts = ComplaintFacts()
+            facts.feed(text[:cut])
+            facts.feed(text[cut:])
+            assert facts.causes == legacy_detect_causes(facts.text), (text, cut)
+            assert facts.ai_snippet == legacy_ai_snippet(facts.text), (text, cut)
+    print(f"✅ ComplaintFacts results unchanged on {count} inputs split into random pages")
+
+
+def test_complaint_facts_linear():
+    def feed_all(text: str):
+        facts = ComplaintFacts()
+        for i in range(0, len(text), 3000):
+            facts.feed(text[i:i + 3000])
+
+    small = _time(feed_all, make_complaint(30_000, density=0.0))
+    large = _time(feed_all, make_complaint(300_000, density=0.0))
+    # 페이지마다 전체를 다시 훑으면 10배 입력에 ~100배
+    assert large < small * 20, (small, large)
+    print(f"✅ ComplaintFacts cost linear in pages: 10 pages={small * 1000:.1f}ms 100 pages={large * 1000:.1f}ms")
+
+
+def _time(fn, text: str, repeat: int = 3) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(text)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def _scan_all(text: str):
+    scan = scan_complaint(text)
+    return scan.causes, ai_snippet_from_scan(text, scan), scan.best_ai_score
+
+
+def _legacy_all(text: str):
+    return legacy_detect_causes(text), legacy_ai_snippet(text), legacy_best_score(text)
+
+
+def test_scan_linear():
+    small = _time(_scan_all, make_complaint(20_000))
+    large = _time(_scan_all, make_complaint(200_000))
+    # 10배 입력에 20배 이내 (선형 + 측정 잡음)
+    assert large < small * 20, (small, large)
+    print(f"✅ scan cost linear: 20k={small * 1000:.1f}ms 200k={large * 1000:.1f}ms")
+
+
+if __name__ == "__main__":
+    test_scanner_first_chars()
+    test_scan_matches_legacy()
+    test_complaint_facts_matches_legacy()
+    test_complaint_facts_linear()
+    test_scan_linear()
+    for n in (4_000, 20_000, 50_000, 200_000):
+        text = make_complaint(n)
+        before = _time(_legacy_all, text)
+        after = _time(_scan_all, text)
+        print(f"{n:>7} chars: legacy={before * 1000:7.2f}ms  scan={after * 1000:7.2f}ms  ({after / before:.0%})")
@@ -0,0 +1,104 @@
+import os
+import random
+import sys
+import time
+from types import SimpleNamespace
+
+# Ensure src is in path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.render import (
+    RISK_CRITERIA,
+    _case_risk_score,
+    calculate_news_risk_score,
+    score_cases,
+    score_lawsuits,
+)
+
+
+# Aho-Corasick 오토마톤 적용 전 구현 (키워드마다 `in` 검사)
+def legacy_news_risk_score(title, reason):
+    score = 0
+    matched_keywords = []
+    text = f"{title or ''} {reason or ''}".lower()
+    for name, keywords, points in RISK_CRITERIA:
+        found = [k for k in keywords if k in text]
+        if found:
+            score += points
+            matched_keywords.append(f"{name}: {', '.join(found[:2])}")
+    return max(0, min(score, 100)), matched_keywords
+
+
+def legacy_case_risk_score(ai_snippet, causes, nature_of_suit):
+    score = 0
+    text = f"{ai_snippet or ''} {causes or ''}".lower()
+    nature = (nature_of_suit or "").lower()
+    if any(k in text for k in ["scrape", "crawl", "ingest", "harvest", "mining", "extraction", "bulk", "collection", "robots.txt", "common crawl", "laion", "the pile", "bookcorpus", "unauthorized"]):
+        score += 25
+    if any(k in text for k in ["train", "training", "model", "llm", "generative ai", "genai", "gpt", "transformer", "weight", "fine-tune", "diffusion", "inference"]):
+        score += 20
+    if "820" in nature or "3820" in nature or any(k in text for k in ["820", "3820", "copyright"]):
+        score += 30
+    if any(k in text for k in ["infringement", "dmca", "fair use", "derivative", "exclusive"]):
+        score += 10
+    if any(k in text for k in ["commercial", "profit", "monetiz", "revenue", "subscription", "enterprise", "paid", "for-profit"]):
+        score += 10
+    if any(k in text for k in ["class action", "putative class", "representative"]):
+        score += 5
+    if any(k in text for k in ["contract", "licensing", "agreement", "partnership", "계약", "협력", "제휴"]):
+        score -= 10
+    return max(0, min(score, 100))
+
+
+# 키워드 조각(겹침/포함 관계 포함) + 일반 단어 + 대소문자 변형
+KEYWORDS = [k for _, keywords, _ in RISK_CRITERIA for k in keywords]
+WORDS = KEYWORDS + [
+    "the", "court", "openai", "books", "news", "publisher", "trai", "mod", "copy", "right", "class", "act",
+    "38", "20", "82", "fair", "use", "for", "profit", "-", ".", ",", "소송", "계", "약", "AI", "Inc.",
+]
+NOS_VALUES = [None, "", "820 Copyright", "3820 Copyright", "Copyright", "890 Other Statutory Actions",
+              "190 Contract: Other", "Patent", "82", "38200"]
+
+
+def _random_text(rng: random.Random):
+    if rng.random() < 0.1:
+        return rng.choice([None, ""])
+    words = []
+    for _ in range(rng.randint(1, 25)):
+        w = rng.choice(WORDS)
+        words.append(w.upper() if rng.random() < 0.15 else w.title() if rng.random() < 0.1 else w)
+    # 붙여 쓰기로 경계를 넘는 부분 문자열("trainingmodel", "3820820")도 만든다
+    return rng.choice([" ", "", " / "]).join(words)
+
+
+def make_inputs(n: int = 20_000, seed: int = 0):
+    rng = random.Random(seed)
+    return [(_random_text(rng), _random_text(rng), rng.choice(NOS_VALUES)) for _ in range(n)]
+
+
+def test_news_score_matches_legacy():
+    inputs = make_inputs()
+    for title, reason, _ in inputs:
+        assert calculate_news_risk_score(title, reason) == legacy_news_risk_score(title, reason), (title, reason)
+    lawsuits = [SimpleNamespace(article_title=title, case_title="", reason=reason) for title, reason, _ in inputs]
+    assert score_lawsuits(lawsuits) == [legacy_news_risk_score(t, r) for t, r, _ in inputs]
+    print(f"✅ news risk scores match legacy on {len(inputs)} inputs")
+
+
+def test_case_score_matches_legacy():
+    inputs = make_inputs(seed=1)
+    for row in inputs:
+        assert _case_risk_score(*row) == legacy_case_risk_score(*row), row
+    assert score_cases(inputs) == [legacy_case_risk_score(*row) for row in inputs]
+    print(f"✅ case risk scores match legacy on {len(inputs)} inputs")
+
+
+if __name__ == "__main__":
+    test_news_score_matches_legacy()
+    test_case_score_matches_legacy()
+    inputs = make_inputs(2000, seed=2)
+    for name, fn in (("legacy", legacy_case_risk_score), ("automaton", _case_risk_score)):
+        start = time.perf_counter()
+        for row in inputs:
+            fn(*row)
+        print(f"case score {name:<9} 2000 rows: {(time.perf_counter() - start) * 1000:.1f}ms")